@@ -1,6 +1,62 @@
 """Pong game made by de Moura."""
 
-from pong_game import game
+import argparse
+
+from pong_game import benchmark, bundle, game, replay
+
+
+def size(text):
+    """Parses a WIDTHxHEIGHT window size."""
+
+    try:
+        width, height = (int(value) for value in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size: {text}")
+    return width, height
 
 if __name__ == "__main__":
-    game.main()
+    parser = argparse.ArgumentParser(description="Pong game.")
+    parser.add_argument(
+        "--fps", type=int, default=60,
+        help="the maximum frames drawn per second (0 means no limit)")
+    parser.add_argument(
+        "--dirty-rects", action="store_true",
+        help="only send the changed areas of the screen to the display")
+    parser.add_argument(
+        "--benchmark", action="store_true",
+        help="run the benchmarks headlessly instead of the game")
+    parser.add_argument(
+        "--frames", type=int, default=600,
+        help="how many frames each benchmark runs")
+    parser.add_argument(
+        "--record", metavar="FILE",
+        help="save the input of the last match into FILE")
+    parser.add_argument(
+        "--replay", metavar="FILE",
+        help="play a recorded match back headlessly and print its score")
+    parser.add_argument(
+        "--balls", type=int, default=0,
+        help="keep this many extra balls in the game, as a stress test")
+    parser.add_argument(
+        "--size", type=size,
+        help="the window size as WIDTHxHEIGHT, e.g. 1200x800")
+    parser.add_argument(
+        "--fullscreen", action="store_true",
+        help="take the whole display")
+    parser.add_argument(
+        "--build-bundle", action="store_true",
+        help="pack the game assets into game_data/assets.bundle")
+    args = parser.parse_args()
+
+    if args.build_bundle:
+        bundle.build()
+        print(f"assets packed into {bundle.BUNDLE_PATH}")
+    elif args.benchmark:
+        benchmark.run(args.frames)
+    elif args.replay:
+        recording = replay.InputRecorder.load(args.replay)
+        score = replay.replay(recording)
+        print(f"recorded score: {recording.score}, replayed score: {score}")
+    else:
+        game.main(args.fps, args.dirty_rects, args.record, args.balls,
+                  args.size, args.fullscreen)
@@ -0,0 +1,235 @@
+"""Module dedicated for loading and keeping the game images."""
+
+import os
+
+import pygame.constants as constants
+import pygame.display as display
+import pygame.image as image
+import pygame.rect as rect
+import pygame.surface as surface
+
+# Next to the package, so the game runs from any working directory.
+GAME_DATA = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "game_data")
+
+# A bundle.Bundle object the assets are read from, set by
+# bundle.install(). When None, each asset is read from its own file.
+bundle = None
+
+# Small sprites that are blitted every frame. They are packed
+# together in the texture atlas.
+ATLAS_IMAGES = (
+    "on_game/ball.png",
+    "on_game/paddle.png",
+    "on_game/particle.png",
+    "on_game/target.png",
+) + tuple(
+    f"{section}/{button}_button_{state}.png"
+    for section, buttons in (
+        ("main_menu", ("play", "settings", "quit")),
+        ("on_game", ("back", "main_menu", "retry")),
+        ("on_settings", ("back", "easy", "normal", "hard")),
+    )
+    for button in buttons
+    for state in ("on", "off", "clicked")
+)
+
+# Images shown by the intro, loaded before the first frame.
+INTRO_IMAGES = (
+    "icon.png",
+    "game_intro/moura_cat.png",
+    "game_intro/logo_title.png",
+)
+
+# Images of every other scene, preloaded while the intro is shown.
+SCENE_IMAGES = ("main_menu/game_title.png",) + ATLAS_IMAGES
+
+
+def exists(path):
+    """Tells if there's an asset with the given path, in the bundle
+    or in GAME_DATA.
+    """
+
+    if bundle is not None and path in bundle:
+        return True
+    return os.path.isfile(os.path.join(GAME_DATA, path))
+
+
+class TextureAtlas:
+    """A single Surface where many small images are packed, each
+    one reachable by its name.
+    """
+
+    def __init__(self, images, max_width=512, padding=1):
+        """Initialises the TextureAtlas object.
+
+        Args:
+
+            images:
+                A dict mapping names to the Surface objects to be
+                packed.
+
+            max_width:
+                The width of the atlas. Images are laid in shelves
+                (rows) no wider than that.
+
+            padding:
+                Empty pixels left between the packed images.
+        """
+
+        self.rects = dict()
+
+        # Shelf packing: the tallest images go first, so every shelf
+        # wastes as little height as possible.
+        names = sorted(images, key=lambda name: images[name].get_height(),
+                       reverse=True)
+
+        x = y = shelf_height = 0
+        width = 0
+        for name in names:
+            w, h = images[name].get_size()
+            if x + w > max_width and x > 0:
+                y += shelf_height + padding
+                x = shelf_height = 0
+            self.rects[name] = rect.Rect(x, y, w, h)
+            x += w + padding
+            width = max(width, x)
+            shelf_height = max(shelf_height, h)
+
+        size = (max(width, 1), max(y + shelf_height, 1))
+        self.surface = surface.Surface(size, constants.SRCALPHA)
+        if display.get_surface() is not None:
+            self.surface = self.surface.convert_alpha()
+        self.surface.fill((0, 0, 0, 0))
+
+        for name, area in self.rects.items():
+            self.surface.blit(images[name], area)
+
+        self.images = {
+            name: self.surface.subsurface(area)
+            for name, area in self.rects.items()
+        }
+
+    def __contains__(self, name):
+        return name in self.rects
+
+    def get(self, name):
+        """Returns the Surface of a packed image. It's a subsurface
+        of the atlas, thus no pixels are copied.
+        """
+
+        return self.images[name]
+
+
+class ImageManager:
+    """Decodes every image once and keeps it in the display pixel
+    format, so it's cheap to blit.
+    """
+
+    def __init__(self, root=GAME_DATA):
+        """Initialises the ImageManager object.
+
+        Args:
+
+            root:
+                The directory where the images are.
+        """
+
+        self.root = root
+        self.images = dict()
+        self.atlas = None
+
+    def decode(self, path):
+        """Decodes an image from disk, or takes its pixels from the
+        bundle. Nothing is cached here.
+        """
+
+        if bundle is not None and path in bundle:
+            return bundle.image(path)
+        return image.load(os.path.join(self.root, path))
+
+    @staticmethod
+    def convert(image_surface):
+        """Converts a Surface to the display pixel format.
+
+        A copy is returned when there's no display mode set yet, as
+        the decoded pixels may be the bundle bytes (see
+        bundle.Bundle.image()), which can't be drawn on.
+        """
+
+        if display.get_surface() is None:
+            return image_surface.copy()
+        if image_surface.get_flags() & constants.SRCALPHA:
+            return image_surface.convert_alpha()
+        return image_surface.convert()
+
+    def add(self, path, decoded):
+        """Converts an image decoded elsewhere (by decode()) and keeps
+        it, as if it was loaded by load().
+
+        Args:
+
+            path:
+                The path the image was decoded from.
+
+            decoded:
+                The Surface returned by decode().
+        """
+
+        if path not in self.images:
+            self.images[path] = self.convert(decoded)
+        return self.images[path]
+
+    def load(self, path):
+        """Returns the image with the given path.
+
+        Images are decoded and converted only the first time they are
+        asked for. Images loaded before a display mode is set can't be
+        converted, so they aren't cached either.
+
+        Args:
+
+            path:
+                A string representing a path that comes after the
+                root (game_data/)
+        """
+
+        cached = self.images.get(path)
+        if cached is not None:
+            return cached
+
+        if self.atlas is not None and path in self.atlas:
+            loaded = self.atlas.get(path)
+        elif display.get_surface() is None:
+            return self.convert(self.decode(path))
+        else:
+            loaded = self.convert(self.decode(path))
+
+        self.images[path] = loaded
+        return loaded
+
+    def build_atlas(self, paths=ATLAS_IMAGES):
+        """Packs the given images into one texture atlas. From now
+        on, load() returns them as parts of the atlas.
+
+        Args:
+
+            paths:
+                An iterable with the paths of the images to be
+                packed.
+        """
+
+        self.atlas = TextureAtlas({path: self.load(path) for path in paths})
+        self.images.update(self.atlas.images)
+
+        return self.atlas
+
+    def clear(self):
+        """Forgets every loaded image and the atlas."""
+
+        self.images.clear()
+        self.atlas = None
+
+
+images = ImageManager()
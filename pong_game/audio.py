@@ -0,0 +1,241 @@
+"""Module dedicated for playing the sound effects.
+
+Every effect belongs to a category with mixer channels of its own, so
+a burst of hits can never take the channels of the countdown beep or
+the game over sound. Effects also have a limit of simultaneous voices,
+a minimum interval between plays and a priority used to steal a
+channel when all of them are busy. A stolen channel is always the one
+that has been playing the longest, the sound most likely to be fading
+out anyway.
+"""
+
+import pygame.mixer as mixer
+
+from . import assets
+from .clock import SystemClock
+
+# Category name: amount of channels reserved for it.
+CATEGORIES = {
+    "interface": 2,
+    "hits": 4,
+}
+
+
+class SoundEffect:
+    """The playing rules of a sound effect."""
+
+    def __init__(self, path, category, priority=0, max_voices=1,
+                 min_interval=0):
+        """Initialises the SoundEffect object.
+
+        Args:
+
+            path:
+                A string representing a path that comes after the
+                root (game_data/)
+
+            category:
+                The name of the category whose channels play this
+                effect.
+
+            priority:
+                Effects with a higher priority can stop the ones with
+                a lower priority when every channel is busy.
+
+            max_voices:
+                How many times the effect can be playing at once. Past
+                it, a new play stops the oldest one.
+
+            min_interval:
+                The minimum time in milliseconds between two plays of
+                the effect, read from the SoundManager clock. Plays
+                that come sooner are dropped.
+        """
+
+        self.path = path
+        self.category = category
+        self.priority = priority
+        self.max_voices = max_voices
+        self.min_interval = min_interval
+
+        self.enabled = True
+        self.last_played = None
+
+
+EFFECTS = {effect.path: effect for effect in (
+    SoundEffect("on_game/soundfx/ball_hit.ogg", "hits", priority=2,
+                max_voices=2, min_interval=30),
+    SoundEffect("on_game/soundfx/target_hit.wav", "hits", priority=1,
+                max_voices=3, min_interval=40),
+    SoundEffect("on_game/soundfx/vanishing.wav", "hits", priority=0,
+                max_voices=2, min_interval=60),
+    SoundEffect("on_game/soundfx/countdown_beep.wav", "interface",
+                priority=1),
+    SoundEffect("on_game/soundfx/game_over.wav", "interface", priority=2),
+)}
+
+
+class SoundManager:
+    """Plays the sound effects following their rules."""
+
+    def __init__(self, effects=EFFECTS, categories=CATEGORIES, clock=None):
+        """Initialises the SoundManager object.
+
+        Args:
+
+            effects:
+                A dict mapping paths to SoundEffect objects.
+
+            categories:
+                A dict mapping category names to the amount of
+                channels reserved for them.
+
+            clock:
+                An object with a get_ticks() method, the time the
+                minimum intervals are measured with. When None, the
+                real time (SystemClock) is used.
+        """
+
+        self.effects = effects
+        self.categories = categories
+        self.clock = clock if clock is not None else SystemClock()
+
+        # Category name: list of Channel objects. Filled by setup().
+        self.channels = dict()
+        # Channel object: the SoundEffect it's playing.
+        self.playing = dict()
+        # Channel object: the number of the play it started with, so
+        # the oldest voices can be told apart.
+        self.started = dict()
+        self.plays = 0
+
+    def validate(self):
+        """Checks that every sound effect file exists. Effects whose
+        file is missing are disabled, so the game goes on without
+        them instead of crashing when they're played.
+
+        Returns:
+            A list with the paths of the missing effects.
+        """
+
+        missing = []
+        for effect in self.effects.values():
+            if not assets.exists(effect.path):
+                effect.enabled = False
+                missing.append(effect.path)
+
+        return missing
+
+    def setup(self, clock=None):
+        """Validates the effects and reserves the mixer channels of
+        each category. It does nothing but the validation when the
+        mixer isn't initialised.
+
+        Args:
+
+            clock:
+                When given, the clock that replaces the current one,
+                e.g. the simulation clock of the game, so the effects
+                are spaced out in game time.
+
+        Returns:
+            A list with the paths of the missing effects.
+        """
+
+        missing = self.validate()
+
+        if clock is not None:
+            self.clock = clock
+            # Times read from the old clock mean nothing to this one.
+            for effect in self.effects.values():
+                effect.last_played = None
+
+        self.channels.clear()
+        self.playing.clear()
+        self.started.clear()
+        if mixer.get_init() is None:
+            return missing
+
+        total = sum(self.categories.values())
+        mixer.set_num_channels(max(mixer.get_num_channels(), total))
+        # Reserved channels are never picked by Sound.play(), so
+        # nothing else can take them.
+        mixer.set_reserved(total)
+
+        index = 0
+        for category, amount in self.categories.items():
+            self.channels[category] = [mixer.Channel(i) for i in
+                                       range(index, index + amount)]
+            index += amount
+
+        return missing
+
+    def play(self, path, load, loops=0):
+        """Plays a sound effect, unless its rules say otherwise.
+
+        Args:
+
+            path:
+                The path of the effect.
+
+            load:
+                A function that receives the path and returns the
+                Sound object of the effect. It's only called when the
+                effect is going to be played.
+
+            loops:
+                How many times the effect is repeated after the first
+                play.
+
+        Returns:
+            The Channel object playing the effect, or None when it
+            wasn't played.
+        """
+
+        effect = self.effects.get(path)
+        if effect is not None and not effect.enabled:
+            return None
+        if effect is None or not self.channels:
+            # Effects without rules (or a mixer not set up) are just
+            # played.
+            if mixer.get_init() is None:
+                return None
+            return load(path).play(loops=loops)
+
+        now = self.clock.get_ticks()
+        if effect.last_played is not None \
+                and now - effect.last_played < effect.min_interval:
+            return None
+
+        channels = self.channels[effect.category]
+        busy = [channel for channel in channels if channel.get_busy()]
+        voices = [channel for channel in busy
+                  if self.playing.get(channel) is effect]
+        if len(voices) >= effect.max_voices:
+            # The oldest voice of the effect makes room for this one.
+            channel = min(voices, key=self.started.get)
+        else:
+            channel = next(
+                (channel for channel in channels
+                 if not channel.get_busy()), None)
+        if channel is None:
+            # Steals the oldest channel playing the least important
+            # effect, if it's less important than this one.
+            channel = min(busy, key=lambda busy_channel: (
+                self.playing[busy_channel].priority,
+                self.started[busy_channel]))
+            if self.playing[channel].priority >= effect.priority:
+                return None
+        if channel.get_busy():
+            channel.stop()
+
+        channel.play(load(path), loops=loops)
+        self.playing[channel] = effect
+        self.started[channel] = self.plays
+        self.plays += 1
+        effect.last_played = now
+
+        return channel
+
+
+sounds = SoundManager()
@@ -2,11 +2,11 @@
 
 import random
 
-import pygame.sprite as sprite
 import pygame.surface as surface
 
 from .game_elements import target
 from .game_elements.ball import Ball
+from .layers import Layer
 
 
 class BaseBackground:
@@ -34,42 +34,77 @@ class GameBackground(BaseBackground):
     dynamics.
     """
 
-    def __init__(self, screen):
+    def __init__(self, screen, rng=None):
+        """Initialises the object.
+
+        Args:
+
+            screen:
+                The Surface object where the background is drawn.
+
+            rng:
+                The random.Random object used by the targets.
+        """
+
         super().__init__(screen)
 
         # Game elements (the user won't control these)
         self.ball = Ball(screen, False)
         self.ball.yspeed = 5
-        self.targets = sprite.Group()
-        target.recharge(screen, self.targets, False)
+        self.targets = target.TargetField(screen, False, rng=rng)
+        self.targets_layer = Layer(
+            self.targets.field_rect(), self.targets.draw_standing,
+            lambda: self.targets.version, transparent=True)
 
-        self.ball.rect.center = self.screen_rect.center
+        self.ball.place(center=self.screen_rect.center)
 
-    def draw(self):
-        self.ball.draw()
-        self.targets.draw(self.screen)
+    def draw(self, interpolation=1.0):
+        self.ball.draw(interpolation)
+        self.targets_layer.draw(self.screen)
+        self.targets.draw_falling()
 
-    def update(self, particles_group):
-        self.ball.update(particles_group, None)
-        self.targets.update(self.ball, particles_group)
-        target.update(self.screen, self.screen_rect, self.targets, self.ball,
-                      True, particles_group)
+    def update(self, particles):
+        self.ball.update(particles, None, self.targets)
+        self.targets.update()
+        target.update(self.targets, self.ball, particles)
 
 
 class ColourChangingBackground(BaseBackground):
     """A class that represents a Surface that changes its colour
     all the time.
+
+    The colour moves a step every interval updates. Every step means
+    the whole screen changes, so the dirty rendering raises the
+    interval to keep the rest of the updates cheap to show.
     """
 
-    def __init__(self, screen):
+    def __init__(self, screen, rng=None):
+        """Initialises the object.
+
+        Args:
+
+            screen:
+                The Surface object where the background is drawn.
+
+            rng:
+                The random.Random object that picks the first colour.
+                When None, the random module is used.
+        """
+
         super().__init__(screen)
+        rng = rng if rng is not None else random
         self.bg = surface.Surface(screen.get_size())
         self.colour = {
-            "r": [random.randint(0, 255), 1],
-            "g": [random.randint(0, 255), 1],
-            "b": [random.randint(0, 255), 1]
+            "r": [rng.randint(0, 255), 1],
+            "g": [rng.randint(0, 255), 1],
+            "b": [rng.randint(0, 255), 1]
         }
 
+        self.interval = 1
+        self.ticks = 0
+        # Goes up whenever the colour changes.
+        self.version = 0
+
     def draw(self):
         r = self.colour["r"][0]
         g = self.colour["g"][0]
@@ -77,6 +112,12 @@ class ColourChangingBackground(BaseBackground):
         self.screen.fill((r, g, b))
 
     def update(self):
+        self.ticks += 1
+        if self.ticks < self.interval:
+            return
+        self.ticks = 0
+        self.version += 1
+
         for key, colour_stats in self.colour.items():
             if colour_stats[0] >= 255:
                 self.colour[key][1] = -1
@@ -0,0 +1,362 @@
+"""Module dedicated for measuring the game performance.
+
+Every scene is driven headlessly, with scripted input, for a given
+amount of frames, and some subsystems are measured on their own. The
+frame times are reported as percentiles, along with the memory
+allocated by Python while running them.
+
+Run it with ``python pong.py --benchmark``.
+"""
+
+import math
+import time
+import tracemalloc
+
+import numpy as np
+import pygame.constants as constants
+import pygame.event as event
+
+from . import assets, interface, scene
+from .clock import SimulationClock
+from .game_elements.ball import Ball
+from .game_elements.paddle import Paddle
+from .game_elements.particle import ParticleSystem
+from .game_elements.target import TargetField
+from .headless import setup_display
+from .observation import Grayscale, frame, state_vector
+
+
+class BenchmarkResult:
+    """The measurements of a single benchmark."""
+
+    def __init__(self, name, samples, peak_memory, retained_memory):
+        """Initialises the BenchmarkResult object.
+
+        Args:
+
+            name:
+                The name of the benchmark.
+
+            samples:
+                A list with the time (in seconds) taken by every run.
+
+            peak_memory:
+                The biggest amount of memory (in bytes) allocated by
+                Python during a single run.
+
+            retained_memory:
+                How much memory (in bytes) was still allocated after
+                all the runs.
+        """
+
+        self.name = name
+        self.samples = samples
+        self.peak_memory = peak_memory
+        self.retained_memory = retained_memory
+
+    def percentile(self, value):
+        """Returns the given percentile of the samples in
+        milliseconds.
+        """
+
+        return float(np.percentile(self.samples, value)) * 1000
+
+    def __str__(self):
+        return f"{self.name:<28}{len(self.samples):>7}" \
+            f"{self.percentile(50):>10.3f}{self.percentile(95):>10.3f}" \
+            f"{self.percentile(99):>10.3f}" \
+            f"{self.peak_memory / 1024:>11.1f}" \
+            f"{self.retained_memory / 1024:>11.1f}"
+
+
+def measure(name, run, runs):
+    """Measures a function.
+
+    The function is called runs times while timed and then runs times
+    again while tracing the memory allocations, so the tracing doesn't
+    spoil the timing.
+
+    Args:
+
+        name:
+            The name of the benchmark.
+
+        run:
+            A function called with the index of the run.
+
+        runs:
+            How many times the function is called.
+
+    Returns:
+        A BenchmarkResult object.
+    """
+
+    samples = []
+    for i in range(runs):
+        start = time.perf_counter()
+        run(i)
+        samples.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    peak_memory = 0
+    for i in range(runs):
+        tracemalloc.reset_peak()
+        current = tracemalloc.get_traced_memory()[0]
+        run(runs + i)
+        peak_memory = max(peak_memory,
+                          tracemalloc.get_traced_memory()[1] - current)
+    retained_memory = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    return BenchmarkResult(name, samples, peak_memory, retained_memory)
+
+
+class SceneDriver:
+    """Runs a single scene in a SceneManager of its own, frame by
+    frame, as the game would.
+    """
+
+    FRAME_TIME = 1000 / 60
+
+    def __init__(self, screen, view_name, scene_class, script=None):
+        """Initialises the SceneDriver object.
+
+        Args:
+
+            screen:
+                The Surface object where the scene is drawn.
+
+            view_name:
+                The name the scene is registered with.
+
+            scene_class:
+                The class of the scene to be driven.
+
+            script:
+                A function that receives the scene and the frame
+                index and returns the events of that frame.
+        """
+
+        self.clock = SimulationClock()
+        self.scene_manager = scene.SceneManager(self.clock)
+        self.scene = scene_class(screen)
+        self.scene_manager.add(view_name, self.scene)
+        self.scene_manager.initial_view(view_name)
+        self.script = script
+
+    def frame(self, index):
+        """Runs a whole frame: events, update and drawing."""
+
+        if self.script is not None:
+            for frame_event in self.script(self.scene, index):
+                self.scene_manager.update_on_event(frame_event)
+
+        self.clock.advance(self.FRAME_TIME)
+        self.scene_manager.update()
+        self.scene_manager.show()
+
+
+def hold_intro(scene_object, index):
+    """Keeps the logo on the screen, as there's no main menu to go
+    to when the intro is over.
+    """
+
+    if index == 0:
+        scene_object.scene_manager.scheduler.cancel(scene_object)
+    return []
+
+
+def hover_buttons(scene_object, index):
+    """Moves the mouse up and down the left side of the screen, over
+    the main menu buttons.
+    """
+
+    y = 200 + 100 * math.sin(index / 20)
+    return [event.Event(constants.MOUSEMOTION, pos=(80, int(y)), rel=(0, 0),
+                        buttons=(0, 0, 0))]
+
+
+def click_difficulty(scene_object, index):
+    """Hovers and clicks the difficulty buttons one after another."""
+
+    buttons = (scene_object.easy_button, scene_object.normal_button,
+               scene_object.hard_button)
+    pos = buttons[index // 30 % len(buttons)].rect.center
+    events = [event.Event(constants.MOUSEMOTION, pos=pos, rel=(0, 0),
+                          buttons=(0, 0, 0))]
+    if index % 30 == 10:
+        events.append(event.Event(constants.MOUSEBUTTONDOWN, pos=pos,
+                                  button=1))
+    elif index % 30 == 15:
+        events.append(event.Event(constants.MOUSEBUTTONUP, pos=pos,
+                                  button=1))
+    return events
+
+
+def follow_ball(scene_object, index):
+    """Moves the paddle towards the ball, starting a new match when
+    the game is over.
+    """
+
+    if scene_object.game_over:
+        scene_object.retry()
+
+    ball_x = scene_object.ball.rect.centerx
+    paddle_x = scene_object.paddle.rect.centerx
+    moving_left = ball_x < paddle_x - 5
+    moving_right = ball_x > paddle_x + 5
+
+    events = []
+    for key, moving, was_moving in (
+            (constants.K_a, moving_left, scene_object.paddle.moving_left),
+            (constants.K_d, moving_right, scene_object.paddle.moving_right)):
+        if moving != was_moving:
+            events.append(event.Event(
+                constants.KEYDOWN if moving else constants.KEYUP, key=key))
+    return events
+
+
+def follow_ball_nonstop(scene_object, index):
+    """Moves the paddle as follow_ball() does, skipping the countdowns
+    so that every frame moves the balls.
+    """
+
+    events = follow_ball(scene_object, index)
+    if scene_object.on_countdown:
+        scene_object.stop_countdown()
+    return events
+
+
+SCENES = (
+    ("game_intro", scene.IntroScene, hold_intro),
+    ("main_menu", scene.MainMenuScene, hover_buttons),
+    ("on_settings", scene.SettingsScene, click_difficulty),
+    ("on_game", scene.GameScene, follow_ball_nonstop),
+)
+
+
+# How many extra balls the game stress test keeps.
+STRESS_BALLS = 2000
+
+
+def benchmark_scenes(screen, frames):
+    """Measures the frame time of every scene, and of the game with
+    STRESS_BALLS balls.
+    """
+
+    results = []
+    for view_name, scene_class, script in SCENES:
+        driver = SceneDriver(screen, view_name, scene_class, script)
+        results.append(measure(f"scene: {view_name}", driver.frame, frames))
+
+    driver = SceneDriver(screen, "on_game", scene.GameScene,
+                         follow_ball_nonstop)
+    driver.scene.stress_balls = STRESS_BALLS
+    results.append(measure(f"scene: on_game, {STRESS_BALLS} balls",
+                           driver.frame, frames))
+
+    return results
+
+
+def benchmark_subsystems(screen, runs):
+    """Measures the subsystems that used to show up in the frame
+    time spikes.
+    """
+
+    results = []
+
+    targets = TargetField(screen)
+    results.append(measure("target.recharge",
+                           lambda i: targets.recharge(), runs))
+
+    particles = ParticleSystem(screen)
+
+    def particles_burst(i):
+        for burst in range(5):
+            particles.emit(300, 100 + burst * 20)
+        particles.update()
+        particles.draw()
+
+    results.append(measure("particles: 5 bursts", particles_burst, runs))
+
+    results.append(measure(
+        "generate_text_surface",
+        lambda i: interface.generate_text_surface(
+            f"Score: {i * 100}", (255, 255, 255), 16, 17, 1, True,
+            antialised=True),
+        runs))
+
+    ball = Ball(screen)
+    paddle = Paddle(screen)
+    paddle.place(midbottom=screen.get_rect().midbottom)
+
+    def target_collision(i):
+        # Sweeps the ball through the whole target field.
+        ball.x = i * 7 % screen.get_width()
+        ball.y = i * 3 % (targets.rows * targets.CELL_SIZE)
+        if len(targets) == 0:
+            targets.recharge()
+        ball.update(particles, None, targets)
+        targets.update()
+
+    results.append(measure("collision: targets", target_collision, runs))
+
+    def ball_collision(i):
+        # The ball is put right before the left wall or the paddle,
+        # so every run resolves a contact.
+        particles.clear()
+        if i % 2:
+            ball.place(midleft=(1, 200))
+            ball.xspeed, ball.yspeed = -2, 2
+        else:
+            ball.place(midbottom=(paddle.rect.centerx, paddle.rect.top - 1))
+            ball.xspeed, ball.yspeed = 2, 2
+        ball.update(particles, paddle)
+
+    results.append(measure("collision: walls/paddle", ball_collision, runs))
+
+    game_scene = scene.GameScene(screen)
+    state = state_vector(game_scene)
+    results.append(measure("observation: state",
+                           lambda i: state_vector(game_scene, state), runs))
+
+    def frame_view(i):
+        with frame(screen) as pixels:
+            pixels[0, 0]
+
+    results.append(measure("observation: frame view", frame_view, runs))
+
+    grayscale = Grayscale(screen)
+    image = grayscale()
+    results.append(measure("observation: grayscale",
+                           lambda i: grayscale(image), runs))
+
+    return results
+
+
+def run(frames=600):
+    """Runs every benchmark and prints a report.
+
+    Args:
+
+        frames:
+            How many frames each scene runs, and how many times each
+            subsystem is measured.
+
+    Returns:
+        A list of BenchmarkResult objects.
+    """
+
+    screen = setup_display()
+    assets.images.build_atlas()
+
+    results = benchmark_scenes(screen, frames) \
+        + benchmark_subsystems(screen, frames)
+
+    print(f"{'benchmark':<28}{'runs':>7}{'p50 ms':>10}{'p95 ms':>10}"
+          f"{'p99 ms':>10}{'peak KiB':>11}{'kept KiB':>11}")
+    for result in results:
+        print(result)
+
+    return results
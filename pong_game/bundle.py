@@ -0,0 +1,184 @@
+"""Module dedicated for packing the game assets into a single file.
+
+A bundle holds every image the game uses as raw pixels, ready to be
+turned into a Surface without decoding, and every sound effect as it
+is in its file. The bundle is memory-mapped, thus only the parts of it
+actually used are ever read from the disk.
+
+The layout of the file is:
+
+    header | index (JSON) | data
+
+where the index maps each asset path to where its data is.
+"""
+
+import io
+import json
+import mmap
+import os
+import struct
+
+import pygame.constants as constants
+import pygame.image as image
+
+from . import assets, audio
+
+MAGIC = b"PONGPAK1"
+
+# magic and index size
+HEADER = struct.Struct("<8sI")
+
+# The pixel data of each image starts at a multiple of this.
+ALIGNMENT = 16
+
+BUNDLE_PATH = os.path.join(assets.GAME_DATA, "assets.bundle")
+
+
+def referenced_assets():
+    """Returns the paths of every image and sound effect the game
+    refers to, as two tuples.
+    """
+
+    return (assets.INTRO_IMAGES + assets.SCENE_IMAGES,
+            tuple(audio.EFFECTS))
+
+
+def build(output=BUNDLE_PATH, root=assets.GAME_DATA):
+    """Packs the referenced assets into a bundle file.
+
+    Args:
+
+        output:
+            The path of the bundle file.
+
+        root:
+            The directory where the assets are.
+
+    Raises:
+        FileNotFoundError: Some referenced assets are missing. Nothing
+            is written in that case.
+    """
+
+    image_paths, sound_paths = referenced_assets()
+
+    missing = [path for path in image_paths + sound_paths
+               if not os.path.isfile(os.path.join(root, path))]
+    if missing:
+        raise FileNotFoundError(
+            "missing assets: " + ", ".join(sorted(missing)))
+
+    index = dict()
+    chunks = []
+    offset = 0
+
+    def append(data):
+        nonlocal offset
+        padding = -offset % ALIGNMENT
+        chunks.append(bytes(padding))
+        chunks.append(data)
+        offset += padding
+        start = offset
+        offset += len(data)
+        return start
+
+    for path in image_paths:
+        decoded = image.load(os.path.join(root, path))
+        pixel_format = "RGBA" if decoded.get_flags() & constants.SRCALPHA \
+            else "RGB"
+        data = image.tobytes(decoded, pixel_format)
+        index[path] = {
+            "type": "image",
+            "offset": append(data),
+            "length": len(data),
+            "size": decoded.get_size(),
+            "format": pixel_format,
+        }
+
+    for path in sound_paths:
+        with open(os.path.join(root, path), "rb") as file:
+            data = file.read()
+        index[path] = {
+            "type": "sound",
+            "offset": append(data),
+            "length": len(data),
+        }
+
+    encoded_index = json.dumps(index).encode()
+    # The data offsets are relative to its start, which is aligned
+    # too.
+    index_padding = -(HEADER.size + len(encoded_index)) % ALIGNMENT
+    encoded_index += b" " * index_padding
+
+    with open(output, "wb") as file:
+        file.write(HEADER.pack(MAGIC, len(encoded_index)))
+        file.write(encoded_index)
+        for chunk in chunks:
+            file.write(chunk)
+
+
+class Bundle:
+    """A memory-mapped bundle file."""
+
+    def __init__(self, path=BUNDLE_PATH):
+        """Initialises the Bundle object.
+
+        Args:
+
+            path:
+                The path of the bundle file.
+        """
+
+        with open(path, "rb") as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, index_size = HEADER.unpack_from(self.map)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an asset bundle")
+
+        start = HEADER.size
+        self.index = json.loads(self.map[start:start + index_size])
+        self.data = memoryview(self.map)[start + index_size:]
+
+    def __contains__(self, path):
+        return path in self.index
+
+    def entry_data(self, path):
+        """Returns a memoryview of the data of an asset. No bytes are
+        copied.
+        """
+
+        entry = self.index[path]
+        return self.data[entry["offset"]:entry["offset"] + entry["length"]]
+
+    def image(self, path):
+        """Returns the image with the given path.
+
+        The Surface pixels are the bundle bytes themselves, thus the
+        Surface must be converted (or copied) before being drawn on.
+        """
+
+        entry = self.index[path]
+        return image.frombuffer(self.entry_data(path), tuple(entry["size"]),
+                                entry["format"])
+
+    def file(self, path):
+        """Returns a file-like object with the data of a sound
+        effect.
+        """
+
+        return io.BytesIO(self.entry_data(path))
+
+
+def install(path=BUNDLE_PATH):
+    """Makes the game read its assets from the bundle file, if
+    there's one.
+
+    Returns:
+        The Bundle object, or None when there's no bundle file.
+    """
+
+    if not os.path.isfile(path):
+        return None
+
+    assets.bundle = Bundle(path)
+    return assets.bundle
@@ -0,0 +1,55 @@
+"""Module dedicated for the clocks that drive the scenes timing."""
+
+import fractions
+
+import pygame.time as time
+
+
+class SystemClock:
+    """A clock that reads the time from pygame, that is, the real
+    time passed since pygame.init() was called.
+    """
+
+    def get_ticks(self):
+        """Returns the amount of milliseconds since pygame.init()."""
+
+        return time.get_ticks()
+
+
+class SimulationClock:
+    """A clock that only moves forward when told to do so. Useful
+    when the game has to run faster (or slower) than the real time.
+
+    The time is kept as an exact fraction, so the time between two
+    moments depends only on how the clock advanced in between, not
+    on where it started. That keeps the scenes reproducible.
+    """
+
+    def __init__(self, start=0):
+        """Initialises the SimulationClock object.
+
+        Args:
+
+            start:
+                The initial time of the clock in milliseconds.
+        """
+
+        self.ticks = fractions.Fraction(start)
+
+    def get_ticks(self):
+        """Returns the amount of milliseconds elapsed in the
+        simulation.
+        """
+
+        return self.ticks
+
+    def advance(self, milliseconds):
+        """Moves the clock forward.
+
+        Args:
+
+            milliseconds:
+                The amount of time to be added to the clock.
+        """
+
+        self.ticks += fractions.Fraction(milliseconds)
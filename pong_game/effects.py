@@ -1,72 +1,205 @@
+"""Module dedicated for the transitions between views and other
+visual effects.
+
+A transition captures the outgoing view and the incoming one once,
+into Surfaces that are reused by every transition, and blends them
+according to the time passed on the scene manager clock. Thus each
+frame of a transition costs one or two blits, and it takes the same
+time whatever the frame rate is.
+"""
+
+import functools
+
 import pygame.surface as surface
 
 
+@functools.cache
+def snapshot_surfaces(size):
+    """Returns the two Surfaces (outgoing and incoming) where the
+    views are captured. Only one transition runs at a time, so they
+    are shared by all of them.
+    """
+
+    return surface.Surface(size).convert(), surface.Surface(size).convert()
+
+
+@functools.cache
+def colour_surface(size, colour):
+    """Returns a Surface filled with the given colour."""
+
+    colour_bg = surface.Surface(size).convert()
+    colour_bg.fill(colour)
+    return colour_bg
+
+
 class Transition:
     """Base class that is responsible for creating smooth
     transitions.
     """
 
-    def __init__(self, screen, scene_manager, next_view):
+    def __init__(self, screen, scene_manager, next_view, duration=1000):
+        """Initialises the Transition object.
+
+        Args:
+
+            screen:
+                The Surface object where the views are drawn.
+
+            scene_manager:
+                The SceneManager object that runs the transition.
+
+            next_view:
+                The name of the view shown in the end.
+
+            duration:
+                How many milliseconds the transition takes.
+        """
+
         self.screen = screen
         self.screen_rect = screen.get_rect()
         self.scene_manager = scene_manager
         self.next_view = next_view
+        self.duration = duration
+
+        self.outgoing, self.incoming = snapshot_surfaces(screen.get_size())
+        self.incoming_captured = False
+        self.start_time = None
+
+    def start(self):
+        """Captures the outgoing view, that is, what is on the screen
+        now. Called by the scene manager when the transition starts.
+        """
+
+        self.start_time = self.scene_manager.clock.get_ticks()
+        self.outgoing.blit(self.screen, (0, 0))
+        self.incoming_captured = False
+
+    def capture_incoming(self):
+        """Draws the incoming view once and keeps it."""
+
+        view = self.scene_manager.get(self.next_view)
+        view.interpolation = 1.0
+        view.draw()
+        self.incoming.blit(self.screen, (0, 0))
+        self.incoming_captured = True
+
+    def progress(self):
+        """Returns how far (from 0 to 1) the transition is."""
+
+        elapsed = self.scene_manager.clock.get_ticks() - self.start_time
+        return min(max(elapsed / self.duration, 0), 1)
 
     def animate(self):
-        pass
+        """Draws the current frame of the transition, ending it when
+        its time is over.
+        """
+
+        # The incoming view is captured in the first frame, not when
+        # the transition starts, so whatever is done to it right
+        # after change_view() (e.g. a retry) is seen.
+        if not self.incoming_captured:
+            self.capture_incoming()
+
+        progress = self.progress()
+        self.blend(progress)
+
+        if progress >= 1:
+            self.scene_manager._change_view(self.next_view)
+            self.clean()
+
+    def blend(self, progress):
+        """Draws the outgoing and incoming snapshots on the screen.
+
+        Args:
+
+            progress:
+                How far (from 0 to 1) the transition is.
+        """
+
+        self.screen.blit(self.incoming, (0, 0))
 
     def clean(self):
         """Always called in the end of the animate method."""
 
         self.scene_manager.on_transition = False
-        self.fx_object = None
+        self.scene_manager.fx_object = None
 
 
 class FadeTransition(Transition):
-    """Class responsible for manipulating the Surface in a way that
-    the screens is fading.
+    """Class responsible for fading the screen to a colour and then
+    to the next view.
     """
 
     def __init__(self, screen, scene_manager, next_view, fade_colour,
-                 speed_factor=2):
-        super().__init__(screen, scene_manager, next_view)
-        self.scene_manager = scene_manager
+                 duration=4000):
+        """Initialises the FadeTransition object.
 
-        # Fade elements
-        self.fade_bg = surface.Surface(screen.get_size())
-        self.fade_bg.set_alpha(0)
-        self.fade_bg.fill(fade_colour)
-        self.rect = self.fade_bg.get_rect()
-        self.rect.center = self.screen_rect.center
+        Args:
 
-        # Fade params
-        self.on_fade = True
-        self.alpha = 0
-        self.factor = speed_factor
-        self.backwards = False
-        self.c = 0
+            fade_colour:
+                The colour the screen fades to, halfway through.
 
-    def animate(self):
-        """It fades the screen to the next view."""
+        See Transition for the other arguments.
+        """
+
+        super().__init__(screen, scene_manager, next_view, duration)
+        self.fade_bg = colour_surface(screen.get_size(), tuple(fade_colour))
 
-        if self.on_fade:
-            if self.c == 1:
-                self.scene_manager.change_view(self.next_view)
+    def blend(self, progress):
+        if progress < 0.5:
+            self.screen.blit(self.outgoing, (0, 0))
+            alpha = progress * 2
+        else:
+            self.screen.blit(self.incoming, (0, 0))
+            alpha = 2 - progress * 2
 
-            self.alpha += self.factor
-            if (self.alpha > 255 and not self.backwards) \
-                    or (self.alpha < 0 and self.backwards):
-                self.backwards = not self.backwards
-                self.factor *= -1
-                self.c += 1
+        self.fade_bg.set_alpha(round(alpha * 255))
+        self.screen.blit(self.fade_bg, (0, 0))
 
-            self.fade_bg.set_alpha(self.alpha)
-            self.screen.blit(self.fade_bg, self.rect)
 
-            if self.c == 2:
-                self.on_fade = False
-        else:
-            self.clean()
+class CrossfadeTransition(Transition):
+    """Class responsible for fading the outgoing view into the
+    incoming one.
+    """
+
+    def blend(self, progress):
+        self.screen.blit(self.outgoing, (0, 0))
+        self.incoming.set_alpha(round(progress * 255))
+        self.screen.blit(self.incoming, (0, 0))
+        self.incoming.set_alpha(None)
+
+
+class SlideTransition(Transition):
+    """Class responsible for pushing the outgoing view out of the
+    screen with the incoming one.
+    """
+
+    def __init__(self, screen, scene_manager, next_view, direction=(-1, 0),
+                 duration=1000):
+        """Initialises the SlideTransition object.
+
+        Args:
+
+            direction:
+                The (x, y) direction the views move to, e.g. (-1, 0)
+                slides them to the left.
+
+        See Transition for the other arguments.
+        """
+
+        super().__init__(screen, scene_manager, next_view, duration)
+        self.direction = direction
+
+    def blend(self, progress):
+        # Eases out, so the incoming view slows down when arriving.
+        offset = 1 - (1 - progress) ** 2
+        width, height = self.screen_rect.size
+        dx, dy = self.direction
+
+        out_x, out_y = round(dx * width * offset), round(dy * height * offset)
+        self.screen.blit(self.outgoing, (out_x, out_y))
+        self.screen.blit(self.incoming,
+                         (out_x - dx * width, out_y - dy * height))
 
 
 def floating_animation(*args):
@@ -0,0 +1,363 @@
+"""Module dedicated for training agents to play the game.
+
+PongEnv wraps a headless GameScene in the reset/step interface used by
+the reinforcement learning libraries (the Gym one), and VectorEnv runs
+many of them in worker processes, stepped together, so every core is
+used and the results come back as NumPy arrays in shared memory.
+"""
+
+import multiprocessing
+import multiprocessing.resource_tracker as resource_tracker
+
+import numpy as np
+import pygame.constants as constants
+
+from .headless import HeadlessGame
+from .observation import Grayscale, SharedArrays, state_size, state_vector
+
+# The keys held down by each action: stay, left and right.
+ACTIONS = ((), (constants.K_a,), (constants.K_d,))
+
+# Reward lost when the ball falls off the screen.
+LIFE_PENALTY = 1
+# Points of a target, one reward each.
+TARGET_POINTS = 100
+
+
+class PongEnv:
+    """A single match, played one action at a time.
+
+    The observation is either the state vector of the scene (see
+    observation.state_vector()) or a small grayscale copy of the
+    rendered frame. The reward is the amount of targets hit, minus
+    LIFE_PENALTY for every ball lost. The episode ends when the game
+    is over.
+
+    The countdowns before each ball are skipped, as nothing can be
+    done during them.
+    """
+
+    OBSERVATIONS = ("state", "grayscale")
+
+    def __init__(self, frame_skip=1, max_steps=None, screen_size=(600, 400),
+                 observation_type="state", frame_size=(84, 84), buffer=None):
+        """Initialises the PongEnv object.
+
+        Args:
+
+            frame_skip:
+                How many frames each action is held for.
+
+            max_steps:
+                Steps after which the episode is truncated. None
+                means it only ends with the game.
+
+            screen_size:
+                The size of the (invisible) screen.
+
+            observation_type:
+                One of OBSERVATIONS. The grayscale frames are only
+                drawn when they're asked for.
+
+            frame_size:
+                The (width, height) of the grayscale frames.
+
+            buffer:
+                An array of observation_shape where the observations
+                are written, e.g. shared memory. The observations
+                returned are then this same array. When None, every
+                observation is a new array.
+        """
+
+        if observation_type not in self.OBSERVATIONS:
+            raise ValueError(f"unknown observation type {observation_type}")
+
+        self.frame_skip = frame_skip
+        self.max_steps = max_steps
+        self.game = HeadlessGame(screen_size)
+        self.steps = 0
+
+        self.observation_type = observation_type
+        self.grayscale = None
+        if observation_type == "grayscale":
+            self.grayscale = Grayscale(self.game.screen, frame_size)
+        self.buffer = buffer
+
+    @property
+    def observation_shape(self):
+        if self.grayscale is not None:
+            return self.grayscale.shape
+        return (state_size(self.game.scene),)
+
+    @property
+    def observation_dtype(self):
+        if self.grayscale is not None:
+            return np.uint8
+        return np.float32
+
+    def observation(self):
+        """Returns the observation of the current frame."""
+
+        if self.grayscale is not None:
+            self.game.render()
+            return self.grayscale(self.buffer)
+        return state_vector(self.game.scene, self.buffer)
+
+    def skip_countdown(self):
+        """Steps the game until its countdown is over."""
+
+        while self.game.scene.on_countdown and not self.game.game_over:
+            self.game.step()
+
+    def reset(self, seed=None):
+        """Starts a new episode.
+
+        Args:
+
+            seed:
+                The seed of the match. When None, a random seed is
+                chosen.
+
+        Returns:
+            An (observation, info) tuple.
+        """
+
+        self.game.reset(seed)
+        self.steps = 0
+        self.skip_countdown()
+        return self.observation(), {"seed": self.game.scene.random.seed}
+
+    def step(self, action):
+        """Plays an action.
+
+        Args:
+
+            action:
+                The index of the action in ACTIONS.
+
+        Returns:
+            An (observation, reward, terminated, truncated, info)
+            tuple. The info dict has the score.
+        """
+
+        game = self.game
+        score, attempts = game.score, game.attempts
+        inputs = ACTIONS[action]
+        for _ in range(self.frame_skip):
+            game.step(inputs)
+            if game.game_over:
+                break
+            self.skip_countdown()
+
+        self.steps += 1
+        reward = (game.score - score) / TARGET_POINTS \
+            - LIFE_PENALTY * (attempts - game.attempts)
+        terminated = game.game_over
+        truncated = not terminated and self.max_steps is not None \
+            and self.steps >= self.max_steps
+
+        return self.observation(), reward, terminated, truncated, \
+            {"score": game.score}
+
+
+def worker(connection, start, amount, total, options):
+    """Runs some PongEnv objects in a worker process, for VectorEnv.
+
+    The observation shape is sent first, and the name of the shared
+    memory block with the arrays of every environment comes back.
+    Then every command comes through the connection as a (name,
+    argument) tuple, and it's answered once the environments from
+    start to start + amount wrote their results in the arrays.
+
+    Finished episodes are started again with the seed of the last
+    one plus total, the amount of environments of the VectorEnv, so
+    seeded runs stay reproducible and no two environments play the
+    same seed.
+    """
+
+    envs = [PongEnv(**options) for _ in range(amount)]
+    connection.send((envs[0].observation_shape,
+                     np.dtype(envs[0].observation_dtype).str))
+
+    shared = SharedArrays(*connection.recv())
+    end = start + amount
+    observations = shared["observations"][start:end]
+    actions = shared["actions"][start:end]
+    rewards = shared["rewards"][start:end]
+    terminated = shared["terminated"][start:end]
+    truncated = shared["truncated"][start:end]
+    scores = shared["scores"][start:end]
+    for env, buffer in zip(envs, observations):
+        env.buffer = buffer
+
+    while True:
+        command, argument = connection.recv()
+
+        if command == "reset":
+            for i, env in enumerate(envs):
+                env.reset(None if argument is None else argument + i)
+        elif command == "step":
+            for i, env in enumerate(envs):
+                _, rewards[i], terminated[i], truncated[i], info = env.step(
+                    actions[i])
+                scores[i] = info["score"]
+                if terminated[i] or truncated[i]:
+                    env.reset(env.game.scene.random.seed + total)
+        elif command == "close":
+            del observations, actions, rewards, terminated, truncated, \
+                scores, buffer
+            for env in envs:
+                env.buffer = None
+            shared.close()
+            connection.close()
+            return
+
+        connection.send(None)
+
+
+class VectorEnv:
+    """Many PongEnv objects stepped together, split among worker
+    processes.
+
+    The actions and the results of every environment are kept in
+    shared memory (see observation.SharedArrays), so only the
+    commands go through the pipes, and the arrays returned are views
+    of that memory: they're overwritten by the next step, copy what
+    must be kept.
+
+    Finished episodes are started again right away, so the
+    observations returned with terminated or truncated set are the
+    first ones of the next episode. Its seed is the one of the
+    finished episode plus the amount of environments.
+    """
+
+    def __init__(self, amount, workers=None, start_method=None, **options):
+        """Initialises the VectorEnv object.
+
+        Args:
+
+            amount:
+                How many environments there are.
+
+            workers:
+                How many processes run them. When None, one for each
+                core, without more processes than environments.
+
+            start_method:
+                The multiprocessing start method, e.g. "spawn". None
+                means the platform default.
+
+            options:
+                The arguments given to every PongEnv, e.g.
+                frame_skip or observation_type. buffer can't be
+                given.
+        """
+
+        if amount < 1:
+            raise ValueError("a VectorEnv needs at least one environment")
+
+        self.amount = amount
+        if workers is None:
+            workers = multiprocessing.cpu_count()
+        workers = max(1, min(workers, amount))
+
+        context = multiprocessing.get_context(start_method)
+        # Started before the workers, so they share it. Otherwise
+        # each would start its own, and destroy the shared memory it
+        # attached to when it ends.
+        resource_tracker.ensure_running()
+        # How many environments each worker runs. The first ones run
+        # one more when they can't be split evenly.
+        self.sizes = [amount // workers + (i < amount % workers)
+                      for i in range(workers)]
+        self.starts = np.cumsum([0] + self.sizes[:-1])
+
+        self.connections = []
+        self.processes = []
+        for start, size in zip(self.starts, self.sizes):
+            connection, worker_connection = context.Pipe()
+            process = context.Process(
+                target=worker,
+                args=(worker_connection, int(start), size, amount, options),
+                daemon=True)
+            process.start()
+            worker_connection.close()
+            self.connections.append(connection)
+            self.processes.append(process)
+
+        shape, dtype = self.connections[0].recv()
+        for connection in self.connections[1:]:
+            connection.recv()
+        self.shared = SharedArrays({
+            "observations": ((amount, *shape), dtype),
+            "actions": ((amount,), np.int64),
+            "rewards": ((amount,), np.float32),
+            "terminated": ((amount,), np.bool_),
+            "truncated": ((amount,), np.bool_),
+            "scores": ((amount,), np.int64),
+        })
+        for connection in self.connections:
+            connection.send((self.shared.specs, self.shared.name))
+
+    def __len__(self):
+        return self.amount
+
+    def send(self, command, arguments):
+        """Sends a command to every worker and waits for all of them
+        to finish it.
+        """
+
+        for connection, argument in zip(self.connections, arguments):
+            connection.send((command, argument))
+        for connection in self.connections:
+            connection.recv()
+
+    def reset(self, seed=None):
+        """Starts a new episode in every environment.
+
+        Args:
+
+            seed:
+                The seed of the first environment. The others get
+                the following ones. None means random seeds.
+
+        Returns:
+            An array with the observation of each environment.
+        """
+
+        self.send("reset", [None if seed is None else seed + int(start)
+                            for start in self.starts])
+        return self.shared["observations"]
+
+    def step(self, actions):
+        """Plays an action in every environment.
+
+        Args:
+
+            actions:
+                An array with an action for each environment.
+
+        Returns:
+            An (observations, rewards, terminated, truncated, scores)
+            tuple of arrays, with one item for each environment. The
+            scores are the ones at the end of the step, before any
+            new episode starts.
+        """
+
+        shared = self.shared
+        shared["actions"][:] = actions
+        self.send("step", [None] * len(self.connections))
+        return shared["observations"], shared["rewards"], \
+            shared["terminated"], shared["truncated"], shared["scores"]
+
+    def close(self):
+        """Stops the worker processes and frees the shared memory."""
+
+        for connection in self.connections:
+            connection.send(("close", None))
+            connection.close()
+        for process in self.processes:
+            process.join()
+        self.connections = []
+        self.processes = []
+        self.shared.close()
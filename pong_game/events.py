@@ -0,0 +1,207 @@
+"""Module dedicated for routing the pygame events to whoever wants
+them.
+
+Instead of every event being handed to every widget, handlers
+subscribe to the event types (and keys, or screen regions) they care
+about. Mouse events are routed through a grid of the screen, so only
+the handlers whose region is under the mouse are even looked at.
+"""
+
+import pygame.constants as constants
+
+# Events that have a pos attribute.
+POSITIONAL_EVENTS = (constants.MOUSEMOTION, constants.MOUSEBUTTONDOWN,
+                     constants.MOUSEBUTTONUP)
+# Events that have a key attribute.
+KEY_EVENTS = (constants.KEYDOWN, constants.KEYUP)
+
+
+class Subscription:
+    """A handler waiting for a kind of event."""
+
+    def __init__(self, order, event_type, handler, region=None, key=None,
+                 when=None, leave=None):
+        self.order = order
+        self.event_type = event_type
+        self.handler = handler
+        self.region = region
+        self.key = key
+        self.when = when
+        self.leave = leave
+
+    def wants(self, event):
+        """Tells if the handler should be called with the event."""
+
+        if self.region is not None \
+                and not self.region.collidepoint(event.pos):
+            return False
+        return self.when is None or self.when()
+
+
+class EventDispatcher:
+    """Calls the subscribed handlers of each event."""
+
+    def __init__(self, cell_size=64):
+        """Initialises the EventDispatcher object.
+
+        Args:
+
+            cell_size:
+                The size of the cells of the grid the regions are
+                indexed in.
+        """
+
+        self.cell_size = cell_size
+        self.order = 0
+
+        # (event type, key or None): subscriptions without a region.
+        self.handlers = dict()
+        # event type: subscriptions with a region.
+        self.region_handlers = dict()
+        # event type: {(column, row): subscriptions overlapping the
+        # cell}. Built from region_handlers when needed.
+        self.grid = dict()
+        self.grid_valid = True
+
+        # event type: the subscriptions with a leave function that
+        # wanted the last event of that type.
+        self.inside = dict()
+
+    def subscribe(self, event_type, handler, region=None, key=None,
+                  when=None, leave=None):
+        """Makes a function be called with every event of a type.
+
+        Args:
+
+            event_type:
+                The type of the events, e.g. pygame.KEYDOWN.
+
+            handler:
+                A function that receives the event.
+
+            region:
+                A Rect object. When given, the handler only receives
+                the mouse events inside of it. The Rect may be moved
+                until the first event is dispatched; call
+                invalidate() when it's moved after that.
+
+            key:
+                When given, the handler only receives the key events
+                of this key.
+
+            when:
+                A function without arguments. When given, the handler
+                only receives the events while it returns True.
+
+            leave:
+                A function that receives the first mouse event that
+                the handler doesn't want anymore, after it received
+                the previous one of the same type, e.g. the mouse
+                leaving the region.
+
+        Returns:
+            The Subscription object, to be given to unsubscribe().
+        """
+
+        self.order += 1
+        subscription = Subscription(self.order, event_type, handler, region,
+                                    key, when, leave)
+        if region is not None:
+            self.region_handlers.setdefault(event_type, []).append(subscription)
+            self.grid_valid = False
+        else:
+            self.handlers.setdefault((event_type, key), []).append(
+                subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Stops calling the handler of the subscription."""
+
+        if subscription.region is not None:
+            self.region_handlers[subscription.event_type].remove(subscription)
+            self.grid_valid = False
+            inside = self.inside.get(subscription.event_type, [])
+            if subscription in inside:
+                inside.remove(subscription)
+        else:
+            self.handlers[(subscription.event_type,
+                           subscription.key)].remove(subscription)
+
+    def invalidate(self):
+        """Makes the regions be indexed again, after they moved."""
+
+        self.grid_valid = False
+
+    def event_types(self):
+        """Returns a set with the event types someone subscribed to."""
+
+        return {event_type for event_type, _ in self.handlers} \
+            | set(self.region_handlers)
+
+    def build_grid(self):
+        """Indexes every region in the cells of the grid it
+        overlaps.
+        """
+
+        size = self.cell_size
+        self.grid.clear()
+        for event_type, subscriptions in self.region_handlers.items():
+            cells = self.grid[event_type] = dict()
+            for subscription in subscriptions:
+                region = subscription.region
+                for column in range(region.left // size,
+                                    (region.right - 1) // size + 1):
+                    for row in range(region.top // size,
+                                     (region.bottom - 1) // size + 1):
+                        cells.setdefault((column, row), []).append(
+                            subscription)
+
+        self.grid_valid = True
+
+    def candidates(self, event):
+        """Returns the subscriptions that may want the event, in the
+        order they were made.
+        """
+
+        subscriptions = self.handlers.get((event.type, None), [])
+        if event.type in KEY_EVENTS:
+            subscriptions = subscriptions \
+                + self.handlers.get((event.type, event.key), [])
+        elif event.type in POSITIONAL_EVENTS \
+                and event.type in self.region_handlers:
+            if not self.grid_valid:
+                self.build_grid()
+            x, y = event.pos
+            subscriptions = subscriptions + self.grid[event.type].get(
+                (x // self.cell_size, y // self.cell_size), [])
+        else:
+            return subscriptions
+
+        return sorted(subscriptions, key=lambda subscription:
+                      subscription.order)
+
+    def dispatch(self, event):
+        """Calls the handlers that want the event.
+
+        Returns:
+            True when some handler was called.
+        """
+
+        handled = False
+        wanted = []
+        for subscription in self.candidates(event):
+            if subscription.wants(event):
+                subscription.handler(event)
+                handled = True
+                if subscription.leave is not None:
+                    wanted.append(subscription)
+
+        if event.type in POSITIONAL_EVENTS:
+            for subscription in self.inside.get(event.type, []):
+                if subscription not in wanted:
+                    subscription.leave(event)
+                    handled = True
+            self.inside[event.type] = wanted
+
+        return handled
@@ -2,49 +2,237 @@
 
 import pygame
 
-from . import scene, utils
+from . import assets, audio, bundle, scene, utils
+from .clock import SimulationClock
+from .preload import Preloader
+from .profiler import Profiler
+from .replay import InputRecorder
+from .viewport import Viewport
 
-# TODO: Make this a class
 
+class Game:
+    """The game window and its main loop.
 
-def main() -> None:
-    """Main Program."""
+    The scenes are updated in fixed time steps (ticks), while the
+    screen is drawn as often as the render rate allows, with the
+    moving elements interpolated between the last two ticks.
+    """
 
-    pygame.init()
-
-    # Pygame setup
+    # The logical resolution, the one the scenes are drawn at.
     SCREEN_SIZE = (600, 400)
-    clock = pygame.time.Clock()
-    screen = pygame.display.set_mode(SCREEN_SIZE)
-    pygame.display.set_caption("Pong Game")
-    pygame.display.set_icon(utils.load_image("icon.png"))
-
-    # Game setup
-    scene_manager = scene.SceneManager()
-    intro_scene = scene.IntroScene(screen)
-    main_menu_scene = scene.MainMenuScene(screen)
-    settings_scene = scene.SettingsScene(screen)
-    game_scene = scene.GameScene(screen)
-    debug_scene = scene.DebugScene(screen)
-    scene_manager.add("game_intro", intro_scene)
-    scene_manager.add("main_menu", main_menu_scene)
-    scene_manager.add("on_settings", settings_scene)
-    scene_manager.add("on_game", game_scene)
-    scene_manager.add("debug", debug_scene)
-    scene_manager.initial_view("game_intro")
-
-    running = True
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            scene_manager.update_on_event(event)
-
-        # Game loop
-        scene_manager.show()
-        scene_manager.update()
-
-        pygame.display.update()
-        clock.tick(60)
-
-    pygame.quit()
+
+    # How many times per second the scenes are updated. The movement
+    # of the game elements is measured in pixels per tick and tuned
+    # for this rate, while the timers run in milliseconds, so it isn't
+    # configurable: any other rate would change the game speed.
+    TICK_RATE = 60
+
+    # Frames that take longer than this are not fully simulated, so a
+    # long hitch doesn't snowball into an even longer catch up.
+    MAX_FRAME_TIME = 250
+    # Bytes the scenes not being shown may keep before being evicted.
+    SCENE_BUDGET = 2 * 2**20
+    # Events always wanted, whatever the scene: closing the window
+    # and the profiler hotkeys.
+    ALLOWED_EVENTS = (pygame.QUIT, pygame.KEYDOWN)
+
+    def __init__(self, render_rate=60, dirty_rendering=False,
+                 record_path=None, stress_balls=0, output_size=None,
+                 fullscreen=False):
+        """Initialises the Game object.
+
+        Args:
+
+            render_rate:
+                The maximum amount of frames drawn per second. 0 means
+                no limit.
+
+            dirty_rendering:
+                When True, only the areas of the screen that changed
+                are sent to the display every frame.
+
+            record_path:
+                When given, the input of the last match played is
+                saved into this file when the game is closed.
+
+            stress_balls:
+                How many extra balls are kept in the game, as a
+                stress test.
+
+            output_size:
+                The (width, height) size of the window. The scenes
+                are scaled to it. None means SCREEN_SIZE.
+
+            fullscreen:
+                When True, the game takes the whole display.
+        """
+
+        self.stress_balls = stress_balls
+        self.render_rate = render_rate
+        self.tick_time = 1000 / self.TICK_RATE
+
+        pygame.init()
+        bundle.install()
+
+        # Pygame setup
+        self.frame_clock = pygame.time.Clock()
+        self.viewport = Viewport(self.SCREEN_SIZE, output_size, fullscreen)
+        self.screen = self.viewport.open()
+        pygame.display.set_caption("Pong Game")
+        pygame.display.set_icon(utils.load_image("icon.png"))
+
+        # The time of the scenes and of the sound effects.
+        self.clock = SimulationClock()
+        for path in audio.sounds.setup(self.clock):
+            print(f"missing sound effect {path}, it won't be played")
+
+        # Only the intro is built before the first frame. The assets
+        # of the other scenes are decoded while the intro is shown.
+        self.preloader = Preloader()
+        self.preloader.queue(
+            assets.SCENE_IMAGES,
+            [path for path, effect in audio.sounds.effects.items()
+             if effect.enabled])
+
+        # Game setup
+        self.scene_manager = scene.SceneManager(
+            self.clock, dirty_rendering, self.SCENE_BUDGET,
+            self.ALLOWED_EVENTS)
+        self.scene_manager.mouse_position = lambda: self.viewport.to_logical(
+            pygame.mouse.get_pos())
+        self.scene_manager.register(
+            "game_intro",
+            lambda: scene.IntroScene(self.screen, self.finish_loading))
+        self.scene_manager.initial_view("game_intro")
+
+        self.profiler = Profiler(self.screen)
+        self.scene_manager.profiler = self.profiler
+
+        self.record_path = record_path
+        self.recorder = None
+        if record_path is not None:
+            self.recorder = InputRecorder(self.tick_time)
+
+        self.loaded = False
+        self.running = False
+
+    def finish_loading(self):
+        """Waits for the preloaded assets and registers the remaining
+        scenes. They are built the first time they are shown.
+        Nothing happens when they're already registered.
+        """
+
+        if self.loaded:
+            return
+
+        self.preloader.wait()
+        self.preloader.shutdown()
+        assets.images.build_atlas()
+
+        self.scene_manager.register(
+            "main_menu", lambda: scene.MainMenuScene(self.screen))
+        self.scene_manager.register(
+            "on_settings", lambda: scene.SettingsScene(self.screen))
+        self.scene_manager.register("on_game", self.build_game_scene)
+        self.scene_manager.register(
+            "debug", lambda: scene.DebugScene(self.screen))
+
+        self.loaded = True
+
+    def build_game_scene(self):
+        """Returns a new GameScene, recording the input when asked
+        to.
+        """
+
+        game_scene = scene.GameScene(self.screen)
+        game_scene.recorder = self.recorder
+        game_scene.stress_balls = self.stress_balls
+        return game_scene
+
+    def tick(self):
+        """Updates the scenes by one fixed time step."""
+
+        self.clock.advance(self.tick_time)
+        self.scene_manager.update()
+
+    def run(self):
+        """Runs the main loop until the window is closed."""
+
+        self.running = True
+        accumulator = 0
+        self.frame_clock.tick()
+
+        while self.running:
+            with self.profiler.phase("events"):
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        self.running = False
+                    self.viewport.translate(event)
+                    self.profiler.update_on_event(event)
+                    self.scene_manager.update_on_event(event)
+
+            if not self.loaded:
+                self.preloader.poll()
+                if self.preloader.done:
+                    self.finish_loading()
+
+            # Game loop
+            accumulator += min(self.frame_clock.get_time(),
+                               self.MAX_FRAME_TIME)
+            while accumulator >= self.tick_time:
+                self.tick()
+                accumulator -= self.tick_time
+
+            dirty_rects = self.scene_manager.show(
+                accumulator / self.tick_time)
+            if self.profiler.visible:
+                self.profiler.draw()
+                dirty_rects = None
+
+            with self.profiler.phase("display"):
+                dirty_rects = self.viewport.present(dirty_rects)
+                if dirty_rects is None:
+                    pygame.display.update()
+                else:
+                    pygame.display.update(dirty_rects)
+            self.profiler.end_frame(self.scene_manager.stats())
+            self.frame_clock.tick(self.render_rate)
+
+        self.preloader.shutdown()
+        if self.recorder is not None:
+            self.recorder.save(self.record_path)
+        pygame.quit()
+
+
+def main(render_rate=60, dirty_rendering=False, record_path=None,
+         stress_balls=0, output_size=None, fullscreen=False) -> None:
+    """Main Program.
+
+    Args:
+
+        render_rate:
+            The maximum amount of frames drawn per second. 0 means no
+            limit.
+
+        dirty_rendering:
+            When True, only the areas of the screen that changed are
+            sent to the display every frame.
+
+        record_path:
+            When given, the input of the last match played is saved
+            into this file when the game is closed.
+
+        stress_balls:
+            How many extra balls are kept in the game, as a stress
+            test.
+
+        output_size:
+            The (width, height) size of the window. None means the
+            logical size.
+
+        fullscreen:
+            When True, the game takes the whole display.
+    """
+
+    Game(render_rate, dirty_rendering, record_path, stress_balls,
+         output_size, fullscreen).run()
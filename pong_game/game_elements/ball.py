@@ -1,14 +1,21 @@
 import pygame.sprite as sprite
 
 from .. import utils
-from .particle import Particle
+from .collision import sweep, wall_time
 
 
 class Ball(sprite.Sprite):
     """Class that represents a literal ball. This ball is used on the
     game or anything else, like a demonstration.
+
+    The ball movement is swept: every update, the things it hits are
+    found in the order it hits them, at their exact time of impact, so
+    the ball never goes through anything, however fast it is.
     """
 
+    # The most contacts resolved in a single update.
+    MAX_CONTACTS = 4
+
     def __init__(self, screen, on_game=True):
         """Initialises the Ball object.
 
@@ -34,11 +41,28 @@ class Ball(sprite.Sprite):
         self.hit_soundfx = "on_game/soundfx/ball_hit.ogg"
         self.rect = self.image.get_rect()
 
+        # The exact position of the ball. The rect is this position
+        # rounded.
+        self.position = [float(self.rect.x), float(self.rect.y)]
+
+        # Where the ball was before the last update. Used to draw it
+        # between two updates.
+        self.previous_position = self.rect.topleft
+
         self.xspeed = 2
         self.yspeed = 2
 
         self.points = 0
 
+    def reset(self):
+        """Puts the speed and the points back to their initial
+        values.
+        """
+
+        self.xspeed = 2
+        self.yspeed = 2
+        self.points = 0
+
     @property
     def x(self):
         return self.rect.x
@@ -49,80 +73,148 @@ class Ball(sprite.Sprite):
 
     @x.setter
     def x(self, value):
-        self.rect.x = value
+        # Moving the ball by hand is a teleport, nothing to
+        # interpolate.
+        self.place(x=value)
 
     @y.setter
     def y(self, value):
-        self.rect.y = value
+        self.place(y=value)
 
-    def draw(self):
-        """It draws the ball on the surface."""
+    def place(self, **position):
+        """Moves the ball without any interpolation, for instance
+        place(center=(300, 200)).
+        """
 
-        self.screen.blit(self.image, self.rect)
+        for attribute, value in position.items():
+            setattr(self.rect, attribute, value)
+        self.position = [float(self.rect.x), float(self.rect.y)]
+        self.previous_position = self.rect.topleft
 
-    def check_wall_collision(self, particles_group):
-        """Checks for wall collisions.
+    def draw(self, interpolation=1.0):
+        """It draws the ball on the surface.
 
         Args:
 
-            particles_group:
-                A list object containing groups of particles to be
-                drawn onto screen.
+            interpolation:
+                How far (from 0 to 1) the ball is drawn between its
+                previous and current positions.
         """
 
-        if self.rect.left <= self.screen_rect.left \
-                or self.rect.right >= self.screen_rect.right:
+        self.screen.blit(self.image, utils.interpolate(
+            self.previous_position, self.rect.topleft, interpolation))
 
-            if self.on_game:
-                utils.play_soundfx(self.hit_soundfx)
+    def motion_rect(self):
+        """Returns the Rect that covers the ball in its previous and
+        current positions, that is, anywhere it may be drawn.
+        """
 
-            self.xspeed *= -1
-            particles = Particle.create_particles(self.screen, self.rect.x,
-                                                  self.rect.y)
-            particles_group.append(particles)
-        elif self.rect.top <= self.screen_rect.top \
-                or (self.rect.bottom >= self.screen_rect.bottom
-                    and not self.on_game):
+        return self.rect.union(self.rect.move(
+            self.previous_position[0] - self.rect.x,
+            self.previous_position[1] - self.rect.y))
 
-            if self.on_game:
-                utils.play_soundfx(self.hit_soundfx)
+    def wall_contact(self, velocity):
+        """Returns the (time, normal) of the first wall hit during the
+        given movement, or None.
+        """
 
-            self.yspeed *= -1
-            particles = Particle.create_particles(self.screen, self.rect.x,
-                                                  self.rect.y)
-            particles_group.append(particles)
+        x, y = self.position
+        # Out of a game, the ball bounces on the bottom too.
+        bottom = None if self.on_game else self.screen_rect.bottom
 
-    def check_paddle_collision(self, paddle):
-        """Checks a paddle collision.
+        time_x = wall_time(x, self.rect.width, velocity[0],
+                           self.screen_rect.left, self.screen_rect.right)
+        time_y = wall_time(y, self.rect.height, velocity[1],
+                           self.screen_rect.top, bottom)
 
-        Args:
+        times = [time for time in (time_x, time_y) if time is not None]
+        if not times:
+            return None
 
-            paddle:
-                A Paddle object that is the player.
-        """
+        time = min(times)
+        normal_x = 0 if time_x != time else -1 if velocity[0] > 0 else 1
+        normal_y = 0 if time_y != time else -1 if velocity[1] > 0 else 1
+        return time, (normal_x, normal_y)
+
+    def hit_wall(self, particles):
+        """Called when the ball bounces on a wall."""
 
-        if self.rect.colliderect(paddle.rect) and self.yspeed > 0:
+        if self.on_game:
             utils.play_soundfx(self.hit_soundfx)
-            self.yspeed *= -1
+        particles.emit(self.rect.x, self.rect.y)
 
-    def update(self, particles_group, paddle=None):
+    def hit_paddle(self, particles):
+        """Called when the ball bounces on the paddle."""
+
+        utils.play_soundfx(self.hit_soundfx)
+
+    def update(self, particles, paddle=None, targets=None):
         """It updates the movement of the ball.
 
         Args:
 
-            particles_group:
-                A list object with groups of particles.
+            particles:
+                A ParticleSystem object.
 
             paddle:
                 A Paddle (player) object. Use None when this ball
                 isn't in a game.
-        """
 
-        self.x += self.xspeed
-        self.y += self.yspeed
+            targets:
+                A TargetField object the ball can hit, or None.
+        """
 
-        # Movement logic
-        self.check_wall_collision(particles_group)
+        self.previous_position = self.rect.topleft
+
+        remaining = 1.0
+        for _ in range(self.MAX_CONTACTS):
+            velocity = (self.xspeed * remaining, self.yspeed * remaining)
+            box = (*self.position, self.rect.width, self.rect.height)
+
+            # The first thing hit is the one resolved. Its on_hit
+            # function is called after the ball is moved there.
+            contact = None
+            wall = self.wall_contact(velocity)
+            if wall is not None:
+                contact = (*wall, self.hit_wall)
+
+            # The paddle only sends the ball back up.
+            if paddle is not None and self.yspeed > 0:
+                hit = sweep(box, velocity, paddle.rect)
+                if hit is not None and (contact is None
+                                        or hit[0] < contact[0]):
+                    contact = (*hit, self.hit_paddle)
+
+            if targets is not None:
+                hit = targets.sweep(self, box, velocity)
+                if hit is not None and (contact is None
+                                        or hit[0] < contact[0]):
+                    contact = hit
+
+            if contact is None:
+                break
+
+            time, normal, on_hit = contact
+            self.move(velocity[0] * time, velocity[1] * time)
+            if normal[0]:
+                self.xspeed = abs(self.xspeed) * normal[0]
+            if normal[1]:
+                self.yspeed = abs(self.yspeed) * normal[1]
+            on_hit(particles)
+            remaining *= 1 - time
+        else:
+            # Too many contacts in a single update. The rest of the
+            # movement is dropped.
+            return
+
+        self.move(self.xspeed * remaining, self.yspeed * remaining)
+
+    def move(self, dx, dy):
+        """Moves the exact position of the ball, keeping the rect
+        along.
+        """
 
-        if paddle is not None:
-            self.check_paddle_collision(paddle)
+        self.position[0] += dx
+        self.position[1] += dy
+        self.rect.topleft = (round(self.position[0]),
+                             round(self.position[1]))
@@ -0,0 +1,108 @@
+"""Module dedicated for the swept collision tests of moving boxes.
+
+Instead of moving a box and then checking what it overlaps, the whole
+movement of the step is tested, so the exact time of impact is found
+and nothing is skipped, however fast the box moves.
+"""
+
+import math
+
+
+def sweep(box, velocity, obstacle):
+    """Finds when a moving box hits a standing one.
+
+    Args:
+
+        box:
+            A (x, y, width, height) tuple with the moving box at the
+            start of the movement.
+
+        velocity:
+            A (x, y) tuple with the whole movement.
+
+        obstacle:
+            A Rect (or rect-like) object that doesn't move.
+
+    Returns:
+        A (time, normal) tuple, where time goes from 0 (start of the
+        movement) to 1 (its end) and normal is the (x, y) side of the
+        obstacle that was hit, e.g. (0, -1) is the top. Both normal
+        components are set when a corner is hit. None when the box
+        doesn't hit the obstacle during the movement.
+    """
+
+    x, y, width, height = box
+    ox, oy, owidth, oheight = obstacle
+
+    entry_x, exit_x = _axis_times(x, width, velocity[0], ox, owidth)
+    entry_y, exit_y = _axis_times(y, height, velocity[1], oy, oheight)
+
+    entry = max(entry_x, entry_y)
+    exit = min(exit_x, exit_y)
+    if entry > exit or entry > 1 or exit <= 0:
+        return None
+
+    normal_x = -math.copysign(1, velocity[0]) if entry_x == entry else 0
+    normal_y = -math.copysign(1, velocity[1]) if entry_y == entry else 0
+
+    # Boxes that already overlap are hit right away.
+    return max(entry, 0), (int(normal_x), int(normal_y))
+
+
+def _axis_times(position, size, speed, obstacle_position, obstacle_size):
+    """Returns when the box starts and stops overlapping the obstacle
+    along one axis.
+    """
+
+    if speed > 0:
+        return ((obstacle_position - (position + size)) / speed,
+                (obstacle_position + obstacle_size - position) / speed)
+    if speed < 0:
+        return ((obstacle_position + obstacle_size - position) / speed,
+                (obstacle_position - (position + size)) / speed)
+
+    if position + size <= obstacle_position \
+            or position >= obstacle_position + obstacle_size:
+        # Never overlaps along this axis.
+        return math.inf, -math.inf
+    return -math.inf, math.inf
+
+
+def wall_time(position, size, speed, low, high):
+    """Finds when a box moving along one axis reaches one of two
+    walls.
+
+    Args:
+
+        position:
+            The box position along the axis.
+
+        size:
+            The box size along the axis.
+
+        speed:
+            The whole movement along the axis.
+
+        low:
+            The position of the wall at the lower end.
+
+        high:
+            The position of the wall at the higher end. None when
+            there's no wall there.
+
+    Returns:
+        The time (from 0 to 1) when the wall the box moves to is
+        reached, 0 when it's already past it. None when no wall is
+        reached during the movement.
+    """
+
+    if speed < 0 and low is not None:
+        time = (low - position) / speed
+    elif speed > 0 and high is not None:
+        time = (high - (position + size)) / speed
+    else:
+        return None
+
+    if time > 1:
+        return None
+    return max(time, 0)
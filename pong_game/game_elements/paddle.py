@@ -1,6 +1,6 @@
 import pygame.sprite as sprite
 
-from ..utils import load_image
+from ..utils import interpolate, load_image
 
 
 class Paddle(sprite.Sprite):
@@ -26,14 +26,43 @@ class Paddle(sprite.Sprite):
         self.image = load_image("on_game/paddle.png")
         self.rect = self.image.get_rect()
 
+        # Where the paddle was before the last update.
+        self.previous_position = self.rect.topleft
+
         self.moving_right = False
         self.moving_left = False
         self.speed = 3
 
-    def draw(self):
-        """It draws the paddle on the screen."""
+    def draw(self, interpolation=1.0):
+        """It draws the paddle on the screen.
+
+        Args:
+
+            interpolation:
+                How far (from 0 to 1) the paddle is drawn between its
+                previous and current positions.
+        """
+
+        self.screen.blit(self.image, interpolate(
+            self.previous_position, self.rect.topleft, interpolation))
+
+    def motion_rect(self):
+        """Returns the Rect that covers the paddle in its previous
+        and current positions, that is, anywhere it may be drawn.
+        """
+
+        return self.rect.union(self.rect.move(
+            self.previous_position[0] - self.rect.x,
+            self.previous_position[1] - self.rect.y))
+
+    def place(self, **position):
+        """Moves the paddle without any interpolation, for instance
+        place(centerx=300).
+        """
 
-        self.screen.blit(self.image, self.rect)
+        for attribute, value in position.items():
+            setattr(self.rect, attribute, value)
+        self.previous_position = self.rect.topleft
 
     def move_left(self, moving: bool):
         self.moving_left = moving
@@ -44,6 +73,7 @@ class Paddle(sprite.Sprite):
     def update(self):
         """It updates the paddle state."""
 
+        self.previous_position = self.rect.topleft
         if self.moving_right and self.rect.right <= self.screen_rect.right:
             self.rect.x += self.speed
         if self.moving_left and self.rect.left >= self.screen_rect.left:
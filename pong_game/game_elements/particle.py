@@ -1,70 +1,132 @@
 """Module created for dealing with particles."""
 
-import random
+import numpy as np
+import pygame.rect as rect
 
-import pygame.sprite as sprite
 from .. import utils
 
 
-class Particle(sprite.Sprite):
-    """Class that represents a tiny particle coming from hit walls
-    or targets."""
+class ParticleSystem:
+    """Class that represents every tiny particle coming from hit
+    walls or targets in a scene.
 
-    def __init__(self, screen, x_pos, y_pos):
-        """Initialises the Particle object.
+    Instead of one sprite per particle, the particles are kept in
+    preallocated arrays, so each frame is updated in one go and drawn
+    with a single batched blit.
+    """
+
+    PARTICLES_PER_BURST = 10
+
+    def __init__(self, screen, capacity=1024, rng=None):
+        """Initialises the ParticleSystem object.
 
         Args:
 
-            xpos:
-                X position.
+            screen:
+                A Surface object representing the window's surface.
 
-            ypos:
-                Y position.
+            capacity:
+                The maximum amount of live particles. Bursts that
+                don't fit are cut short.
+
+            rng:
+                The NumPy Generator used to scatter the particles.
+                When None, a new unseeded one is used.
         """
 
-        super().__init__()
+        self.screen = screen
         self.screen_rect = screen.get_rect()
         self.image = utils.load_image("on_game/particle.png")
-        self.rect = self.image.get_rect()
-
-        self.accel_factor = random.randint(1, 4)
-
-        self.xspeed = random.choice([-1, 1])*random.randint(1, 6)
-        self.yspeed = 4
+        self.width, self.height = self.image.get_size()
 
-        self.rect.x = x_pos
-        self.rect.y = y_pos
+        self.capacity = capacity
+        self.position = np.zeros((capacity, 2), dtype=np.int32)
+        self.velocity = np.zeros((capacity, 2), dtype=np.int32)
+        self.acceleration = np.zeros(capacity, dtype=np.int32)
+        self.alive = np.zeros(capacity, dtype=bool)
 
-    def update(self):
-        """It updates the particle movement."""
-
-        self.rect.x += self.xspeed
-        self.rect.y += self.yspeed
+        # Live particles are always packed in the first count slots.
+        self.count = 0
 
-        self.yspeed += self.accel_factor
+        self.rng = rng if rng is not None else np.random.default_rng()
 
-        if self.rect.bottom > self.screen_rect.bottom:
-            self.kill()
+    def __len__(self):
+        return self.count
 
-    @staticmethod
-    def create_particles(screen, x_pos, y_pos):
-        """Creates a Group of particles.
+    def emit(self, x_pos, y_pos, amount=PARTICLES_PER_BURST):
+        """Creates a burst of particles.
 
         Args:
 
-            screen:
-                A Surface object representing the window's surface.
-
-            xpos:
+            x_pos:
                 X position.
 
-            ypos:
+            y_pos:
                 Y position.
+
+            amount:
+                How many particles the burst has.
         """
 
-        group = sprite.Group()
+        start = self.count
+        end = min(start + amount, self.capacity)
+        amount = end - start
+        if amount <= 0:
+            return
+
+        self.position[start:end] = (x_pos, y_pos)
+        self.velocity[start:end, 0] = \
+            self.rng.choice((-1, 1), amount) \
+            * self.rng.integers(1, 7, amount)
+        self.velocity[start:end, 1] = 4
+        self.acceleration[start:end] = self.rng.integers(1, 5, amount)
+        self.count = end
+
+    def clear(self):
+        """Kills every particle."""
+
+        self.count = 0
 
-        for i in range(10):
-            group.add(Particle(screen, x_pos, y_pos))
+    def draw(self):
+        """It draws every live particle on the screen."""
+
+        if self.count:
+            image = self.image
+            self.screen.blits(
+                [(image, pos) for pos in self.position[:self.count].tolist()],
+                False)
+
+    def rects(self):
+        """Returns a list with the Rect of every live particle."""
+
+        w, h = self.width, self.height
+        return [rect.Rect(x, y, w, h)
+                for x, y in self.position[:self.count].tolist()]
+
+    def update(self):
+        """It updates the particles movement and gets rid of the ones
+        that left the screen.
+        """
 
-        return group
+        n = self.count
+        if n == 0:
+            return
+
+        position = self.position[:n]
+        velocity = self.velocity[:n]
+        alive = self.alive[:n]
+
+        position += velocity
+        velocity[:, 1] += self.acceleration[:n]
+
+        np.less_equal(position[:, 1] + self.height, self.screen_rect.bottom,
+                      out=alive)
+        alive_count = int(np.count_nonzero(alive))
+        if alive_count < n:
+            # Compacts the survivors to the front in bulk.
+            alive_indices = np.flatnonzero(alive)
+            self.position[:alive_count] = position[alive_indices]
+            self.velocity[:alive_count] = velocity[alive_indices]
+            self.acceleration[:alive_count] = \
+                self.acceleration[:n][alive_indices]
+            self.count = alive_count
@@ -0,0 +1,296 @@
+"""Module created for dealing with many balls at once."""
+
+import numpy as np
+import pygame.rect as rect
+
+from .. import utils
+
+
+class BallSwarm:
+    """Class that represents extra balls, from a few (the multi-ball
+    power-up) to thousands (the stress mode).
+
+    Like the particles, the balls are kept in preallocated arrays, so
+    they're moved and collided against the walls, the paddle and the
+    target grid in a few NumPy operations per frame, however many
+    there are.
+
+    The collisions are tested after each step, so the balls are never
+    faster than MAX_SPEED pixels per update, less than a ball or a
+    target cell.
+    """
+
+    MAX_SPEED = 6
+
+    def __init__(self, screen, capacity=4096, rng=None, on_game=True):
+        """Initialises the BallSwarm object.
+
+        Args:
+
+            screen:
+                A Surface object representing the window's surface.
+
+            capacity:
+                The maximum amount of balls. Balls that don't fit are
+                not created.
+
+            rng:
+                The NumPy Generator that picks the balls directions.
+                When None, a new unseeded one is used.
+
+            on_game:
+                A boolean value that indicates if the balls are in an
+                actual game, where they fall off the bottom of the
+                screen.
+        """
+
+        self.screen = screen
+        self.screen_rect = screen.get_rect()
+        self.on_game = on_game
+        self.image = utils.load_image("on_game/ball.png")
+        self.width, self.height = self.image.get_size()
+        self.hit_soundfx = "on_game/soundfx/ball_hit.ogg"
+
+        self.capacity = capacity
+        self.position = np.zeros((capacity, 2))
+        self.previous_position = np.zeros((capacity, 2))
+        self.velocity = np.zeros((capacity, 2))
+
+        # Live balls are always packed in the first count slots.
+        self.count = 0
+
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+    def __len__(self):
+        return self.count
+
+    def emit(self, x_pos, y_pos, amount=1):
+        """Creates balls going up, in random directions.
+
+        Args:
+
+            x_pos:
+                X position.
+
+            y_pos:
+                Y position.
+
+            amount:
+                How many balls are created.
+        """
+
+        start = self.count
+        end = min(start + amount, self.capacity)
+        amount = end - start
+        if amount <= 0:
+            return
+
+        self.position[start:end] = (x_pos, y_pos)
+        self.previous_position[start:end] = (x_pos, y_pos)
+        self.velocity[start:end, 0] = self.rng.uniform(
+            -self.MAX_SPEED, self.MAX_SPEED, amount)
+        self.velocity[start:end, 1] = -self.rng.uniform(
+            2, self.MAX_SPEED, amount)
+        self.count = end
+
+    def clear(self):
+        """Removes every ball."""
+
+        self.count = 0
+
+    def draw(self, interpolation=1.0):
+        """It draws every ball on the screen.
+
+        Args:
+
+            interpolation:
+                How far (from 0 to 1) the balls are drawn between
+                their previous and current positions.
+        """
+
+        n = self.count
+        if n == 0:
+            return
+
+        position = self.position[:n]
+        if interpolation < 1:
+            previous = self.previous_position[:n]
+            position = previous + (position - previous) * interpolation
+
+        image = self.image
+        self.screen.blits(
+            [(image, pos) for pos in np.rint(position).astype(np.int32)
+             .tolist()],
+            False)
+
+    def rects(self):
+        """Returns a list with the Rect of every ball."""
+
+        w, h = self.width, self.height
+        return [rect.Rect(x, y, w, h) for x, y in
+                np.rint(self.position[:self.count]).astype(np.int32).tolist()]
+
+    def motion_rects(self):
+        """Returns a list with the Rect that covers every ball in its
+        previous and current positions, that is, anywhere it may be
+        drawn.
+        """
+
+        n = self.count
+        position = np.rint(self.position[:n]).astype(np.int32)
+        previous = np.rint(self.previous_position[:n]).astype(np.int32)
+        left = np.minimum(position[:, 0], previous[:, 0])
+        top = np.minimum(position[:, 1], previous[:, 1])
+        width = np.abs(position[:, 0] - previous[:, 0]) + self.width
+        height = np.abs(position[:, 1] - previous[:, 1]) + self.height
+        return [rect.Rect(*area) for area in
+                np.stack((left, top, width, height), axis=1).tolist()]
+
+    def update(self, paddle=None, targets=None, particles=None):
+        """It moves the balls and makes them bounce on whatever they
+        hit.
+
+        Args:
+
+            paddle:
+                A Paddle object, or None.
+
+            targets:
+                A TargetField object the balls can hit, or None.
+
+            particles:
+                A ParticleSystem object where the particles of the
+                hit targets are emitted, or None.
+
+        Returns:
+            The points made by the targets hit.
+        """
+
+        n = self.count
+        if n == 0:
+            return 0
+
+        position = self.position[:n]
+        velocity = self.velocity[:n]
+        self.previous_position[:n] = position
+        position += velocity
+
+        self.bounce_on_walls(position, velocity)
+
+        if paddle is not None:
+            self.bounce_on_paddle(position, velocity, paddle.rect)
+
+        points = 0
+        if targets is not None:
+            points = self.bounce_on_targets(position, velocity, targets,
+                                            particles)
+
+        if self.on_game:
+            # The balls that fell off the screen are gone.
+            self.remove(position[:, 1] <= self.screen_rect.bottom)
+
+        return points
+
+    def bounce_on_walls(self, position, velocity):
+        """Mirrors the balls that went past a wall back in."""
+
+        x, y = position[:, 0], position[:, 1]
+        left, top = self.screen_rect.left, self.screen_rect.top
+        right = self.screen_rect.right - self.width
+        bottom = self.screen_rect.bottom - self.height
+
+        for coordinate, speed, low, high in (
+                (x, velocity[:, 0], left, right),
+                (y, velocity[:, 1], top, None if self.on_game else bottom)):
+            past = coordinate < low
+            coordinate[past] = 2 * low - coordinate[past]
+            np.abs(speed, out=speed, where=past)
+            if high is not None:
+                past = coordinate > high
+                coordinate[past] = 2 * high - coordinate[past]
+                speed[past] = -np.abs(speed[past])
+
+    def bounce_on_paddle(self, position, velocity, paddle_rect):
+        """Sends the balls going down on the paddle back up."""
+
+        x, y = position[:, 0], position[:, 1]
+        hit = (velocity[:, 1] > 0) \
+            & (x < paddle_rect.right) & (x + self.width > paddle_rect.left) \
+            & (y < paddle_rect.bottom) & (y + self.height > paddle_rect.top)
+        if hit.any():
+            y[hit] = paddle_rect.top - self.height
+            velocity[hit, 1] *= -1
+            if self.on_game:
+                utils.play_soundfx(self.hit_soundfx)
+
+    def bounce_on_targets(self, position, velocity, targets, particles):
+        """Bounces the balls whose centre entered a standing target
+        cell, making the targets fall.
+
+        Returns:
+            The points made by the targets hit.
+        """
+
+        size = targets.CELL_SIZE
+        half = np.array((self.width / 2, self.height / 2))
+        previous = self.previous_position[:len(position)]
+
+        # (row, column) cell of each ball centre, before and after the
+        # step.
+        cell = np.floor((position + half)[:, ::-1] / size).astype(np.int64)
+        previous_cell = np.floor(
+            (previous + half)[:, ::-1] / size).astype(np.int64)
+
+        in_field = (cell[:, 0] >= 0) & (cell[:, 0] < targets.rows) \
+            & (cell[:, 1] >= 0) & (cell[:, 1] < targets.columns)
+        if not in_field.any():
+            return 0
+
+        standing = np.pad(targets.alive & ~targets.falling, ((1, 1), (1, 1)))
+
+        def is_standing(rows, columns):
+            # The padding stands for the cells out of the field.
+            return standing[np.clip(rows, -1, targets.rows) + 1,
+                            np.clip(columns, -1, targets.columns) + 1]
+
+        row, column = cell[:, 0], cell[:, 1]
+        previous_row, previous_column = previous_cell[:, 0], \
+            previous_cell[:, 1]
+
+        # A ball crossing a horizontal border into a target bounces
+        # vertically, one crossing a vertical border bounces
+        # horizontally. The target it entered is the one hit.
+        hit_y = in_field & (row != previous_row) \
+            & is_standing(row, previous_column)
+        hit_x = in_field & (column != previous_column) \
+            & is_standing(previous_row, column)
+        hit_corner = in_field & ~(hit_x | hit_y) & is_standing(row, column)
+
+        hit_rows = np.concatenate(
+            (row[hit_y], previous_row[hit_x], row[hit_corner]))
+        hit_columns = np.concatenate(
+            (previous_column[hit_y], column[hit_x], column[hit_corner]))
+        if hit_rows.size == 0:
+            return 0
+
+        bounce_y = hit_y | hit_corner
+        bounce_x = hit_x | hit_corner
+        position[bounce_y, 1] = previous[bounce_y, 1]
+        velocity[bounce_y, 1] *= -1
+        position[bounce_x, 0] = previous[bounce_x, 0]
+        velocity[bounce_x, 0] *= -1
+
+        return 100 * targets.hit_cells(hit_rows, hit_columns, particles)
+
+    def remove(self, keep):
+        """Removes the balls not marked in the given boolean array,
+        packing the others in the first slots.
+        """
+
+        kept = int(np.count_nonzero(keep))
+        if kept < self.count:
+            indices = np.flatnonzero(keep)
+            for array in (self.position, self.previous_position,
+                          self.velocity):
+                array[:kept] = array[:self.count][indices]
+            self.count = kept
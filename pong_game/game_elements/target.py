@@ -1,20 +1,39 @@
+import functools
+import math
 import random
 
-import pygame.sprite as sprite
+import numpy as np
+import pygame.rect as rect
 import pygame.surface as surface
 
 from .. import utils
-from .particle import Particle
+from . import collision
 
+# Each colour channel of a target takes one of these many values, so
+# there's a small set of tinted target sprites that can be shared.
+COLOUR_LEVELS = 8
+PALETTE = [
+    (255 * r // (COLOUR_LEVELS - 1), 255 * g // (COLOUR_LEVELS - 1),
+     255 * b // (COLOUR_LEVELS - 1))
+    for r in range(COLOUR_LEVELS)
+    for g in range(COLOUR_LEVELS)
+    for b in range(COLOUR_LEVELS)
+]
 
-class Target(sprite.Sprite):
-    """Class that represents a literal target, the one that will
+
+class TargetField:
+    """Class that represents the literal targets, the ones that will
     be hit by the ball.
+
+    The targets are laid on a grid and their state (alive, falling
+    and how much they fell) is kept per cell, so the ball only has to
+    be tested against the cells its rect overlaps.
     """
 
-    def __init__(self, screen, on_game=True):
-        """Initialises the Target object. This object isn't used
-        directly by the game but by the Targets class instead.
+    CELL_SIZE = 32
+
+    def __init__(self, screen, on_game=True, rows=5, rng=None):
+        """Initialises the TargetField object.
 
         Args:
 
@@ -23,117 +42,307 @@ class Target(sprite.Sprite):
                 background.
 
             on_game:
-                A boolean value that indicates if the target is on a
-                match.
-        """
+                A boolean value that indicates if the targets are on
+                a match.
+
+            rows:
+                How many rows of targets the field has.
 
-        sprite.Sprite.__init__(self)
+            rng:
+                The random.Random object that picks the targets
+                colours. When None, the random module is used.
+        """
 
         self.screen = screen
         self.screen_rect = screen.get_rect()
 
         self.on_game = on_game
+        self.rng = rng if rng is not None else random
 
-        self.image = surface.Surface((32, 32))
-        self.rect = self.image.get_rect()
-        self.image.fill([random.randint(0, 255) for i in range(3)])
-        self.image.blit(utils.load_image("on_game/target.png"), self.rect)
+        self.rows = rows
+        self.columns = self.screen_rect.width // self.CELL_SIZE + 1
+
+        shape = (self.rows, self.columns)
+        self.alive = np.zeros(shape, dtype=bool)
+        # Replaced with True when the target get hit
+        self.falling = np.zeros(shape, dtype=bool)
+        self.fall_offset = np.zeros(shape, dtype=np.int32)
+        # The fall offset of every cell in the last dirty_rects() call.
+        self.reported_offset = np.zeros(shape, dtype=np.int32)
+        self.images = [[None] * self.columns for row in range(self.rows)]
 
         self.vanish_soundfx = "on_game/soundfx/vanishing.wav"
         self.target_hit_soundfx = "on_game/soundfx/target_hit.wav"
 
-        # Replaced with True when this target get hit
-        self.falling = False
-
-    def collision(self, ball, particles_group):
-        if ball.rect.colliderect(self.rect) and not self.falling:
-            if abs(ball.rect.top - self.rect.bottom) < 10 \
-                    and ball.yspeed < 0:
-                ball.yspeed *= -1
-            elif abs(ball.rect.bottom - self.rect.top) < 10 \
-                    and ball.yspeed > 0:
-                ball.yspeed *= -1
-            elif abs(ball.rect.left - self.rect.right) < 10:
-                ball.xspeed *= -1
-            elif abs(ball.rect.right - self.rect.left) < 10:
-                ball.xspeed *= -1
-            if self.on_game:
-                utils.play_soundfx(self.target_hit_soundfx)
-
-            particles = Particle.create_particles(self.screen, self.rect.x,
-                                                  self.rect.y)
-            particles_group.append(particles)
-            return True
-        return False
-
-    def update(self, ball, particles_group):
-        """It updates the current state of the target."""
-
-        if self.rect.top > self.screen_rect.bottom:
-            # Simply disappears. Stop rendering the hit target.
-            self.kill()
-            if self.on_game:
-                utils.play_soundfx(self.vanish_soundfx)
-        elif self.falling:
-            # Simulates falling effect
-            self.rect.y += 1
+        # The y position of every cell top, used to find the targets
+        # that left the screen.
+        self.cell_tops = np.arange(self.rows, dtype=np.int32)[:, None] \
+            * self.CELL_SIZE
+
+        # Tells that the whole field changed since the last call of
+        # dirty_rects()
+        self.recharged = False
+
+        # Goes up whenever a target starts falling or the field is
+        # recharged, that is, when the standing targets change.
+        self.version = 0
+
+        self.recharge()
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive))
+
+    def cell_rect(self, row, column):
+        """Returns the Rect of the target in the given cell."""
+
+        return rect.Rect(column * self.CELL_SIZE,
+                         row * self.CELL_SIZE + self.fall_offset[row, column],
+                         self.CELL_SIZE, self.CELL_SIZE)
+
+    def cells_overlapping(self, area):
+        """Returns the range of rows and columns of the cells that
+        overlap the given Rect.
+        """
+
+        size = self.CELL_SIZE
+        first_row = max(area.top // size, 0)
+        last_row = min((area.bottom - 1) // size, self.rows - 1)
+        first_column = max(area.left // size, 0)
+        last_column = min((area.right - 1) // size, self.columns - 1)
+
+        return (range(first_row, last_row + 1),
+                range(first_column, last_column + 1))
+
+    def recharge(self):
+        """It refills the field with targets.
+
+        The cells are reused and their sprites come from the shared
+        tinted targets, so nothing new is allocated.
+        """
+
+        colours = iter(self.rng.choices(PALETTE, k=self.rows * self.columns))
+        for images in self.images:
+            for column in range(self.columns):
+                images[column] = tinted_target(next(colours))
+
+        self.alive[:] = True
+        self.falling[:] = False
+        self.fall_offset[:] = 0
+        self.reported_offset[:] = 0
+        self.recharged = True
+        self.version += 1
+
+    def field_rect(self):
+        """Returns the Rect of the area filled with targets after a
+        recharge.
+        """
+
+        return rect.Rect(0, 0, self.columns * self.CELL_SIZE,
+                         self.rows * self.CELL_SIZE)
+
+    def dirty_rects(self):
+        """Returns the Rects of the targets that may have changed
+        since the last call, that is, the falling ones (or the whole
+        field after a recharge). Each falling target Rect covers
+        where it was in the last call too, as it may have fallen more
+        than once since then.
+        """
+
+        size = self.CELL_SIZE
+        rects = []
+        for row, column in zip(*np.nonzero(self.falling)):
+            offset = int(self.fall_offset[row, column])
+            reported = int(self.reported_offset[row, column])
+            top = row * size + min(offset, reported)
+            rects.append(rect.Rect(column * size, top, size,
+                                   size + abs(offset - reported)))
+        self.reported_offset[self.falling] = self.fall_offset[self.falling]
+
+        if self.recharged:
+            rects.append(self.field_rect())
+            self.recharged = False
+
+        return rects
+
+    def draw(self):
+        """It draws every target left on the screen."""
+
+        self.draw_cells(self.screen, self.alive)
+
+    def draw_standing(self, destination):
+        """It draws the targets that weren't hit on the given Surface
+        object.
+        """
+
+        self.draw_cells(destination, self.alive & ~self.falling)
+
+    def draw_falling(self):
+        """It draws the targets that are falling on the screen."""
+
+        self.draw_cells(self.screen, self.falling)
+
+    def draw_cells(self, destination, cells):
+        """It draws the targets of the cells marked in the given
+        boolean array.
+        """
+
+        size = self.CELL_SIZE
+        destination.blits(
+            [(self.images[row][column],
+              (column * size, row * size + self.fall_offset[row, column]))
+             for row, column in zip(*np.nonzero(cells))],
+            False)
+
+    def sweep(self, ball, box, velocity):
+        """Finds the first standing target the ball hits during its
+        movement.
+
+        Args:
+
+            ball:
+                The Ball object.
+
+            box:
+                A (x, y, width, height) tuple with the ball at the
+                start of the movement.
+
+            velocity:
+                A (x, y) tuple with the whole movement of the ball.
+
+        Returns:
+            A (time, normal, on_hit) tuple, see collision.sweep().
+            on_hit is the function to be called with the particles
+            when the ball gets there. None when no target is hit.
+        """
+
+        x, y, width, height = box
+        area = rect.Rect(math.floor(min(x, x + velocity[0])),
+                         math.floor(min(y, y + velocity[1])),
+                         math.ceil(width + abs(velocity[0])) + 1,
+                         math.ceil(height + abs(velocity[1])) + 1)
+        rows, columns = self.cells_overlapping(area)
+
+        first = None
+        for row in rows:
+            for column in columns:
+                if not self.alive[row, column] or self.falling[row, column]:
+                    continue
+                hit = collision.sweep(box, velocity,
+                                      self.cell_rect(row, column))
+                if hit is not None and (first is None or hit[0] < first[0]):
+                    first = (*hit, row, column)
+
+        if first is None:
+            return None
+
+        time, normal, row, column = first
+        return time, normal, \
+            lambda particles: self.hit(ball, particles, row, column)
+
+    def hit(self, ball, particles, row, column):
+        """Makes the target in the given cell fall, giving the ball
+        its points.
+        """
+
+        ball.points += 100 * self.hit_cells([row], [column], particles)
+
+    def hit_cells(self, rows, columns, particles=None):
+        """Makes the standing targets in the given cells fall.
+
+        Args:
+
+            rows:
+                A sequence with the row of each cell.
+
+            columns:
+                A sequence with the column of each cell. Cells may
+                be repeated.
+
+            particles:
+                A ParticleSystem object where the particles of the
+                hits are emitted, or None.
+
+        Returns:
+            How many targets were hit.
+        """
+
+        cells = np.unique(np.stack((rows, columns), axis=1), axis=0)
+        rows, columns = cells[:, 0], cells[:, 1]
+        standing = self.alive[rows, columns] & ~self.falling[rows, columns]
+        rows, columns = rows[standing], columns[standing]
+        if rows.size == 0:
+            return 0
 
-        if self.collision(ball, particles_group):
-            ball.points += 100
-            self.falling = True
+        if self.on_game:
+            utils.play_soundfx(self.target_hit_soundfx)
 
+        if particles is not None:
+            size = self.CELL_SIZE
+            for row, column in zip(rows.tolist(), columns.tolist()):
+                particles.emit(column * size,
+                               row * size + int(self.fall_offset[row, column]))
 
-def update(screen, screen_rect, targets, ball, on_game, particles_group):
-    """It updates the state of every single target in the
-    group.
+        self.falling[rows, columns] = True
+        self.version += 1
+
+        return int(rows.size)
+
+    def update(self):
+        """It updates the targets that are falling."""
+
+        if self.falling.any():
+            vanished = self.falling \
+                & (self.cell_tops + self.fall_offset > self.screen_rect.bottom)
+            if vanished.any():
+                # Simply disappears. Stop rendering the hit target.
+                self.alive[vanished] = False
+                self.falling[vanished] = False
+                if self.on_game:
+                    utils.play_soundfx(self.vanish_soundfx)
+
+            # Simulates falling effect
+            self.fall_offset[self.falling] += 1
+
+
+@functools.lru_cache(maxsize=COLOUR_LEVELS ** 3)
+def tinted_target(colour):
+    """Returns the target sprite filled with the given colour. Each
+    colour is drawn only once.
 
     Args:
 
-        screen:
-            A Surface object representing the game window.
-        
-        screen_rect:
-            A Rect object obtained from the screen's surface.
-        
-        targets:
-            A Group object filled with Target(s).
-        
-        ball:
-            A Ball object. The actual player.
-        
-        on_game:
-            Boolean value that indicates if the targets to be created
-            are going to be in a match.
-        
-        particles_group:
-            A list object containing Group(s) of Particle(s).
+        colour:
+            A tuple with the colour. It should be in the PALETTE,
+            otherwise the cache is of little use.
     """
 
-    if len(targets) == 0 and ball.y >= screen_rect.centery:
-        # Recharge the targets when empty or the player failed in
-        # catching the ball.
-        recharge(screen, targets, on_game)
+    size = TargetField.CELL_SIZE
+    image = surface.Surface((size, size))
+    image.fill(colour)
+    image.blit(utils.load_image("on_game/target.png"), (0, 0))
+
+    return image
 
-    targets.update(ball, particles_group)
 
+def update(targets, ball, particles):
+    """It updates the state of every single target in the field and
+    refills it when it's empty.
 
-def recharge(screen, targets, on_game=True):
-    """It refills the group attribute with targets sprites."""
+    Args:
+
+        targets:
+            A TargetField object.
 
-    # Making sure that the group is in fact empty.
-    targets.empty()
+        ball:
+            A Ball object. The actual player.
 
-    rows = 600 // 32 + 1
+        particles:
+            A ParticleSystem object.
+    """
 
-    xpos = 0
-    ypos = 0
+    if len(targets) == 0 and ball.y >= targets.screen_rect.centery:
+        # Recharge the targets when empty or the player failed in
+        # catching the ball.
+        targets.recharge()
 
-    for y in range(5):
-        for x in range(rows):
-            target = Target(screen, on_game)
-            target.rect.x = xpos
-            target.rect.y = ypos
-            targets.add(target)
-            xpos += 32
-        ypos += 32
-        xpos = 0
+    targets.update()
@@ -0,0 +1,191 @@
+"""Module dedicated for running the game logic without a window.
+
+The headless engine steps a GameScene as fast as the CPU allows,
+which is what simulations, tuning and regression checks need.
+"""
+
+import os
+
+import pygame.constants as constants
+import pygame.display as display
+import pygame.event as event
+import pygame.font as font
+
+from . import scene, utils
+from .clock import SimulationClock
+
+# Keys that are understood by GameScene.update_on_event
+GAME_KEYS = (constants.K_a, constants.K_d, constants.K_p)
+
+
+def setup_display(screen_size=(600, 400)):
+    """Sets up pygame to run without a window and with no sound.
+
+    The dummy driver gives a real display surface (so images can be
+    converted to its pixel format) without a window.
+
+    Args:
+
+        screen_size:
+            The size of the (invisible) screen.
+
+    Returns:
+        The display Surface object.
+    """
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    display.init()
+    font.init()
+    utils.set_muted(True)
+
+    return display.set_mode(screen_size)
+
+
+class HeadlessGame:
+    """A GameScene driven step by step, with no display attached to
+    it and no real time involved.
+    """
+
+    def __init__(self, screen_size=(600, 400), frame_time=1000 / 60,
+                 clock=None):
+        """Initialises the HeadlessGame object.
+
+        Args:
+
+            screen_size:
+                The size of the (invisible) screen where the game
+                happens.
+
+            frame_time:
+                How many milliseconds of simulation each step
+                represents.
+
+            clock:
+                The clock used by the scenes. When None, a
+                SimulationClock advanced by frame_time every step is
+                used. Other clocks are never advanced by the engine.
+        """
+
+        self.screen = setup_display(screen_size)
+        self.frame_time = frame_time
+        self.clock = clock if clock is not None else SimulationClock()
+        self.frames = 0
+
+        self.scene_manager = scene.SceneManager(self.clock)
+        self.scene = scene.GameScene(self.screen)
+        self.scene_manager.add("on_game", self.scene)
+        self.scene_manager.initial_view("on_game")
+
+        self.held_keys = set()
+
+    @property
+    def score(self):
+        return self.scene.ball.points
+
+    @property
+    def attempts(self):
+        return self.scene.attempts
+
+    @property
+    def game_over(self):
+        return self.scene.game_over
+
+    def reset(self, seed=None):
+        """Starts a brand new match.
+
+        Args:
+
+            seed:
+                The seed of the match. When None, a random seed is
+                chosen.
+        """
+
+        self.release_keys()
+        self.scene.retry(seed)
+
+    def release_keys(self):
+        """Releases every key held by the previous steps."""
+
+        self.press_keys(())
+
+    def press_keys(self, inputs):
+        """Sends the key events that take the held keys to the given
+        state.
+
+        Args:
+
+            inputs:
+                An iterable with the keys (K_a, K_d and K_p) that
+                must be held down. Keys that are held and are missing
+                here are released.
+        """
+
+        keys = set(inputs)
+        for key in GAME_KEYS:
+            if key in keys and key not in self.held_keys:
+                self.scene_manager.update_on_event(
+                    event.Event(constants.KEYDOWN, key=key))
+            elif key not in keys and key in self.held_keys:
+                self.scene_manager.update_on_event(
+                    event.Event(constants.KEYUP, key=key))
+        self.held_keys = keys
+
+    def step(self, inputs=(), events=()):
+        """Advances the game by one frame.
+
+        Args:
+
+            inputs:
+                An iterable with the keys (K_a, K_d and K_p) held
+                down during this frame. Keys that were held on the
+                previous frame and are missing now are released.
+
+            events:
+                An iterable with other pygame events (mouse clicks,
+                for instance) delivered before this frame.
+        """
+
+        self.press_keys(inputs)
+        for frame_event in events:
+            self.scene_manager.update_on_event(frame_event)
+
+        if isinstance(self.clock, SimulationClock):
+            self.clock.advance(self.frame_time)
+        self.scene_manager.update()
+        self.frames += 1
+
+    def render(self):
+        """Draws the current frame on the screen surface.
+
+        Stepping doesn't need any drawing, so this is only called by
+        whoever wants to look at the game.
+        """
+
+        self.scene_manager.show()
+        return self.screen
+
+    def run(self, policy, max_steps=None):
+        """Plays a whole match.
+
+        Args:
+
+            policy:
+                A function that receives this object and returns the
+                inputs for the next step.
+
+            max_steps:
+                Stops the match after this amount of steps. When
+                None, the match runs until the game is over.
+
+        Returns:
+            The final score.
+        """
+
+        steps = 0
+        while not self.game_over:
+            if max_steps is not None and steps >= max_steps:
+                break
+            self.step(policy(self))
+            steps += 1
+
+        return self.score
@@ -2,11 +2,11 @@
 game interface.
 """
 
+import functools
 import textwrap
 
 import pygame.constants as constants
 import pygame.font as font
-import pygame.mouse as mouse
 import pygame.sprite as sprite
 import pygame.surface as surface
 
@@ -14,6 +14,10 @@ import pygame.surface as surface
 class Button(sprite.Sprite):
     """This class represents a interface button on a game. The button can have
     any look, as it has the off and on variants.
+
+    The button doesn't look at the mouse by itself: its sprite only
+    changes when it's given the mouse events on it (see
+    Scene.subscribe_button), so an idle button costs nothing.
     """
 
     def __init__(self, screen, button_on_image, button_off_image,
@@ -49,31 +53,76 @@ class Button(sprite.Sprite):
         self.rect = self.current_sprite.get_rect()
         self.action = action
 
-    def draw(self):
-        """Draws the button on the screen."""
+        self.hovered = False
+        self.pressed = False
+        # The area covered by the sprites shown since dirty_rect() was
+        # called, None when the sprite didn't change. The sprites may
+        # not all have the same size.
+        self.dirty_area = None
+
+    def draw(self, destination=None):
+        """Draws the button on the screen, or on the given Surface
+        object.
+        """
+
+        (destination or self.screen).blit(self.current_sprite, self.rect)
+
+    def sprite_rect(self):
+        """Returns the area the current sprite is drawn on."""
+
+        return self.current_sprite.get_rect(topleft=self.rect.topleft)
+
+    def dirty_rect(self):
+        """Returns the area covered by the old and the new sprites if
+        the sprite changed since the last call, otherwise None.
+        """
+
+        area = self.dirty_area
+        self.dirty_area = None
+        return area
+
+    def change_sprite(self):
+        """Picks the sprite for the current hover and press state."""
+
+        if not self.hovered:
+            new_sprite = self.button_off_image
+        elif self.pressed:
+            new_sprite = self.button_clicked_image
+        else:
+            new_sprite = self.button_on_image
+
+        if new_sprite is not self.current_sprite:
+            area = self.sprite_rect() if self.dirty_area is None \
+                else self.dirty_area
+            self.current_sprite = new_sprite
+            self.dirty_area = area.union(self.sprite_rect())
 
-        self.screen.blit(self.current_sprite, self.rect)
-    
     def update_on_event(self, event):
-        if event.type == constants.MOUSEBUTTONUP:
-            if self.rect.collidepoint(event.pos) and event.button == 1:
-                self.current_sprite = self.button_off_image
+        """Updates the button with a mouse event on it."""
+
+        if event.type == constants.MOUSEMOTION:
+            self.hovered = True
+            self.pressed = bool(event.buttons[0])
+        elif event.type == constants.MOUSEBUTTONDOWN:
+            if event.button == 1:
+                self.hovered = self.pressed = True
+        elif event.type == constants.MOUSEBUTTONUP:
+            if event.button == 1:
+                # Let go above the button, which is still hovered.
+                self.hovered = True
+                self.pressed = False
+                self.change_sprite()
                 if self.action is not None:
                     self.action()
+                return
 
-    def update(self):
-        """Updates the button according to the user actions.
+        self.change_sprite()
 
-        User actions == Hover the mouse on the button, Click the
-        button and etc.
-        """
+    def leave(self, event):
+        """Tells the button that the mouse is not above it anymore."""
 
-        if self.rect.collidepoint(mouse.get_pos()):
-            self.current_sprite = self.button_on_image
-            if mouse.get_pressed()[0]:
-                self.current_sprite = self.button_clicked_image
-        else:
-            self.current_sprite = self.button_off_image
+        self.hovered = self.pressed = False
+        self.change_sprite()
 
 
 class Label(sprite.Sprite):
@@ -103,10 +152,12 @@ class Label(sprite.Sprite):
 
         self.yspeed = 3
 
-    def draw(self):
-        """Draws the label on the screen."""
+    def draw(self, destination=None):
+        """Draws the label on the screen, or on the given Surface
+        object.
+        """
 
-        self.screen.blit(self.image, self.rect)
+        (destination or self.screen).blit(self.image, self.rect)
 
     def update(self):
         """Updates the label on the screen."""
@@ -119,7 +170,8 @@ class Label(sprite.Sprite):
         """It updates the text, therefore updating the surface.
         
         Important to mention that the new surface, will use the
-        already defined attributes, like colour and size.
+        already defined attributes, like colour and size. Nothing
+        happens when the text is the same as the current one.
 
         Args:
 
@@ -127,6 +179,10 @@ class Label(sprite.Sprite):
                 The new text rendered in the image attribute.
         """
 
+        if new_text == self.text:
+            return
+
+        self.text = new_text
         self.image = generate_text_surface(
             new_text, self.colour,self.size, self.chars_per_line,
             self.y_padding, self.bold, self.italic, self.antialised)
@@ -166,6 +222,7 @@ class Label(sprite.Sprite):
 
         text_label = cls(screen, text_bg)
 
+        text_label.text = text
         text_label.colour = colour
         text_label.size = size
         text_label.chars_per_line = chars_per_line
@@ -177,6 +234,66 @@ class Label(sprite.Sprite):
         return text_label
 
 
+@functools.cache
+def get_font(name, size, bold=False, italic=False):
+    """Returns a system Font object. Fonts are created only once for
+    each combination of arguments.
+
+    Args:
+
+        name:
+            The name of the system font. None is the default font.
+
+        size:
+            The character size.
+
+        bold:
+            Indicates if the text is bold.
+
+        italic:
+            Indicates if the text is italic.
+    """
+
+    return font.SysFont(name, size, bold, italic)
+
+
+@functools.lru_cache(maxsize=256)
+def render_line(text, colour, size, bold=False, italic=False,
+                antialised=False, name=None):
+    """Renders a single line of text. The most recently used lines
+    are cached, so rendering the same line again costs nothing.
+
+    Args:
+
+        text:
+            The line to be rendered.
+
+        colour:
+            The text colour, as a tuple.
+
+        size:
+            The character size.
+
+        bold:
+            Indicates if the text is bold.
+
+        italic:
+            Indicates if the text is italic.
+
+        antialised:
+            Indicates if the text is antialised.
+
+        name:
+            The name of the system font. None is the default font.
+
+    Returns:
+        A Surface object with the rendered line. It's shared with
+        every other caller, thus it must not be modified.
+    """
+
+    return get_font(name, size, bold, italic).render(text, antialised, colour)
+
+
 def generate_text_surface(text, colour, size, chars_per_line, y_padding,
                           bold=False, italic=False, antialised=False):
     """Generates a Surface object that contains a wrapped text.
@@ -209,9 +326,10 @@ def generate_text_surface(text, colour, size, chars_per_line, y_padding,
         fact the rendered text.
     """
 
-    text_font = font.SysFont(None, size, bold, italic)
+    text_font = get_font(None, size, bold, italic)
+    colour = tuple(colour)
     rendered_paragraph = [
-        text_font.render(phrase, antialised, colour)
+        render_line(phrase, colour, size, bold, italic, antialised)
         for phrase in textwrap.wrap(text, chars_per_line)
     ]
 
@@ -0,0 +1,80 @@
+"""Module dedicated for caching the parts of a scene that rarely
+change.
+"""
+
+import pygame.constants as constants
+import pygame.display as display
+import pygame.rect as rect
+import pygame.surface as surface
+
+
+class Layer:
+    """A part of a scene drawn once into a Surface of its own. Every
+    frame, the cached Surface is blitted on the screen, until the
+    layer is invalidated and drawn again.
+    """
+
+    def __init__(self, area, render, watch=None, transparent=False):
+        """Initialises the Layer object.
+
+        Args:
+
+            area:
+                A Rect (or rect-like) object with the area of the
+                screen covered by the layer.
+
+            render:
+                A function that receives the layer Surface and draws
+                the layer contents on it. The Surface top left corner
+                is the area top left corner.
+
+            watch:
+                An optional function. Whenever the value it returns
+                changes, the layer is invalidated.
+
+            transparent:
+                Indicates if the parts of the layer where nothing was
+                drawn are see-through.
+        """
+
+        self.area = rect.Rect(area)
+        self.transparent = transparent
+        self.surface = surface.Surface(
+            self.area.size, constants.SRCALPHA if transparent else 0)
+        if display.get_surface() is not None:
+            self.surface = self.surface.convert_alpha() if transparent \
+                else self.surface.convert()
+
+        self.render = render
+        self.watch = watch
+        self.watched = None
+        self.valid = False
+
+    def invalidate(self):
+        """Makes the layer be drawn again before the next blit."""
+
+        self.valid = False
+
+    def memory_usage(self):
+        """Returns how many bytes the cached Surface takes."""
+
+        return self.surface.get_pitch() * self.surface.get_height()
+
+    def draw(self, screen):
+        """Blits the layer on the screen, drawing it again first if
+        it's not valid anymore.
+        """
+
+        if self.watch is not None:
+            value = self.watch()
+            if value != self.watched:
+                self.watched = value
+                self.valid = False
+
+        if not self.valid:
+            if self.transparent:
+                self.surface.fill((0, 0, 0, 0))
+            self.render(self.surface)
+            self.valid = True
+
+        screen.blit(self.surface, self.area)
@@ -0,0 +1,201 @@
+"""Module dedicated for reading the game state from outside of it.
+
+Analysis tools, agents and overlays get what the game shows without
+copying it: the rendered frame as a NumPy view of the screen pixels,
+a small grayscale copy of it, or a vector with the state of a
+GameScene. The functions that return new arrays can also write into
+given ones, e.g. the SharedArrays other processes read.
+"""
+
+import contextlib
+import multiprocessing.shared_memory as shared_memory
+
+import numpy as np
+import pygame.surface as surface
+import pygame.surfarray as surfarray
+import pygame.transform as transform
+
+# The meaning of the first items of the state vector. The standing
+# targets mask follows them, row after row.
+STATE_FIELDS = ("ball_x", "ball_y", "ball_xspeed", "ball_yspeed",
+                "paddle_x")
+
+
+@contextlib.contextmanager
+def frame(screen):
+    """Gives the pixels of a Surface object as a NumPy view.
+
+    The Surface is locked while the view exists, and a locked Surface
+    can't be drawn on, so the view (and any other view of it) must
+    not be kept after the with block. Copy what must be kept.
+
+    Args:
+
+        screen:
+            A 24 or 32 bits Surface object, e.g. the screen.
+
+    Yields:
+        A (height, width, 3) uint8 array with the RGB pixels.
+    """
+
+    pixels = surfarray.pixels3d(screen)
+    try:
+        # surfarray indexes the pixels by x first.
+        yield pixels.transpose(1, 0, 2)
+    finally:
+        del pixels
+
+
+class Grayscale:
+    """Makes small grayscale copies of a Surface object, e.g. for
+    agents that learn from the pixels.
+    """
+
+    # Weights of the red, green and blue channels, out of 256.
+    WEIGHTS = (77, 150, 29)
+
+    def __init__(self, screen, size=(84, 84)):
+        """Initialises the Grayscale object.
+
+        Args:
+
+            screen:
+                The Surface object that is copied.
+
+            size:
+                The (width, height) of the copies.
+        """
+
+        self.screen = screen
+        self.size = tuple(size)
+        # The screen is scaled into here, so nothing is allocated for
+        # the full size frame.
+        self.scaled = surface.Surface(self.size, 0, screen)
+        # The weighted sum of the channels, and each term of it.
+        self.luminance = np.empty(self.shape, dtype=np.uint16)
+        self.term = np.empty(self.shape, dtype=np.uint16)
+
+    @property
+    def shape(self):
+        return self.size[1], self.size[0]
+
+    def __call__(self, out=None):
+        """Returns a grayscale copy of what's on the Surface now.
+
+        Args:
+
+            out:
+                A (height, width) uint8 array where the copy is
+                written. When None, a new one is returned.
+        """
+
+        if out is None:
+            out = np.empty(self.shape, dtype=np.uint8)
+
+        transform.scale(self.screen, self.size, self.scaled)
+        luminance, term = self.luminance, self.term
+        with frame(self.scaled) as pixels:
+            # Channel by channel, as a matmul of integers is much
+            # slower.
+            luminance.fill(0)
+            for channel, weight in enumerate(self.WEIGHTS):
+                np.multiply(pixels[..., channel], weight, out=term,
+                            dtype=np.uint16, casting="unsafe")
+                luminance += term
+        np.right_shift(luminance, 8, out=out, casting="unsafe")
+
+        return out
+
+
+def state_size(game_scene):
+    """Returns the length of the state vector of a GameScene."""
+
+    return len(STATE_FIELDS) + game_scene.targets.alive.size
+
+
+def state_vector(game_scene, out=None):
+    """Returns the state of a GameScene as numbers: the ball position
+    (in pixels) and speed (in pixels per update), the paddle centre
+    and whether each target is standing (see STATE_FIELDS).
+
+    Args:
+
+        game_scene:
+            A GameScene object.
+
+        out:
+            A float32 array of state_size() items where the state is
+            written. When None, a new one is returned.
+    """
+
+    if out is None:
+        out = np.empty(state_size(game_scene), dtype=np.float32)
+
+    ball = game_scene.ball
+    targets = game_scene.targets
+    fields = len(STATE_FIELDS)
+    out[:fields] = (ball.position[0], ball.position[1], ball.xspeed,
+                    ball.yspeed, game_scene.paddle.rect.centerx)
+    np.logical_and(targets.alive, ~targets.falling,
+                   out=out[fields:].reshape(targets.alive.shape),
+                   casting="unsafe")
+
+    return out
+
+
+class SharedArrays:
+    """NumPy arrays kept in a single block of shared memory, so other
+    processes read and write them without any copy.
+    """
+
+    # Every array starts at a multiple of this.
+    ALIGNMENT = 64
+
+    def __init__(self, specs, name=None):
+        """Initialises the SharedArrays object.
+
+        Args:
+
+            specs:
+                A dict of array name: (shape, dtype).
+
+            name:
+                The name of the shared memory block made by another
+                SharedArrays object (see its name attribute), to use
+                the same arrays. When None, a new block is made.
+        """
+
+        self.specs = specs
+        offsets = dict()
+        size = 0
+        for key, (shape, dtype) in specs.items():
+            offsets[key] = size
+            nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+            size += -(-nbytes // self.ALIGNMENT) * self.ALIGNMENT
+
+        self.owner = name is None
+        self.memory = shared_memory.SharedMemory(name, create=self.owner,
+                                                 size=max(size, 1))
+        self.name = self.memory.name
+        self.arrays = {
+            key: np.ndarray(shape, dtype, self.memory.buf, offsets[key])
+            for key, (shape, dtype) in specs.items()
+        }
+
+    def __getitem__(self, key):
+        return self.arrays[key]
+
+    def close(self):
+        """Stops using the arrays. The block is destroyed when it was
+        made by this object.
+        """
+
+        self.arrays.clear()
+        try:
+            self.memory.close()
+        except BufferError:
+            # Someone still has a view of the arrays. The memory is
+            # released along with it.
+            pass
+        if self.owner:
+            self.memory.unlink()
@@ -0,0 +1,105 @@
+"""Module dedicated for loading the game assets in the background."""
+
+import concurrent.futures
+
+import pygame.mixer as mixer
+
+from . import assets, utils
+
+
+class Preloader:
+    """Decodes images and sounds on worker threads.
+
+    Decoding (reading the files, inflating the PNGs) happens on the
+    workers. Converting the images to the display pixel format has to
+    happen on the main thread, so the decoded images wait there until
+    poll() is called.
+    """
+
+    def __init__(self, images=assets.images, workers=2):
+        """Initialises the Preloader object.
+
+        Args:
+
+            images:
+                The ImageManager object that keeps the loaded images.
+
+            workers:
+                How many threads decode the assets.
+        """
+
+        self.images = images
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            workers, thread_name_prefix="preload")
+
+        # Future object: path of the image it decodes.
+        self.pending_images = dict()
+        self.pending_sounds = []
+
+    def queue(self, image_paths=(), sound_paths=()):
+        """Starts decoding the given assets.
+
+        Args:
+
+            image_paths:
+                An iterable with the paths of the images.
+
+            sound_paths:
+                An iterable with the paths of the sound effects. They
+                are ignored when the mixer isn't initialised.
+        """
+
+        for path in image_paths:
+            if path not in self.images.images:
+                future = self.executor.submit(self.images.decode, path)
+                self.pending_images[future] = path
+
+        if mixer.get_init() is not None:
+            # load_soundfx keeps the Sound objects, nothing else has to
+            # be done with them on the main thread.
+            self.pending_sounds.extend(
+                self.executor.submit(utils.load_soundfx, path)
+                for path in sound_paths)
+
+    @property
+    def done(self):
+        """True when every queued asset is loaded and converted."""
+
+        return not self.pending_images \
+            and all(future.done() for future in self.pending_sounds)
+
+    def poll(self, timeout=0):
+        """Converts the images the workers finished decoding.
+
+        Args:
+
+            timeout:
+                How many seconds to wait for the workers. 0 means that
+                only the images already decoded are converted, None
+                waits for all of them.
+        """
+
+        if not self.pending_images:
+            return
+
+        finished, _ = concurrent.futures.wait(
+            self.pending_images, timeout,
+            concurrent.futures.ALL_COMPLETED if timeout is None
+            else concurrent.futures.FIRST_COMPLETED)
+        for future in finished:
+            self.images.add(self.pending_images.pop(future),
+                            future.result())
+
+    def wait(self):
+        """Blocks until every queued asset is loaded and converted."""
+
+        self.poll(None)
+        for future in self.pending_sounds:
+            # Raises the errors of the workers, if any.
+            future.result()
+        self.pending_sounds.clear()
+
+    def shutdown(self):
+        """Stops the worker threads."""
+
+        self.executor.shutdown(wait=True, cancel_futures=True)
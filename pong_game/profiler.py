@@ -0,0 +1,215 @@
+"""Module dedicated for measuring the game while it runs.
+
+The profiler times every phase of a frame and can show them in an
+overlay (F3). It can also record a cProfile dump of the next frames
+(F4).
+"""
+
+import cProfile
+import collections
+import contextlib
+import time
+
+import pygame.constants as constants
+import pygame.draw as draw
+import pygame.surface as surface
+
+from . import interface
+
+PHASES = ("events", "update", "show", "transition", "display")
+
+PHASE_COLOURS = {
+    "events": (230, 230, 0),
+    "update": (0, 200, 0),
+    "show": (0, 120, 255),
+    "transition": (200, 0, 200),
+    "display": (255, 80, 0),
+}
+
+
+class Profiler:
+    """Keeps the time spent in each phase of the last frames."""
+
+    TOGGLE_KEY = constants.K_F3
+    CAPTURE_KEY = constants.K_F4
+
+    # The frame time budget at 60 frames per second, in milliseconds.
+    # Drawn as a line in the graph.
+    BUDGET = 1000 / 60
+
+    def __init__(self, screen, history=120, capture_frames=300):
+        """Initialises the Profiler object.
+
+        Args:
+
+            screen:
+                The Surface object where the overlay is drawn.
+
+            history:
+                How many frames are kept in the graph.
+
+            capture_frames:
+                How many frames are recorded by cProfile when the
+                capture key is pressed.
+        """
+
+        self.screen = screen
+        self.visible = False
+
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.history = collections.deque(maxlen=history)
+        self.counts = dict()
+        self.frames = 0
+
+        self.capture_frames = capture_frames
+        self.capture = None
+        self.frames_to_capture = 0
+
+        self.panel = surface.Surface((240, 150), constants.SRCALPHA)
+        self.lines = []
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Adds the time spent in the with block to the given phase
+        of the current frame.
+        """
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.current[name] += (time.perf_counter() - start) * 1000
+
+    def end_frame(self, counts=None):
+        """Closes the current frame and starts a new one.
+
+        Args:
+
+            counts:
+                A dict with the amount of sprites, particles and the
+                like in the frame.
+        """
+
+        self.history.append(tuple(self.current[phase] for phase in PHASES))
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.frames += 1
+        if counts is not None:
+            self.counts = counts
+
+        if self.capture is not None:
+            self.frames_to_capture -= 1
+            if self.frames_to_capture <= 0:
+                self.stop_capture()
+
+        # The text changes too often to be rendered every frame.
+        if self.visible and self.frames % 15 == 0:
+            self.update_text()
+
+    def start_capture(self, frames=None):
+        """Records every function call of the next frames with
+        cProfile.
+
+        Args:
+
+            frames:
+                How many frames are recorded. When None, the amount
+                given on initialisation is used.
+        """
+
+        if self.capture is not None:
+            return
+
+        self.frames_to_capture = frames or self.capture_frames
+        self.capture = cProfile.Profile()
+        self.capture.enable()
+
+    def stop_capture(self):
+        """Stops the current capture and dumps it into a pstats file
+        in the working directory.
+
+        Returns:
+            The name of the file.
+        """
+
+        self.capture.disable()
+        filename = time.strftime("profile-%Y%m%d-%H%M%S.pstats")
+        self.capture.dump_stats(filename)
+        self.capture = None
+        print(f"profile saved to {filename}")
+
+        return filename
+
+    def update_on_event(self, event):
+        """Handles the profiler hotkeys."""
+
+        if event.type == constants.KEYDOWN:
+            if event.key == self.TOGGLE_KEY:
+                self.visible = not self.visible
+                if self.visible:
+                    self.update_text()
+            elif event.key == self.CAPTURE_KEY:
+                self.start_capture()
+
+    def averages(self):
+        """Returns a dict with the average time (in milliseconds) of
+        each phase over the frames in the history.
+        """
+
+        if not self.history:
+            return dict.fromkeys(PHASES, 0.0)
+
+        return {phase: sum(frame[i] for frame in self.history)
+                / len(self.history)
+                for i, phase in enumerate(PHASES)}
+
+    def update_text(self):
+        """Renders the lines of text shown in the overlay."""
+
+        averages = self.averages()
+        white = (255, 255, 255)
+        lines = [(f"{phase}: {averages[phase]:.2f} ms", PHASE_COLOURS[phase])
+                 for phase in PHASES]
+        lines.append((f"frame: {sum(averages.values()):.2f} ms", white))
+        lines.extend((f"{name}: {count}", white)
+                     for name, count in self.counts.items())
+        if self.capture is not None:
+            lines.append((f"capturing ({self.frames_to_capture})", white))
+
+        self.lines = [interface.render_line(text, colour, 16)
+                      for text, colour in lines]
+
+    def draw(self):
+        """Draws the overlay, with the text on the left and the
+        graph of the last frames on the right.
+        """
+
+        if not self.visible:
+            return
+
+        self.panel.fill((0, 0, 0, 170))
+
+        y = 4
+        for line in self.lines:
+            self.panel.blit(line, (4, y))
+            y += line.get_height()
+
+        # Stacked bars, one per frame, each phase with its colour.
+        graph_left = 120
+        graph_bottom = self.panel.get_height() - 4
+        scale = (graph_bottom - 4) / (self.BUDGET * 2)
+        for x, frame in enumerate(self.history, graph_left):
+            if x >= self.panel.get_width():
+                break
+            bar_bottom = graph_bottom
+            for phase, milliseconds in zip(PHASES, frame):
+                height = int(milliseconds * scale)
+                if height:
+                    draw.line(self.panel, PHASE_COLOURS[phase],
+                              (x, bar_bottom), (x, bar_bottom - height))
+                    bar_bottom -= height
+
+        budget_y = graph_bottom - int(self.BUDGET * scale)
+        draw.line(self.panel, (255, 255, 255), (graph_left, budget_y),
+                  (self.panel.get_width(), budget_y))
+
+        self.screen.blit(self.panel, (0, 0))
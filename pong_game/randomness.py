@@ -0,0 +1,71 @@
+"""Module dedicated for the random numbers used by the game.
+
+Each subsystem (particles, targets, background...) draws from a
+stream of its own, so the numbers one of them takes never change the
+numbers given to the others, and a whole scene can be reproduced from
+a single seed.
+"""
+
+import random
+import zlib
+
+import numpy as np
+
+
+class RandomStreams:
+    """A set of independent random number generators, one per name,
+    all derived from the same seed.
+    """
+
+    def __init__(self, seed=None):
+        """Initialises the RandomStreams object.
+
+        Args:
+
+            seed:
+                An integer. When None, a random seed is chosen.
+        """
+
+        self.streams = dict()
+        self.numpy_streams = dict()
+        self.reseed(seed)
+
+    def reseed(self, seed=None):
+        """Seeds every stream again, including the ones already
+        handed out, so their holders don't need to ask for new ones.
+
+        Args:
+
+            seed:
+                An integer. When None, a random seed is chosen.
+        """
+
+        if seed is None:
+            seed = random.randrange(2**32)
+        self.seed = seed
+
+        for name, stream in self.streams.items():
+            stream.seed(self.derive_seed(name))
+        for name, stream in self.numpy_streams.items():
+            stream.bit_generator.state = \
+                np.random.PCG64(self.derive_seed(name)).state
+
+    def derive_seed(self, name):
+        """Returns the seed of the stream with the given name."""
+
+        return (self.seed << 32) | zlib.crc32(name.encode())
+
+    def get(self, name):
+        """Returns the random.Random stream with the given name."""
+
+        if name not in self.streams:
+            self.streams[name] = random.Random(self.derive_seed(name))
+        return self.streams[name]
+
+    def numpy(self, name):
+        """Returns the NumPy Generator stream with the given name."""
+
+        if name not in self.numpy_streams:
+            self.numpy_streams[name] = np.random.Generator(
+                np.random.PCG64(self.derive_seed(name)))
+        return self.numpy_streams[name]
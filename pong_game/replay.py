@@ -0,0 +1,182 @@
+"""Module dedicated for recording the player input in a match and
+playing it back.
+
+A recording holds the seed of the match and every input event that
+reached the GameScene, tagged with the update (tick) it came before.
+Given the same seed, the same events and the same tick time, the
+match plays out exactly as it did.
+"""
+
+import struct
+
+import pygame.constants as constants
+import pygame.event as event
+
+from .headless import HeadlessGame
+
+# Every recorded event is turned into a code, so each one takes a few
+# bytes in the file.
+EVENT_CODES = {
+    (constants.KEYDOWN, constants.K_a): 1,
+    (constants.KEYUP, constants.K_a): 2,
+    (constants.KEYDOWN, constants.K_d): 3,
+    (constants.KEYUP, constants.K_d): 4,
+    (constants.KEYDOWN, constants.K_p): 5,
+    (constants.KEYUP, constants.K_p): 6,
+    (constants.MOUSEBUTTONDOWN, 1): 7,
+    (constants.MOUSEBUTTONUP, 1): 8,
+}
+EVENTS = {code: key for key, code in EVENT_CODES.items()}
+
+MAGIC = b"PONGREC1"
+
+# magic, seed, tick time, ticks, final score and amount of events
+HEADER = struct.Struct("<8sQdIiI")
+# tick, event code, x and y (only meaningful for mouse events)
+RECORD = struct.Struct("<IBhh")
+
+
+class InputRecorder:
+    """Keeps the input of a single match."""
+
+    def __init__(self, tick_time=1000 / 60):
+        """Initialises the InputRecorder object.
+
+        Args:
+
+            tick_time:
+                How many milliseconds each update of the scene
+                represents.
+        """
+
+        self.tick_time = tick_time
+        self.start(0)
+
+    def start(self, seed, paddle=None):
+        """Forgets everything and starts recording a new match.
+
+        Args:
+
+            seed:
+                The seed of the match random streams.
+
+            paddle:
+                The Paddle object of the match. Keys already held
+                when the match starts are recorded as pressed.
+        """
+
+        self.seed = seed
+        self.ticks = 0
+        self.score = 0
+        self.events = []
+
+        if paddle is not None:
+            if paddle.moving_left:
+                self.record(event.Event(constants.KEYDOWN,
+                                        key=constants.K_a))
+            if paddle.moving_right:
+                self.record(event.Event(constants.KEYDOWN,
+                                        key=constants.K_d))
+
+    def record(self, input_event):
+        """Keeps the event if it's one the game cares about."""
+
+        if input_event.type in (constants.KEYDOWN, constants.KEYUP):
+            code = EVENT_CODES.get((input_event.type, input_event.key))
+            pos = (0, 0)
+        elif input_event.type in (constants.MOUSEBUTTONDOWN,
+                                  constants.MOUSEBUTTONUP):
+            code = EVENT_CODES.get((input_event.type, input_event.button))
+            pos = input_event.pos
+        else:
+            code = None
+
+        if code is not None:
+            self.events.append((self.ticks, code, pos[0], pos[1]))
+
+    def tick(self, score):
+        """Tells that the scene was updated.
+
+        Args:
+
+            score:
+                The score after the update.
+        """
+
+        self.ticks += 1
+        self.score = score
+
+    def events_at(self):
+        """Returns a dict mapping each tick to the list of pygame
+        events delivered before it.
+        """
+
+        events = dict()
+        for tick, code, x, y in self.events:
+            event_type, value = EVENTS[code]
+            if event_type in (constants.KEYDOWN, constants.KEYUP):
+                recorded = event.Event(event_type, key=value)
+            else:
+                recorded = event.Event(event_type, button=value, pos=(x, y))
+            events.setdefault(tick, []).append(recorded)
+
+        return events
+
+    def save(self, path):
+        """Writes the recording into a file."""
+
+        with open(path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, self.seed, self.tick_time,
+                                   self.ticks, self.score, len(self.events)))
+            for record in self.events:
+                file.write(RECORD.pack(*record))
+
+    @classmethod
+    def load(cls, path):
+        """Reads a recording from a file.
+
+        Returns:
+            An InputRecorder object holding the recording.
+        """
+
+        with open(path, "rb") as file:
+            data = file.read()
+
+        magic, seed, tick_time, ticks, score, count = \
+            HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a recording")
+
+        recording = cls(tick_time)
+        recording.seed = seed
+        recording.ticks = ticks
+        recording.score = score
+        recording.events = list(RECORD.iter_unpack(
+            data[HEADER.size:HEADER.size + count * RECORD.size]))
+
+        return recording
+
+
+def replay(recording):
+    """Plays a recording back headlessly, as fast as possible.
+
+    Args:
+
+        recording:
+            An InputRecorder object, or the path of a recording file.
+
+    Returns:
+        The final score of the match.
+    """
+
+    if isinstance(recording, str):
+        recording = InputRecorder.load(recording)
+
+    game = HeadlessGame(frame_time=recording.tick_time)
+    game.reset(recording.seed)
+
+    events = recording.events_at()
+    for tick in range(recording.ticks):
+        game.step(events=events.get(tick, ()))
+
+    return game.score
@@ -1,17 +1,24 @@
-import random
+import contextlib
 
 import pygame.constants as constants
 import pygame.draw as draw
+import pygame.event as event
+import pygame.mouse as mouse
 import pygame.rect as rect
-import pygame.sprite as sprite
 import pygame.surface as surface
-import pygame.time as time
 
 from . import effects, interface, utils
+from .events import EventDispatcher
+from .clock import SystemClock
 from .background import ColourChangingBackground, GameBackground
 from .game_elements import target
 from .game_elements.ball import Ball
 from .game_elements.paddle import Paddle
+from .game_elements.particle import ParticleSystem
+from .game_elements.swarm import BallSwarm
+from .layers import Layer
+from .randomness import RandomStreams
+from .scheduler import Scheduler
 
 
 class Scene:
@@ -33,17 +40,171 @@ class Scene:
         # scene manager instance.
         self.scene_manager = None
 
-        self.particles_groups = []
+        # Every random number of the scene comes from here.
+        self.random = RandomStreams()
+
+        self.particles = ParticleSystem(
+            screen, rng=self.random.numpy("particles"))
+
+        # Used by the dirty rectangle rendering. When True, the next
+        # frame is entirely sent to the display.
+        self.full_redraw = True
+        self.previous_rects = []
+
+        # How far (from 0 to 1) the drawing is between the last two
+        # updates. Set by the scene manager before every draw.
+        self.interpolation = 1.0
+
+        # Parts of the scene that are drawn once and cached.
+        self.layers = dict()
+
+        # The handlers of the events this scene cares about.
+        self.events = EventDispatcher()
+
+    def add_layer(self, name, area, render, watch=None, transparent=False):
+        """Adds a cached layer to the scene. See the Layer class.
+
+        Returns:
+            The Layer object.
+        """
+
+        self.layers[name] = Layer(area, render, watch, transparent)
+        return self.layers[name]
+
+    def subscribe_button(self, button, when=None):
+        """Makes the button receive the mouse moves and clicks on it.
+        The buttons are found through the grid of the events
+        attribute, so the events far from a button never reach it.
+
+        Args:
+
+            button:
+                A Button object.
+
+            when:
+                An optional function. The button only receives the
+                mouse events while it returns True.
+        """
+
+        self.events.subscribe(constants.MOUSEMOTION, button.update_on_event,
+                              button.rect, when=when, leave=button.leave)
+        for event_type in (constants.MOUSEBUTTONDOWN, constants.MOUSEBUTTONUP):
+            self.events.subscribe(event_type, button.update_on_event,
+                                  button.rect, when=when)
+
+    def point_at(self, position):
+        """Tells the subscribers of the mouse moves where the mouse
+        is, as if it just moved there, e.g. to show a button that is
+        already under it as hovered.
+
+        Args:
+
+            position:
+                The (x, y) position of the mouse on the screen.
+        """
+
+        self.events.dispatch(event.Event(
+            constants.MOUSEMOTION, pos=position, rel=(0, 0),
+            buttons=mouse.get_pressed()))
+
+    def button_rects(self, *buttons):
+        """Returns the Rects of the given buttons whose sprite changed
+        since the last call.
+        """
+
+        return [button_rect for button_rect in
+                (button.dirty_rect() for button in buttons)
+                if button_rect is not None]
+
+    def schedule(self, delay, callback, interval=None):
+        """Makes a function be called later, on the scene manager
+        clock. The timers of the scene only count down while it's the
+        current scene, and they're cancelled when it stops being so.
+        See Scheduler.schedule().
+
+        Returns:
+            The Timer object.
+        """
+
+        return self.scene_manager.scheduler.schedule(delay, callback,
+                                                     interval, owner=self)
+
+    def enter(self):
+        """Called by the scene manager every time this scene becomes
+        the current one.
+        """
+
+        pass
+
+    def invalidate_layers(self):
+        """Makes every layer be drawn again."""
+
+        for layer in self.layers.values():
+            layer.invalidate()
+
+    def stats(self):
+        """Returns a dict with the amount of things in this scene,
+        shown by the profiler.
+        """
+
+        return {"particles": len(self.particles)}
+
+    def memory_usage(self):
+        """Returns roughly how many bytes the scene keeps for itself.
+        Images shared with other scenes (the atlas) aren't counted.
+        """
+
+        return self.particles.position.nbytes * 4 \
+            + sum(layer.memory_usage() for layer in self.layers.values())
+
+    def save_state(self):
+        """Returns what must survive when the scene is evicted by the
+        scene manager. The returned value is given to restore_state()
+        of the scene built again later.
+        """
+
+        return None
+
+    def restore_state(self, state):
+        """Restores what save_state() returned before the scene was
+        evicted.
+        """
+
+        pass
 
     def draw_particles(self):
-        for particles_group in self.particles_groups:
-            particles_group.draw(self.screen)
+        self.particles.draw()
 
     def update_particles(self):
-        for particles_group in self.particles_groups:
-            if len(particles_group) == 0:
-                self.particles_groups.remove(particles_group)
-            particles_group.update()
+        self.particles.update()
+
+    def moving_rects(self):
+        """Returns the Rects of everything drawn in this frame that
+        may have changed since the last one. None means that the
+        whole screen may have changed.
+        """
+
+        return None
+
+    def dirty_rects(self):
+        """Returns the areas of the screen that changed since the
+        last frame, that is, where the moving components are now and
+        where they were before. None means the whole screen.
+        """
+
+        current_rects = self.moving_rects()
+        if current_rects is None:
+            self.previous_rects = []
+            return None
+
+        current_rects = [r.copy() for r in current_rects]
+        rects = self.previous_rects + current_rects
+        self.previous_rects = current_rects
+
+        if self.full_redraw:
+            self.full_redraw = False
+            return None
+        return rects
 
     def draw(self):
         """It draws the components of this scene in the screen."""
@@ -56,7 +217,9 @@ class Scene:
         pass
 
     def update_on_event(self, event):
-        """It updates the components if a event occur.
+        """It updates the components if a event occur. By default,
+        the event is given to the handlers subscribed to it in the
+        events attribute.
 
         Args:
 
@@ -66,7 +229,7 @@ class Scene:
                 (pygame.event.get()).
         """
 
-        pass
+        self.events.dispatch(event)
 
 
 class DebugScene(Scene):
@@ -91,18 +254,31 @@ class DebugScene(Scene):
         self.screen.blit(self.bg, self.rect)
         draw.rect(self.screen, (0, 0, 180), self.test_rect)
 
-
-# TODO: Find a safer way of timing stuff. Sending events is proper to
-# fail
+    def moving_rects(self):
+        return []
 
 
 class IntroScene(Scene):
     """A scene that shows the logo of the creator of the game."""
 
-    END_INTRO = constants.USEREVENT + 1
+    # How long the logo is shown, in milliseconds.
+    DURATION = 3000
+
+    def __init__(self, screen, on_end=None):
+        """Initialises the IntroScene object.
+
+        Args:
+
+            screen:
+                The Surface object where this scene will be drawn.
+
+            on_end:
+                An optional function called when the intro is over,
+                right before the main menu is shown.
+        """
 
-    def __init__(self, screen):
         super().__init__(screen)
+        self.on_end = on_end
 
         self.logo_icon = interface.Label(
             screen, utils.load_image("game_intro/moura_cat.png"))
@@ -115,21 +291,31 @@ class IntroScene(Scene):
         self.logo_title.rect.centerx = self.screen_rect.centerx
         self.logo_title.rect.centery = self.screen_rect.centery + 74
 
-        time.set_timer(IntroScene.END_INTRO, 3000, 1)
+        self.add_layer("static", self.screen_rect, self.draw_static)
+
+    def draw_static(self, destination):
+        destination.fill((255, 255, 255))
+        self.logo_icon.draw(destination)
+        self.logo_title.draw(destination)
 
     def draw(self):
-        self.screen.fill((255, 255, 255))
-        self.logo_icon.draw()
-        self.logo_title.draw()
+        self.layers["static"].draw(self.screen)
 
-    def update_on_event(self, event):
-        if event.type == IntroScene.END_INTRO:
-            print("changing view")
-            self.scene_manager.change_view(
-                "main_menu",
-                effects.FadeTransition(
-                    self.screen, self.scene_manager, "main_menu",
-                    (0, 0, 0), 4))
+    def moving_rects(self):
+        return []
+
+    def enter(self):
+        self.schedule(self.DURATION, self.end_intro)
+
+    def end_intro(self):
+        if self.on_end is not None:
+            self.on_end()
+
+        self.scene_manager.change_view(
+            "main_menu",
+            effects.FadeTransition(
+                self.screen, self.scene_manager, "main_menu",
+                (0, 0, 0), 2000))
 
 
 class MainMenuScene(Scene):
@@ -138,7 +324,7 @@ class MainMenuScene(Scene):
     def __init__(self, screen):
         super().__init__(screen)
 
-        self.background = GameBackground(screen)
+        self.background = GameBackground(screen, self.random.get("targets"))
 
         self.game_title = interface.Label(
             screen, utils.load_image("main_menu/game_title.png"),
@@ -151,7 +337,7 @@ class MainMenuScene(Scene):
                 "on_game", fadefx)
 
             # Always get brand new game
-            self.scene_manager.views["on_game"].retry()
+            self.scene_manager.get("on_game").retry()
 
         self.play_button = interface.Button(
             screen, utils.load_image("main_menu/play_button_on.png"),
@@ -160,9 +346,9 @@ class MainMenuScene(Scene):
             play_button_action)
 
         def settings_button_action():
-            fadefx = effects.FadeTransition(
-                self.screen, self.scene_manager, "on_settings", (255, 255, 255))
-            self.scene_manager.change_view("on_settings", fadefx)
+            slidefx = effects.SlideTransition(
+                self.screen, self.scene_manager, "on_settings", (-1, 0))
+            self.scene_manager.change_view("on_settings", slidefx)
 
         self.settings_button = interface.Button(
             screen, utils.load_image("main_menu/settings_button_on.png"),
@@ -190,27 +376,38 @@ class MainMenuScene(Scene):
         self.quit_button.rect.y += 80 + padding
         self.quit_button.rect.x += padding
 
+        for button in (self.play_button, self.settings_button,
+                       self.quit_button):
+            self.subscribe_button(button)
+
     def draw(self):
         self.screen.fill((0, 0, 80))
-        self.background.draw()
+        self.background.draw(self.interpolation)
         self.draw_particles()
         self.game_title.draw()
         self.play_button.draw()
         self.settings_button.draw()
         self.quit_button.draw()
 
+    def stats(self):
+        stats = super().stats()
+        stats["targets"] = len(self.background.targets)
+        return stats
+
+    def memory_usage(self):
+        return super().memory_usage() \
+            + self.background.targets_layer.memory_usage()
+
+    def moving_rects(self):
+        return [self.background.ball.motion_rect(), self.game_title.rect] \
+            + self.button_rects(self.play_button, self.settings_button,
+                                self.quit_button) \
+            + self.background.targets.dirty_rects() + self.particles.rects()
+
     def update(self):
-        self.background.update(self.particles_groups)
+        self.background.update(self.particles)
         self.update_particles()
         self.game_title.update()
-        self.play_button.update()
-        self.settings_button.update()
-        self.quit_button.update()
-
-    def update_on_event(self, event):
-        self.play_button.update_on_event(event)
-        self.settings_button.update_on_event(event)
-        self.quit_button.update_on_event(event)
 
 
 # TODO: Create settings scene. The projected interface file is settings_view.png
@@ -247,10 +444,9 @@ class SettingsScene(Scene):
 
         # Back button
         def back_button_action():
-            fadefx = effects.FadeTransition(
-                self.screen, self.scene_manager, "main_menu", (255, 255, 255),
-                4)
-            self.scene_manager.change_view("main_menu", fadefx)
+            slidefx = effects.SlideTransition(
+                self.screen, self.scene_manager, "main_menu", (1, 0))
+            self.scene_manager.change_view("main_menu", slidefx)
 
         self.back_button = interface.Button(
             screen, utils.load_image("on_settings/back_button_on.png"),
@@ -289,36 +485,48 @@ class SettingsScene(Scene):
         self.to_be_improved_label.rect.y += 10
         self.to_be_improved_label.rect.x += 30
 
+        # Only the buttons change, everything else is cached.
+        self.add_layer("static", self.screen_rect, self.draw_static)
+
+        for button in (self.easy_button, self.normal_button,
+                       self.hard_button, self.back_button):
+            self.subscribe_button(button)
+
+    def draw_static(self, destination):
+        destination.fill((255, 255, 255))
+
+        self.info_title_label.draw(destination)
+        self.info_label.draw(destination)
+
+        self.to_be_improved_label.draw(destination)
+
     def draw(self):
-        self.screen.fill((255, 255, 255))
+        self.layers["static"].draw(self.screen)
+
         self.easy_button.draw()
         self.normal_button.draw()
         self.hard_button.draw()
 
-        self.info_title_label.draw()
-        self.info_label.draw()
-
-        self.to_be_improved_label.draw()
-
         self.back_button.draw()
 
-    def update(self):
-        self.easy_button.update()
-        self.normal_button.update()
-        self.hard_button.update()
-
-        self.back_button.update()
-
-    def update_on_event(self, event):
-        self.easy_button.update_on_event(event)
-        self.normal_button.update_on_event(event)
-        self.hard_button.update_on_event(event)
-        self.back_button.update_on_event(event)
+    def moving_rects(self):
+        return self.button_rects(self.easy_button, self.normal_button,
+                                 self.hard_button, self.back_button)
 
 
 class GameScene(Scene):
     """Scene responsible for being actually the minigame."""
 
+    # Every time the score goes up by this much, MULTIBALL_SIZE extra
+    # balls come out of the ball.
+    MULTIBALL_SCORE = 2000
+    MULTIBALL_SIZE = 3
+
+    # Updates between two colours of the background with the dirty
+    # rendering, so only the frames in which it changes are sent
+    # whole to the display.
+    DIRTY_BACKGROUND_INTERVAL = 30
+
     def __init__(self, screen):
         super().__init__(screen)
 
@@ -327,20 +535,36 @@ class GameScene(Scene):
         self.game_over = False
         self.on_countdown = True
 
-        # Timer variables
-        self.current_time = 0
-        self.countdown_tick = 0
+        # The Timer object of the countdown, while it's on.
+        self.countdown_timer = None
+        self.countdown_step = 0
 
         self.attempts = 3
+        self.next_multiball = self.MULTIBALL_SCORE
+
+        # How many extra balls are kept in the game, for stress
+        # testing. 0 means only the multi-ball power-up adds them.
+        self.stress_balls = 0
+
+        # An InputRecorder object that keeps the input of the match,
+        # when there's one.
+        self.recorder = None
+
+        # The flags and the background colour version drawn in the
+        # last frame. Any change means the whole screen looks
+        # different.
+        self.drawn_state = None
 
         # Game elements
         self.ball = Ball(screen)
         self.paddle = Paddle(screen)
-        self.targets = sprite.Group()
-        target.recharge(screen, self.targets)
+        self.swarm = BallSwarm(screen, rng=self.random.numpy("swarm"))
+        self.targets = target.TargetField(
+            screen, rng=self.random.get("targets"))
 
         # Interface elements
-        self.background = ColourChangingBackground(screen)
+        self.background = ColourChangingBackground(
+            screen, self.random.get("background"))
         self.countdown_number = interface.Label.from_text(
             screen, "1", (0, 0, 255), 36, 1, 1)
         self.scoreboard = interface.Label.from_text(
@@ -359,9 +583,8 @@ class GameScene(Scene):
             utils.load_image("on_game/main_menu_button_clicked.png"),
             lambda: self.scene_manager.change_view(
                 "main_menu",
-                effects.FadeTransition(
-                    screen, self.scene_manager, "main_menu",
-                    (255, 255, 255), 4)
+                effects.CrossfadeTransition(
+                    screen, self.scene_manager, "main_menu", 1000)
             )
         )
         self.paused_label = interface.Label.from_text(
@@ -369,7 +592,7 @@ class GameScene(Scene):
 
         def back_button_action():
             fadefx = effects.FadeTransition(screen, self.scene_manager,
-                                            "main_menu", (255, 255, 255), 4)
+                                            "main_menu", (255, 255, 255), 2000)
             self.scene_manager.change_view("main_menu", fadefx)
 
             self.paused = False
@@ -382,19 +605,25 @@ class GameScene(Scene):
             back_button_action)
 
         # Sound effects
-        self.game_over_soundfx = utils.load_soundfx(
-            "on_game/soundfx/game_over.wav")
-        self.countdown_beep_soundfx = utils.load_soundfx(
-            "on_game/soundfx/countdown_beep.wav")
+        self.game_over_soundfx = "on_game/soundfx/game_over.wav"
+        self.countdown_beep_soundfx = "on_game/soundfx/countdown_beep.wav"
 
         self.setup_game_elements()
         self.setup_interface_elements()
+        self.subscribe_events()
+
+        # The standing targets only change when one is hit or the
+        # field is recharged.
+        self.add_layer("targets", self.targets.field_rect(),
+                       self.targets.draw_standing,
+                       lambda: self.targets.version, transparent=True)
+        self.add_layer("game_over", self.screen_rect, self.draw_game_over)
 
     def setup_game_elements(self):
         self.ball.x, self.ball.y = self.screen_rect.center
 
-        self.paddle.rect.centerx = self.screen_rect.centerx
-        self.paddle.rect.centery = self.screen_rect.centery + 100
+        self.paddle.place(centerx=self.screen_rect.centerx,
+                          centery=self.screen_rect.centery + 100)
 
     def setup_interface_elements(self):
         self.paused_label.rect.center = self.screen_rect.center
@@ -416,19 +645,24 @@ class GameScene(Scene):
 
         self.scoreboard.rect.bottomright = self.screen_rect.bottomright
 
+    def draw_game_over(self, destination):
+        destination.fill((0, 20, 0))
+        self.game_over_label.draw(destination)
+
     def draw(self):
         if self.game_over:
-            self.screen.fill((0, 20, 0))
-            self.game_over_label.draw()
+            self.layers["game_over"].draw(self.screen)
             self.main_menu_button.draw()
             self.retry_button.draw()
         else:
             # Game is on
             self.background.draw()
-            self.targets.draw(self.screen)
-            self.ball.draw()
+            self.layers["targets"].draw(self.screen)
+            self.targets.draw_falling()
+            self.ball.draw(self.interpolation)
+            self.swarm.draw(self.interpolation)
             self.draw_particles()
-            self.paddle.draw()
+            self.paddle.draw(self.interpolation)
             self.scoreboard.draw()
             if self.paused:
                 self.paused_label.draw()
@@ -436,6 +670,53 @@ class GameScene(Scene):
             elif self.on_countdown:
                 self.countdown_number.draw()
 
+    def stats(self):
+        stats = super().stats()
+        stats["targets"] = len(self.targets)
+        stats["balls"] = 1 + len(self.swarm)
+        return stats
+
+    def save_state(self):
+        return {
+            "seed": self.random.seed,
+            "points": self.ball.points,
+            "attempts": self.attempts,
+            "game_over": self.game_over,
+            "recorder": self.recorder,
+        }
+
+    def restore_state(self, state):
+        self.retry(state["seed"])
+        # Set after retry(), which would start a new recording.
+        self.recorder = state["recorder"]
+        self.ball.points = state["points"]
+        self.next_multiball = (self.ball.points // self.MULTIBALL_SCORE + 1) \
+            * self.MULTIBALL_SCORE
+        self.attempts = state["attempts"]
+        self.game_over = state["game_over"]
+        if self.game_over:
+            self.stop_countdown()
+
+    def moving_rects(self):
+        state = (self.paused, self.game_over, self.on_countdown,
+                 self.background.version)
+        if state != self.drawn_state:
+            # The whole screen is shown, but the rects are still
+            # given, as the next frame must cover where they were.
+            self.drawn_state = state
+            self.full_redraw = True
+
+        if self.game_over:
+            return self.button_rects(self.main_menu_button, self.retry_button)
+        elif self.paused:
+            return self.button_rects(self.back_button)
+        elif self.on_countdown:
+            return [self.countdown_number.rect]
+
+        return [self.ball.motion_rect(), self.paddle.motion_rect(),
+                self.scoreboard.rect] + self.swarm.motion_rects() \
+            + self.targets.dirty_rects() + self.particles.rects()
+
     def update_game_elements(self):
         """It updates the game related elements."""
 
@@ -445,96 +726,198 @@ class GameScene(Scene):
                 self.attempts -= 1
                 if self.attempts == 0:
                     self.game_over = True
-                    self.on_countdown = False
-                    self.game_over_soundfx.play()
+                    self.stop_countdown()
+                    utils.play_soundfx(self.game_over_soundfx)
             self.background.update()
-            self.ball.update(self.particles_groups, self.paddle)
+            self.ball.update(self.particles, self.paddle, self.targets)
+            self.update_swarm()
             self.update_particles()
             self.paddle.update()
-            self.targets.update(self.ball, self.particles_groups)
+            self.targets.update()
             self.scoreboard.update_text(f"Score: {self.ball.points}")
             self.scoreboard.rect.bottomleft = self.screen_rect.bottomleft
-        else:
-            self.back_button.update()
 
-        if self.game_over:
-            self.retry_button.update()
-            self.main_menu_button.update()
-
-    def countdown_handling(self):
-        """It's responsible for doing the game 1.. 2.. 3.. countdown
-        whenever asked to do so.
+    def update_swarm(self):
+        """It updates the extra balls, adding new ones when the
+        multi-ball power-up is earned or in the stress mode.
         """
 
-        if not (self.countdown_tick or self.game_over) and self.on_countdown:
-            self.countdown_tick = time.get_ticks()
+        self.ball.points += self.swarm.update(self.paddle, self.targets,
+                                              self.particles)
+
+        if self.ball.points >= self.next_multiball:
+            self.next_multiball += self.MULTIBALL_SCORE
+            self.swarm.emit(self.ball.rect.x, self.ball.rect.y,
+                            self.MULTIBALL_SIZE)
+
+        if len(self.swarm) < self.stress_balls:
+            self.swarm.emit(self.paddle.rect.centerx, self.paddle.rect.top
+                            - self.swarm.height,
+                            self.stress_balls - len(self.swarm))
+
+    def start_countdown(self):
+        """It starts the game 1.. 2.. 3.. countdown. It only counts
+        while this is the current scene.
+        """
 
+        self.stop_countdown()
+        self.on_countdown = True
+        # Nothing counts down once the game is over.
+        if self.scene_manager is not None and not self.game_over:
+            self.countdown_step = 0
+            self.countdown_timer = self.schedule(0, self.countdown, 1000)
+
+    def stop_countdown(self):
+        if self.countdown_timer is not None:
+            self.countdown_timer.cancel()
+            self.countdown_timer = None
+        self.on_countdown = False
+
+    def countdown(self):
+        """Shows the next number of the countdown, or ends it."""
+
+        self.countdown_step += 1
+        if self.countdown_step == 1:
             # The beep sound effect is just a sec. Better that way.
-            self.countdown_beep_soundfx.play(loops=2)
+            utils.play_soundfx(self.countdown_beep_soundfx, loops=2)
 
-        if self.on_countdown:
-            delta_time = self.current_time - self.countdown_tick
+        if self.countdown_step <= 3:
+            self.countdown_number.update_text(str(self.countdown_step))
+            self.countdown_number.rect.center = self.screen_rect.center
+        else:
+            self.stop_countdown()
 
-            for i in range(1, 4):
-                if i*1000-1000 < delta_time < i*1000:
-                    self.countdown_number.update_text(str(i))
-                    self.countdown_number.rect.center = self.screen_rect.center
-            else:
-                if 3000 < delta_time < 3500:
-                    self.on_countdown = False
-                    self.countdown_tick = 0
+    def enter(self):
+        self.background.interval = self.DIRTY_BACKGROUND_INTERVAL \
+            if self.scene_manager.dirty_rendering else 1
 
-    def update(self):
-        self.current_time = time.get_ticks()
+        if self.on_countdown and not (self.countdown_timer is not None
+                                      and self.countdown_timer.active):
+            # The countdown the scene was built with, or one cancelled
+            # when the scene was left.
+            self.start_countdown()
 
-        self.countdown_handling()
+    def update(self):
         self.update_game_elements()
 
+        if self.recorder is not None:
+            self.recorder.tick(self.ball.points)
+
+    def subscribe_events(self):
+        """Subscribes the handlers of the keys and the buttons."""
+
+        for key, move in ((constants.K_a, self.paddle.move_left),
+                          (constants.K_d, self.paddle.move_right)):
+            self.events.subscribe(constants.KEYDOWN,
+                                  lambda event, move=move: move(True), key=key)
+            self.events.subscribe(constants.KEYUP,
+                                  lambda event, move=move: move(False),
+                                  key=key)
+        self.events.subscribe(constants.KEYDOWN, self.toggle_pause,
+                              key=constants.K_p)
+
+        self.subscribe_button(self.retry_button, lambda: self.game_over)
+        self.subscribe_button(self.main_menu_button, lambda: self.game_over)
+        self.subscribe_button(self.back_button,
+                              lambda: self.paused and not self.game_over)
+
+    def toggle_pause(self, event):
+        if not self.on_countdown:
+            self.paused = not self.paused
+            if self.paused:
+                self.scene_manager.scheduler.pause(self)
+            else:
+                self.scene_manager.scheduler.resume(self)
+
     def update_on_event(self, event):
-        if event.type == constants.KEYDOWN:
-            if event.key == constants.K_a:
-                self.paddle.move_left(True)
-            elif event.key == constants.K_d:
-                self.paddle.move_right(True)
-            elif event.key == constants.K_p and not self.on_countdown:
-                self.paused = not self.paused
-        elif event.type == constants.KEYUP:
-            if event.key == constants.K_a:
-                self.paddle.move_left(False)
-            elif event.key == constants.K_d:
-                self.paddle.move_right(False)
+        if self.recorder is not None:
+            self.recorder.record(event)
 
-        if self.game_over:
-            self.retry_button.update_on_event(event)
-            self.main_menu_button.update_on_event(event)
-        elif self.paused:
-            self.back_button.update_on_event(event)
+        super().update_on_event(event)
 
     def restart(self):
         """It restarts the game to its initial state."""
 
-        target.recharge(self.screen, self.targets)
+        self.targets.recharge()
+        self.swarm.clear()
         self.setup_game_elements()
-        self.countdown_tick = 0
-        self.on_countdown = True
+        self.start_countdown()
+
+    def retry(self, seed=None):
+        """It starts the game again.
+
+        Args:
+
+            seed:
+                The seed of the match random streams. When None, a
+                random seed is chosen.
+        """
 
-    def retry(self):
-        """It starts the game again."""
+        self.random.reseed(seed)
+        if self.recorder is not None:
+            self.recorder.start(self.random.seed, self.paddle)
 
+        self.ball.reset()
+        self.particles.clear()
+        self.game_over = False
         self.restart()
         self.attempts = 3
-        self.countdown_tick = 0
-        self.on_countdown = True
-        self.game_over = False
+        self.next_multiball = self.MULTIBALL_SCORE
 
 
 class SceneManager:
     """Manages the scenes in the main thread of the running game."""
 
-    def __init__(self):
-        """Initialises the scene manager object."""
+    def __init__(self, clock=None, dirty_rendering=False, budget=None,
+                 allowed_events=None):
+        """Initialises the scene manager object.
 
+        Args:
+
+            clock:
+                An object with a get_ticks() method that tells the
+                scenes how much time has passed. When None, the real
+                time (SystemClock) is used.
+
+            dirty_rendering:
+                When True, show() returns only the areas of the
+                screen that changed, instead of the whole screen.
+
+            budget:
+                How many bytes (see Scene.memory_usage()) the built
+                scenes that aren't being shown may take. The ones
+                used least recently are evicted when there are more.
+                None means no scene is ever evicted.
+
+            allowed_events:
+                An iterable with the event types that are always
+                wanted (e.g. pygame.QUIT). When given, every other
+                event type nobody in the current scene subscribed to
+                is blocked (see pygame.event.set_allowed()), so it's
+                never even queued. None means nothing is blocked.
+        """
+
+        self.clock = clock if clock is not None else SystemClock()
+        # The timers of the scenes. Only the current scene timers
+        # count down, and only while there's no transition.
+        self.scheduler = Scheduler(self.clock)
+        self.dirty_rendering = dirty_rendering
+        self.budget = budget
+        self.allowed_events = allowed_events
+
+        # A Profiler object that times the scenes, when there's one.
+        self.profiler = None
+        # Returns the mouse position on the scenes screen, which may
+        # not be the window one (see Viewport.to_logical()).
+        self.mouse_position = mouse.get_pos
+        # The scenes built so far.
         self.views = dict()
+        # View name: (factory, prewarm) of the registered scenes.
+        self.factories = dict()
+        # View name: what save_state() returned when it was evicted.
+        self.saved_states = dict()
+        # View names, from the least to the most recently shown.
+        self.recently_used = []
         self.on_transition = False
         self.fx_object = None
         self.current_view = None
@@ -556,20 +939,119 @@ class SceneManager:
         scene_object.scene_manager = self
         self.views[view_name] = scene_object
 
-    def show(self):
+    def register(self, view_name, factory, prewarm=True):
+        """Registers a view that is only built when it's needed.
+
+        Args:
+
+            view_name:
+                A name to the view.
+
+            factory:
+                A function without arguments that returns the scene
+                object. It may be called again if the scene is
+                evicted.
+
+            prewarm:
+                When True, the scene is built as soon as a transition
+                to it starts, instead of in the middle of it.
+        """
+
+        self.factories[view_name] = (factory, prewarm)
+
+    def get(self, view_name):
+        """Returns the scene of a view, building it first if it's a
+        registered view that isn't built yet.
+        """
+
+        if view_name not in self.views:
+            factory, _ = self.factories[view_name]
+            self.add(view_name, factory())
+            if view_name in self.saved_states:
+                self.views[view_name].restore_state(
+                    self.saved_states.pop(view_name))
+
+        return self.views[view_name]
+
+    def evict(self, view_name):
+        """Forgets the scene of a registered view, keeping only what
+        its save_state() returns. The view is built again by get().
+        """
+
+        scene_object = self.views.pop(view_name)
+        self.saved_states[view_name] = scene_object.save_state()
+        self.scheduler.cancel(scene_object)
+        scene_object.scene_manager = None
+
+    def trim(self):
+        """Evicts the least recently shown scenes until the ones not
+        being shown fit in the budget.
+        """
+
+        if self.budget is None:
+            return
+
+        # Only registered views can be built again.
+        evictable = [
+            view_name for view_name in self.recently_used
+            if view_name in self.views and view_name in self.factories
+            and view_name != self.current_view
+            and not (self.on_transition
+                     and view_name == self.fx_object.next_view)
+        ]
+        usage = sum(self.views[view_name].memory_usage()
+                    for view_name in evictable)
+        for view_name in evictable:
+            if usage <= self.budget:
+                break
+            usage -= self.views[view_name].memory_usage()
+            self.evict(view_name)
+
+    def show(self, interpolation=1.0):
         """Shows the current view. This function may not have only
         one behavior
+
+        Args:
+
+            interpolation:
+                How far (from 0 to 1) the frame is between the last
+                update and the next one. Moving components are drawn
+                in between their last two positions.
+
+        Returns:
+            A list of Rects with the areas of the screen that changed,
+            to be given to pygame.display.update(). None when the
+            whole screen must be updated.
         """
 
-        self.views[self.current_view].draw()
         if self.on_transition:
-            self.fx_object.animate()
+            # The transition draws the views from its snapshots.
+            with self.measure("transition"):
+                self.fx_object.animate()
+
+            # Whichever view is current when the transition ends is
+            # shown entirely in the next frame.
+            self.views[self.current_view].full_redraw = True
+            return None
+
+        view = self.views[self.current_view]
+        view.interpolation = interpolation
+        with self.measure("show"):
+            view.draw()
+
+        if not self.dirty_rendering:
+            return None
+        return view.dirty_rects()
 
     def update(self):
         """It updates the components of the current scene in loop."""
 
         if not self.on_transition:
-            self.views[self.current_view].update()
+            with self.measure("update"):
+                self.scheduler.run()
+                # A timer may have changed the view.
+                if not self.on_transition:
+                    self.views[self.current_view].update()
 
     def update_on_event(self, event):
         """It updates scenes based on events being read by the for
@@ -586,10 +1068,54 @@ class SceneManager:
         if not self.on_transition:
             self.views[self.current_view].update_on_event(event)
 
+    def allow_events(self):
+        """Blocks the event types the current scene doesn't want,
+        when there are allowed_events.
+        """
+
+        if self.allowed_events is None:
+            return
+
+        event.set_blocked(None)
+        event.set_allowed(list(
+            set(self.allowed_events)
+            | self.views[self.current_view].events.event_types()))
+
+    def measure(self, phase):
+        """Returns a context manager that times the given phase in
+        the profiler. It does nothing when there's no profiler.
+        """
+
+        if self.profiler is None:
+            return contextlib.nullcontext()
+        return self.profiler.phase(phase)
+
+    def stats(self):
+        """Returns the stats of the current view."""
+
+        return self.views[self.current_view].stats()
+
     def _change_view(self, view_name):
         """It changes the current view directly."""
 
+        if self.current_view is not None:
+            # Timers never outlive the visit to their scene.
+            self.scheduler.cancel(self.views[self.current_view])
+
         self.current_view = view_name
+        scene_object = self.get(view_name)
+        scene_object.full_redraw = True
+        self.allow_events()
+        self.scheduler.resume(scene_object)
+        scene_object.enter()
+        if mouse.get_focused():
+            # No mouse event may come before the mouse moves.
+            scene_object.point_at(self.mouse_position())
+
+        if view_name in self.recently_used:
+            self.recently_used.remove(view_name)
+        self.recently_used.append(view_name)
+        self.trim()
 
     def change_view(self, view_name, fx=None):
         """It changes the current scene with a special effect or
@@ -609,6 +1135,10 @@ class SceneManager:
             if fx is not None:
                 self.fx_object = fx
                 self.on_transition = True
+                if view_name in self.factories \
+                        and self.factories[view_name][1]:
+                    self.get(view_name)
+                fx.start()
             else:
                 # Changes the view abruptly.
                 self._change_view(view_name)
@@ -616,4 +1146,4 @@ class SceneManager:
     def initial_view(self, view_name):
         """Sets the initial view for the scene manager."""
 
-        self.current_view = view_name
+        self._change_view(view_name)
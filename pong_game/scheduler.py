@@ -0,0 +1,182 @@
+"""Module dedicated for calling functions at a later time.
+
+The deadlines are kept in a heap and read from the scene manager
+clock, so a frame only looks at the timers that are due, and the
+timers keep working when the game runs headless or faster than the
+real time.
+"""
+
+import heapq
+import itertools
+
+
+class Timer:
+    """A function waiting to be called by a Scheduler."""
+
+    def __init__(self, scheduler, callback, interval, owner):
+        self.scheduler = scheduler
+        self.callback = callback
+        self.interval = interval
+        self.owner = owner
+
+        # The [deadline, order, timer] heap entry, None while the
+        # owner is paused.
+        self.entry = None
+        # How long it still has to wait, while the owner is paused.
+        self.remaining = 0
+        self.cancelled = False
+
+    @property
+    def active(self):
+        """Tells if the timer will still be called."""
+
+        return not self.cancelled
+
+    def cancel(self):
+        """Makes the timer never be called again."""
+
+        self.scheduler.cancel_timer(self)
+
+
+class Scheduler:
+    """Calls functions after some time, once or repeatedly.
+
+    Every timer belongs to an owner (usually a scene), and the timers
+    only count down while their owner is running. Timers without an
+    owner always run.
+    """
+
+    def __init__(self, clock):
+        """Initialises the Scheduler object.
+
+        Args:
+
+            clock:
+                An object with a get_ticks() method that tells the
+                time in milliseconds.
+        """
+
+        self.clock = clock
+        self.heap = []
+        self.order = itertools.count()
+
+        # Owner: the timers it has.
+        self.timers = dict()
+        self.running = {None}
+
+    def schedule(self, delay, callback, interval=None, owner=None):
+        """Makes a function be called later.
+
+        Args:
+
+            delay:
+                How many milliseconds until the first call.
+
+            callback:
+                A function without arguments.
+
+            interval:
+                When given, the function is called again every
+                interval milliseconds, until the timer is cancelled.
+
+            owner:
+                Whoever the timer belongs to. See pause() and
+                cancel().
+
+        Returns:
+            The Timer object.
+        """
+
+        timer = Timer(self, callback, interval, owner)
+        self.timers.setdefault(owner, set()).add(timer)
+
+        if owner in self.running:
+            self.push(timer, self.clock.get_ticks() + delay)
+        else:
+            timer.remaining = delay
+
+        return timer
+
+    def push(self, timer, deadline):
+        """Puts the timer in the heap, to be called at deadline."""
+
+        timer.entry = [deadline, next(self.order), timer]
+        heapq.heappush(self.heap, timer.entry)
+
+    def pull(self, timer):
+        """Takes the timer out of the heap. The entry is only marked
+        as removed, it's discarded when it reaches the top.
+        """
+
+        if timer.entry is not None:
+            timer.entry[2] = None
+            timer.entry = None
+
+    def cancel_timer(self, timer):
+        """Makes a timer never be called again."""
+
+        if timer.cancelled:
+            return
+
+        timer.cancelled = True
+        self.pull(timer)
+        timers = self.timers.get(timer.owner)
+        if timers is not None:
+            timers.discard(timer)
+            if not timers:
+                del self.timers[timer.owner]
+
+    def cancel(self, owner):
+        """Cancels every timer of an owner, and stops running it."""
+
+        for timer in list(self.timers.get(owner, ())):
+            self.cancel_timer(timer)
+        if owner is not None:
+            self.running.discard(owner)
+
+    def pause(self, owner):
+        """Stops the countdown of the owner timers."""
+
+        if owner not in self.running:
+            return
+
+        self.running.discard(owner)
+        now = self.clock.get_ticks()
+        for timer in self.timers.get(owner, ()):
+            timer.remaining = max(timer.entry[0] - now, 0)
+            self.pull(timer)
+
+    def resume(self, owner):
+        """Starts (or continues) the countdown of the owner timers."""
+
+        if owner in self.running:
+            return
+
+        self.running.add(owner)
+        now = self.clock.get_ticks()
+        for timer in self.timers.get(owner, ()):
+            self.push(timer, now + timer.remaining)
+
+    def run(self):
+        """Calls the functions whose time has come, in the order of
+        their deadlines.
+        """
+
+        now = self.clock.get_ticks()
+        heap = self.heap
+        while heap and heap[0][0] <= now:
+            deadline, _, timer = heapq.heappop(heap)
+            if timer is None:
+                continue
+
+            if timer.interval is None:
+                timer.entry = None
+                self.cancel_timer(timer)
+            else:
+                # Scheduled from the deadline, not from now, so the
+                # calls don't drift.
+                self.push(timer, deadline + timer.interval)
+            timer.callback()
+
+    def __len__(self):
+        return sum(len(timers) for timers in self.timers.values())
@@ -3,11 +3,33 @@
 import os
 import functools
 
-import pygame.image as image
 import pygame.mixer as mixer
 
+from . import assets
+from . import audio
+
+# When True, play_soundfx does nothing. Used by the headless engine,
+# where there's no one to listen anyway.
+muted = False
+
+
+def set_muted(value):
+    """Mutes (or unmutes) every sound effect played through
+    play_soundfx.
+
+    Args:
+
+        value:
+            A boolean value. True silences the sound effects.
+    """
+
+    global muted
+    muted = value
+
+
 def load_image(path):
-    """Loads the image inside the game_data directory.
+    """Loads the image inside the game_data directory. Each image is
+    decoded and converted to the display format only once.
 
     Args:
 
@@ -16,7 +38,32 @@ def load_image(path):
             (game_data/)
     """
 
-    return image.load(os.path.join("game_data", path))
+    return assets.images.load(path)
+
+
+def interpolate(previous_position, position, interpolation):
+    """Returns a position between two others.
+
+    Args:
+
+        previous_position:
+            The (x, y) position where the movement started.
+
+        position:
+            The (x, y) position where the movement ended.
+
+        interpolation:
+            A number from 0 (previous_position) to 1 (position).
+    """
+
+    if interpolation >= 1:
+        return position
+
+    x0, y0 = previous_position
+    x1, y1 = position
+    return (round(x0 + (x1 - x0) * interpolation),
+            round(y0 + (y1 - y0) * interpolation))
+
 
 @functools.cache
 def load_soundfx(path):
@@ -30,20 +77,29 @@ def load_soundfx(path):
             (game_data/)
     """
 
-    return mixer.Sound(os.path.join("game_data", path))
+    if assets.bundle is not None and path in assets.bundle:
+        return mixer.Sound(file=assets.bundle.file(path))
+    return mixer.Sound(os.path.join(assets.GAME_DATA, path))
 
 
-def play_soundfx(path):
+def play_soundfx(path, loops=0):
     """Plays a sound effect from a file from the given pathname.
-    This function is cached, thus everytime the same path is given,
-    there will be no reason to create a Sound object.
+    The Sound objects are cached, thus everytime the same path is
+    given, there will be no reason to create a Sound object. Whether
+    the effect is actually played is up to audio.sounds.
     
     Args:
     
         path:
             A string representing a path that comes after the root
             (game_data/)
+
+        loops:
+            How many times the sound effect is repeated after the
+            first play.
     """
 
-    soundfx = load_soundfx(path)
-    soundfx.play()
+    if muted:
+        return
+
+    audio.sounds.play(path, load_soundfx, loops)
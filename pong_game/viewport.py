@@ -0,0 +1,192 @@
+"""Module dedicated for showing the game on displays of any size.
+
+The scenes are always drawn at the logical resolution, the one the
+game is tuned for (speeds are in logical pixels per tick). How that
+resolution reaches the display depends on the output size:
+
+    * The same size: the scenes draw straight on the display.
+
+    * A whole multiple of it, or fullscreen: the display is opened
+      with the SCALED flag, so SDL scales every frame on the GPU when
+      presenting it. Nothing is scaled in Python.
+
+    * Anything else (or when SCALED isn't available, e.g. without a
+      GPU renderer): the frame is scaled in software into the largest
+      area of the window with the same aspect ratio. At whole
+      multiples, only the parts of the frame that changed are scaled.
+      Otherwise the whole frame is scaled every time, which costs
+      about as much as drawing it.
+"""
+
+import warnings
+
+import pygame
+import pygame.constants as constants
+import pygame.display as display
+import pygame.rect as rect
+import pygame.surface as surface
+import pygame.transform as transform
+
+# Events whose positions are in window coordinates.
+MOUSE_EVENTS = (constants.MOUSEMOTION, constants.MOUSEBUTTONDOWN,
+                constants.MOUSEBUTTONUP)
+
+
+class Viewport:
+    """The display where the logical resolution is shown."""
+
+    def __init__(self, logical_size, output_size=None, fullscreen=False):
+        """Initialises the Viewport object.
+
+        Args:
+
+            logical_size:
+                The (width, height) resolution the scenes are drawn
+                at.
+
+            output_size:
+                The (width, height) size of the window. None means the
+                logical size (or the desktop size when fullscreen).
+
+            fullscreen:
+                When True, the game takes the whole display.
+        """
+
+        self.logical_size = tuple(logical_size)
+        self.output_size = tuple(output_size) if output_size is not None \
+            else None
+        self.fullscreen = fullscreen
+
+        self.window = None
+        # The Surface the scenes draw on.
+        self.screen = None
+        # Where the screen is scaled to on the window, when it's
+        # scaled in software. None otherwise.
+        self.area = None
+        self.target = None
+        # The integer factor of the software scaling, None when the
+        # area isn't a whole multiple of the logical size.
+        self.factor = None
+
+    def scale_factor(self):
+        """Returns the integer factor from the logical size to the
+        output size, or None when it's not a whole multiple.
+        """
+
+        if self.output_size is None:
+            return 1
+
+        width, height = self.logical_size
+        factor = self.output_size[0] // width
+        if factor >= 1 and self.output_size == (width * factor,
+                                                height * factor):
+            return factor
+        return None
+
+    def open(self):
+        """Opens the display.
+
+        Returns:
+            The Surface object the scenes draw on.
+        """
+
+        flags = constants.FULLSCREEN if self.fullscreen else 0
+        factor = self.scale_factor()
+
+        if factor == 1 and not self.fullscreen:
+            self.window = self.screen = display.set_mode(self.logical_size)
+            return self.screen
+
+        if factor is not None or self.fullscreen:
+            try:
+                with warnings.catch_warnings():
+                    # Without a GPU renderer, pygame just warns and
+                    # opens a window that isn't scaled.
+                    warnings.simplefilter("error")
+                    self.window = self.screen = display.set_mode(
+                        self.logical_size, flags | constants.SCALED)
+                return self.screen
+            except (pygame.error, Warning):
+                # No renderer to scale with, scaled in software then.
+                pass
+
+        self.window = display.set_mode(self.output_size or (0, 0), flags)
+        self.screen = surface.Surface(self.logical_size).convert()
+        self.area = self.fit(self.window.get_size())
+        self.target = self.window.subsurface(self.area)
+        factor = self.area.width // self.logical_size[0]
+        if self.area.size == (self.logical_size[0] * factor,
+                              self.logical_size[1] * factor):
+            self.factor = factor
+        return self.screen
+
+    def fit(self, window_size):
+        """Returns the largest Rect with the logical aspect ratio that
+        fits in the window, centred.
+        """
+
+        width, height = self.logical_size
+        scale = min(window_size[0] / width, window_size[1] / height)
+        area = rect.Rect(0, 0, round(width * scale), round(height * scale))
+        area.center = (window_size[0] // 2, window_size[1] // 2)
+        return area
+
+    def present(self, dirty_rects=None):
+        """Puts the last frame drawn on the screen onto the window.
+        Only does anything when it's scaled in software.
+
+        Args:
+
+            dirty_rects:
+                The Rects of the screen that changed since the last
+                frame. None means all of it.
+
+        Returns:
+            The Rects of the window that must be updated, or None
+            when it's the whole window.
+        """
+
+        if self.area is None:
+            return dirty_rects
+
+        if dirty_rects is None or self.factor is None:
+            # Scaled straight into the window, nothing is allocated.
+            transform.scale(self.screen, self.area.size, self.target)
+            return None
+
+        # At a whole multiple, each screen pixel becomes a square of
+        # the window, so the changed parts are scaled on their own.
+        factor = self.factor
+        screen_rect = self.screen.get_rect()
+        window_rects = []
+        for dirty_rect in dirty_rects:
+            dirty_rect = dirty_rect.clip(screen_rect)
+            if not dirty_rect:
+                continue
+            scaled = rect.Rect(dirty_rect.x * factor, dirty_rect.y * factor,
+                               dirty_rect.width * factor,
+                               dirty_rect.height * factor)
+            transform.scale(self.screen.subsurface(dirty_rect), scaled.size,
+                            self.target.subsurface(scaled))
+            window_rects.append(scaled.move(self.area.topleft))
+        return window_rects
+
+    def to_logical(self, position):
+        """Converts a position in the window to the logical
+        resolution.
+        """
+
+        if self.area is None:
+            return position
+
+        x, y = position
+        return ((x - self.area.x) * self.logical_size[0] // self.area.width,
+                (y - self.area.y) * self.logical_size[1] // self.area.height)
+
+    def translate(self, event):
+        """Converts the position of a mouse event to the logical
+        resolution, in place.
+        """
+
+        if self.area is not None and event.type in MOUSE_EVENTS:
+            event.pos = self.to_logical(event.pos)
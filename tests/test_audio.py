@@ -0,0 +1,104 @@
+import os
+
+import pygame.mixer as mixer
+import pytest
+
+from pong_game.audio import SoundEffect, SoundManager
+from pong_game.clock import SimulationClock
+
+
+@pytest.fixture
+def sound():
+    """A silent Sound long enough to keep its channel busy through a
+    test, played on a mixer with no real device behind it.
+    """
+
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    started = mixer.get_init() is None
+    if started:
+        mixer.init(frequency=22050, size=-16, channels=1)
+
+    frequency, size, channels = mixer.get_init()
+    yield mixer.Sound(
+        buffer=bytes(10 * frequency * abs(size) // 8 * channels))
+
+    mixer.stop()
+    if started:
+        mixer.quit()
+
+
+def manager(*effects, hits=3):
+    sounds = SoundManager(
+        {effect.path: effect for effect in effects},
+        {"interface": 1, "hits": hits}, SimulationClock())
+    # The paths are made up, none of them is on disk.
+    sounds.validate = list
+    sounds.setup()
+    return sounds
+
+
+def test_categories_reserve_their_channels(sound):
+    sounds = manager()
+
+    assert [len(sounds.channels[category])
+            for category in ("interface", "hits")] == [1, 3]
+    # Sound.play() only picks channels nobody reserved.
+    for _ in range(mixer.get_num_channels()):
+        sound.play()
+    assert not any(channel.get_busy()
+                   for channels in sounds.channels.values()
+                   for channel in channels)
+
+
+def test_oldest_voice_is_stolen_past_the_limit(sound):
+    hit = SoundEffect("hit", "hits", max_voices=2)
+    sounds = manager(hit)
+    load = {"hit": sound}.get
+
+    first = sounds.play("hit", load)
+    second = sounds.play("hit", load)
+    assert first is not second
+
+    # The third channel of the category stays free.
+    assert sounds.play("hit", load) is first
+    assert sounds.play("hit", load) is second
+    assert sum(channel.get_busy() for channel in sounds.channels["hits"]) == 2
+
+
+def test_plays_are_spaced_out(sound):
+    hit = SoundEffect("hit", "hits", max_voices=3, min_interval=30)
+    sounds = manager(hit)
+    load = {"hit": sound}.get
+
+    assert sounds.play("hit", load) is not None
+    sounds.clock.advance(29)
+    assert sounds.play("hit", load) is None
+    sounds.clock.advance(1)
+    assert sounds.play("hit", load) is not None
+
+
+def test_priority_steals_the_oldest_less_important_voice(sound):
+    low = SoundEffect("low", "hits", priority=0, max_voices=2)
+    high = SoundEffect("high", "hits", priority=1, max_voices=2)
+    sounds = manager(low, high, hits=2)
+    load = {"low": sound, "high": sound}.get
+
+    first = sounds.play("low", load)
+    second = sounds.play("low", load)
+
+    assert sounds.play("high", load) is first
+    # Nothing left is less important than this one.
+    assert sounds.play("low", load) is None
+    assert sounds.play("high", load) is second
+    assert sounds.play("high", load) is first
+
+
+def test_categories_do_not_share_channels(sound):
+    hit = SoundEffect("hit", "hits", priority=2, max_voices=3)
+    beep = SoundEffect("beep", "interface")
+    sounds = manager(hit, beep)
+    load = {"hit": sound, "beep": sound}.get
+
+    for _ in range(3):
+        sounds.play("hit", load)
+    assert sounds.play("beep", load) in sounds.channels["interface"]
@@ -0,0 +1,56 @@
+import os
+
+import pygame.image as image
+import pytest
+
+from pong_game import assets, bundle
+
+
+@pytest.fixture
+def bundle_path(tmp_path, monkeypatch):
+    # install() replaces the bundle of the whole game.
+    monkeypatch.setattr(assets, "bundle", None)
+    path = tmp_path / "assets.bundle"
+    bundle.build(path)
+    return path
+
+
+def test_images_match_their_files(bundle_path):
+    installed = bundle.install(bundle_path)
+    assert assets.bundle is installed
+
+    image_paths, sound_paths = bundle.referenced_assets()
+    images = assets.ImageManager()
+    for path in image_paths:
+        assert path in installed
+        decoded = image.load(os.path.join(assets.GAME_DATA, path))
+        loaded = images.load(path)
+        assert loaded.get_size() == decoded.get_size()
+        assert image.tobytes(loaded, "RGBA") == \
+            image.tobytes(decoded, "RGBA"), path
+
+
+def test_sounds_are_kept_as_they_are(bundle_path):
+    installed = bundle.install(bundle_path)
+
+    for path in bundle.referenced_assets()[1]:
+        with open(os.path.join(assets.GAME_DATA, path), "rb") as file:
+            assert installed.file(path).read() == file.read(), path
+
+
+def test_missing_assets_are_not_packed(tmp_path, monkeypatch):
+    image_paths, sound_paths = bundle.referenced_assets()
+    monkeypatch.setattr(bundle, "referenced_assets", lambda: (
+        image_paths + ("on_game/missing.png",), sound_paths))
+    path = tmp_path / "assets.bundle"
+
+    with pytest.raises(FileNotFoundError, match="on_game/missing.png"):
+        bundle.build(path)
+    assert not path.exists()
+
+
+def test_install_without_a_bundle(tmp_path, monkeypatch):
+    monkeypatch.setattr(assets, "bundle", None)
+
+    assert bundle.install(tmp_path / "assets.bundle") is None
+    assert assets.bundle is None
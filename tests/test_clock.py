@@ -0,0 +1,41 @@
+import fractions
+
+from pong_game.clock import SimulationClock
+
+
+def test_starts_at_the_given_time():
+    assert SimulationClock().get_ticks() == 0
+    assert SimulationClock(250).get_ticks() == 250
+
+
+def test_only_moves_when_advanced():
+    clock = SimulationClock()
+    assert clock.get_ticks() == clock.get_ticks() == 0
+
+    clock.advance(16)
+    clock.advance(4)
+    assert clock.get_ticks() == 20
+
+
+def test_accumulates_without_rounding():
+    clock = SimulationClock()
+    for _ in range(60):
+        clock.advance(fractions.Fraction(1000, 60))
+    assert clock.get_ticks() == 1000
+
+
+def test_elapsed_time_does_not_depend_on_the_start():
+    """The same steps take the same time wherever the clock starts,
+    even with float steps that would lose precision on large times.
+    """
+
+    steps = [1000 / 60, 1000 / 144, 0.1, 7]
+    elapsed = []
+    for start in (0, 10**12 + 0.5):
+        clock = SimulationClock(start)
+        for step in steps * 100:
+            clock.advance(step)
+        elapsed.append(clock.get_ticks() - fractions.Fraction(start))
+
+    assert elapsed[0] == elapsed[1]
+    assert elapsed[0] == sum(fractions.Fraction(step) for step in steps) * 100
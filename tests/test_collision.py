@@ -0,0 +1,55 @@
+import pytest
+
+from pong_game.game_elements.collision import sweep, wall_time
+
+OBSTACLE = (100, 100, 50, 20)
+
+
+def test_hits_the_side_it_moves_into():
+    assert sweep((0, 100, 10, 10), (180, 0), OBSTACLE) == (0.5, (-1, 0))
+    assert sweep((200, 100, 10, 10), (-100, 0), OBSTACLE) == (0.5, (1, 0))
+    assert sweep((120, 0, 10, 10), (0, 180), OBSTACLE) == (0.5, (0, -1))
+    assert sweep((120, 200, 10, 10), (0, -160), OBSTACLE) == (0.5, (0, 1))
+
+
+def test_fast_box_does_not_tunnel():
+    """A box that would end past the obstacle still hits it."""
+
+    time, normal = sweep((120, 0, 10, 10), (0, 10000), OBSTACLE)
+    assert time == pytest.approx(90 / 10000)
+    assert normal == (0, -1)
+
+
+def test_corner_sets_both_normal_components():
+    assert sweep((80, 80, 10, 10), (20, 20), OBSTACLE) == (0.5, (-1, -1))
+
+
+@pytest.mark.parametrize("box, velocity", [
+    # Stops short of it.
+    ((0, 100, 10, 10), (80, 0)),
+    # Passes beside it.
+    ((0, 0, 10, 10), (300, 0)),
+    # Moves away from it.
+    ((0, 100, 10, 10), (-50, 0)),
+    # Only touches its edge.
+    ((0, 90, 10, 10), (300, 0)),
+])
+def test_misses(box, velocity):
+    assert sweep(box, velocity, OBSTACLE) is None
+
+
+def test_overlapping_box_is_hit_right_away():
+    time, _ = sweep((110, 105, 10, 10), (5, 0), OBSTACLE)
+    assert time == 0
+
+
+def test_wall_time():
+    assert wall_time(50, 10, -100, 0, 400) == 0.5
+    assert wall_time(340, 10, 100, 0, 400) == 0.5
+    # Too far to reach the wall in this movement.
+    assert wall_time(50, 10, -10, 0, 400) is None
+    # No wall on that side.
+    assert wall_time(340, 10, 100, 0, None) is None
+    assert wall_time(50, 10, 0, 0, 400) is None
+    # Already past the wall.
+    assert wall_time(-5, 10, -10, 0, 400) == 0
@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+from pong_game.environment import PongEnv, TARGET_POINTS, VectorEnv
+
+
+def play(env, seed, steps):
+    observation, info = env.reset(seed)
+    observations = [observation.copy()]
+    rewards = []
+    for step in range(steps):
+        observation, reward, terminated, truncated, info = env.step(step % 3)
+        observations.append(observation.copy())
+        rewards.append(reward)
+        if terminated or truncated:
+            break
+    return observations, rewards, info
+
+
+def test_reset_skips_the_countdown():
+    env = PongEnv()
+    observation, info = env.reset(5)
+
+    assert info["seed"] == 5
+    assert not env.game.scene.on_countdown
+    assert observation.shape == env.observation_shape
+    assert observation.dtype == env.observation_dtype
+
+
+def test_same_seed_same_episode():
+    first = play(PongEnv(frame_skip=4), 5, 200)
+    second = play(PongEnv(frame_skip=4), 5, 200)
+
+    assert np.array_equal(first[0], second[0])
+    assert first[1] == second[1]
+
+
+def test_rewards_follow_the_score_and_lives():
+    env = PongEnv(frame_skip=4)
+    _, rewards, info = play(env, 5, 10000)
+
+    assert env.game.game_over
+    lives_lost = 3
+    assert sum(rewards) == info["score"] / TARGET_POINTS - lives_lost
+
+
+def test_truncation():
+    env = PongEnv(max_steps=10)
+    env.reset(5)
+    for _ in range(9):
+        assert not env.step(0)[3]
+    assert env.step(0)[3]
+
+
+def test_grayscale_observations():
+    env = PongEnv(observation_type="grayscale", frame_size=(40, 30))
+    observation, _ = env.reset(5)
+
+    assert observation.shape == (30, 40)
+    assert observation.dtype == np.uint8
+    assert observation.any()
+
+
+def test_vector_env_matches_single_envs():
+    vector = VectorEnv(3, workers=2, frame_skip=2)
+    try:
+        observations = vector.reset(11).copy()
+        actions = np.array([0, 1, 2])
+        results = [vector.step(actions) for _ in range(20)]
+        final = results[-1][0].copy()
+    finally:
+        vector.close()
+
+    for i, action in enumerate(actions):
+        env = PongEnv(frame_skip=2)
+        assert np.array_equal(env.reset(11 + i)[0], observations[i])
+        for _ in range(20):
+            observation = env.step(action)[0]
+        assert np.array_equal(observation, final[i])
+
+
+def test_vector_env_next_episodes_are_seeded():
+    # The seed only changes the colours of the targets.
+    options = dict(max_steps=5, observation_type="grayscale")
+    vector = VectorEnv(2, workers=1, **options)
+    try:
+        vector.reset(11)
+        for _ in range(5):
+            observations, _, _, truncated, _ = vector.step(np.zeros(2))
+        observations, truncated = observations.copy(), truncated.copy()
+    finally:
+        vector.close()
+
+    assert truncated.all()
+    for i in range(2):
+        env = PongEnv(**options)
+        # The background colour carries on from the last episode, so
+        # only the rows with the targets are compared.
+        assert np.array_equal(env.reset(13 + i)[0][:30],
+                              observations[i][:30])
+
+
+def test_vector_env_needs_environments():
+    with pytest.raises(ValueError):
+        VectorEnv(0)
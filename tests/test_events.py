@@ -0,0 +1,141 @@
+import os
+
+import pygame.constants as constants
+import pygame.display as display
+import pygame.event as event
+import pygame.rect as rect
+import pygame.surface as surface
+import pytest
+
+from pong_game.events import EventDispatcher
+from pong_game.scene import DebugScene, SceneManager
+
+
+def motion(position):
+    return event.Event(constants.MOUSEMOTION, pos=position, rel=(0, 0),
+                       buttons=(0, 0, 0))
+
+
+def test_regions_only_get_the_events_inside():
+    dispatcher = EventDispatcher(cell_size=64)
+    calls = []
+    for name, region in (("small", rect.Rect(10, 10, 20, 20)),
+                         ("wide", rect.Rect(40, 100, 200, 20)),
+                         ("far", rect.Rect(500, 300, 50, 50))):
+        dispatcher.subscribe(constants.MOUSEMOTION,
+                             lambda _, name=name: calls.append(name),
+                             region=region)
+
+    for position in ((15, 15), (35, 15), (50, 110), (230, 119),
+                     (230, 120), (520, 320), (0, 399)):
+        dispatcher.dispatch(motion(position))
+
+    assert calls == ["small", "wide", "wide", "far"]
+
+
+def test_only_the_regions_of_the_cell_are_looked_at():
+    dispatcher = EventDispatcher(cell_size=64)
+    near = dispatcher.subscribe(constants.MOUSEMOTION, print,
+                                region=rect.Rect(0, 0, 70, 10))
+    far = dispatcher.subscribe(constants.MOUSEMOTION, print,
+                               region=rect.Rect(300, 300, 10, 10))
+
+    assert dispatcher.candidates(motion((5, 5))) == [near]
+    assert dispatcher.candidates(motion((66, 60))) == [near]
+    assert dispatcher.candidates(motion((305, 305))) == [far]
+    assert dispatcher.candidates(motion((200, 200))) == []
+
+
+def test_moved_regions_are_found_once_invalidated():
+    dispatcher = EventDispatcher(cell_size=64)
+    calls = []
+    region = rect.Rect(0, 0, 10, 10)
+    dispatcher.subscribe(constants.MOUSEMOTION, calls.append, region=region)
+    assert dispatcher.dispatch(motion((5, 5)))
+
+    region.topleft = (200, 200)
+    dispatcher.invalidate()
+    assert not dispatcher.dispatch(motion((5, 5)))
+    assert dispatcher.dispatch(motion((205, 205)))
+    assert len(calls) == 2
+
+
+def test_leave_is_called_once_the_pointer_leaves():
+    dispatcher = EventDispatcher(cell_size=64)
+    entered = []
+    left = []
+    dispatcher.subscribe(constants.MOUSEMOTION, entered.append,
+                         region=rect.Rect(10, 10, 20, 20), leave=left.append)
+
+    dispatcher.dispatch(motion((15, 15)))
+    dispatcher.dispatch(motion((20, 20)))
+    assert len(entered) == 2
+    assert left == []
+
+    # Far away, in a cell the region isn't indexed in.
+    outside = motion((300, 300))
+    assert dispatcher.dispatch(outside)
+    assert left == [outside]
+
+    dispatcher.dispatch(motion((310, 310)))
+    assert left == [outside]
+    assert len(entered) == 2
+
+
+def test_leave_is_not_called_after_unsubscribing():
+    dispatcher = EventDispatcher(cell_size=64)
+    left = []
+    subscription = dispatcher.subscribe(
+        constants.MOUSEMOTION, print, region=rect.Rect(0, 0, 10, 10),
+        when=lambda: True, leave=left.append)
+
+    dispatcher.dispatch(motion((5, 5)))
+    dispatcher.unsubscribe(subscription)
+    assert not dispatcher.dispatch(motion((50, 50)))
+    assert left == []
+
+
+@pytest.fixture
+def display_events():
+    """Lets the event types be blocked, with no real window."""
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    started = not display.get_init()
+    if started:
+        display.init()
+
+    yield
+
+    event.set_allowed(None)
+    if started:
+        display.quit()
+
+
+def test_scenes_allow_the_events_they_subscribed_to(display_events):
+    scene_manager = SceneManager(allowed_events=(constants.QUIT,))
+    menu = DebugScene(surface.Surface((600, 400)))
+    menu.events.subscribe(constants.MOUSEMOTION, print,
+                          region=rect.Rect(0, 0, 10, 10))
+    menu.events.subscribe(constants.KEYDOWN, print, key=constants.K_SPACE)
+    scene_manager.add("menu", menu)
+    scene_manager.add("debug", DebugScene(surface.Surface((600, 400))))
+
+    scene_manager.change_view("menu")
+    assert not event.get_blocked(constants.QUIT)
+    assert not event.get_blocked(constants.MOUSEMOTION)
+    assert not event.get_blocked(constants.KEYDOWN)
+    assert event.get_blocked(constants.KEYUP)
+
+    scene_manager.change_view("debug")
+    assert not event.get_blocked(constants.QUIT)
+    assert event.get_blocked(constants.MOUSEMOTION)
+    assert event.get_blocked(constants.KEYDOWN)
+
+
+def test_blocking_is_left_alone_without_allowed_events(display_events):
+    scene_manager = SceneManager()
+    scene_manager.add("debug", DebugScene(surface.Surface((600, 400))))
+    event.set_blocked(constants.KEYUP)
+
+    scene_manager.change_view("debug")
+    assert event.get_blocked(constants.KEYUP)
@@ -0,0 +1,78 @@
+import numpy as np
+import pygame.surface as surface
+
+from pong_game.headless import HeadlessGame
+from pong_game.observation import (
+    STATE_FIELDS, Grayscale, SharedArrays, frame, state_size, state_vector)
+
+
+def test_frame_is_a_view_of_the_pixels():
+    screen = surface.Surface((4, 3), 0, 32)
+    screen.fill((10, 20, 30))
+    screen.set_at((3, 1), (200, 100, 50))
+
+    with frame(screen) as pixels:
+        assert pixels.shape == (3, 4, 3)
+        assert pixels[1, 3].tolist() == [200, 100, 50]
+        pixels[0, 0] = (1, 2, 3)
+
+    assert screen.get_at((0, 0))[:3] == (1, 2, 3)
+    # Unlocked again, so it can be drawn on.
+    screen.fill((0, 0, 0))
+
+
+def test_grayscale_weights():
+    screen = surface.Surface((8, 8), 0, 32)
+    grayscale = Grayscale(screen, (4, 4))
+    for colour in ((255, 255, 255), (255, 0, 0), (0, 255, 0), (0, 0, 255),
+                   (0, 0, 0)):
+        screen.fill(colour)
+        expected = sum(channel * weight for channel, weight in
+                       zip(colour, Grayscale.WEIGHTS)) >> 8
+        assert (grayscale() == expected).all()
+
+
+def test_grayscale_writes_into_the_given_array():
+    screen = surface.Surface((8, 8), 0, 32)
+    screen.fill((255, 255, 255))
+    grayscale = Grayscale(screen, (4, 2))
+    out = np.zeros((2, 4), dtype=np.uint8)
+
+    assert grayscale(out) is out
+    assert (out == 255).all()
+
+
+def test_state_vector():
+    game = HeadlessGame()
+    game.reset(5)
+    scene = game.scene
+    scene.targets.hit_cells([0], [0])
+
+    state = state_vector(scene)
+    fields = len(STATE_FIELDS)
+    assert state.shape == (state_size(scene),)
+    assert state[0] == scene.ball.position[0]
+    assert state[4] == scene.paddle.rect.centerx
+    standing = state[fields:].reshape(scene.targets.alive.shape)
+    assert standing[0, 0] == 0
+    assert standing.sum() == scene.targets.alive.size - 1
+
+    out = np.empty_like(state)
+    assert state_vector(scene, out) is out
+    assert np.array_equal(out, state)
+
+
+def test_shared_arrays_share_memory():
+    specs = {"a": ((3,), np.int64), "b": ((2, 5), np.uint8)}
+    owner = SharedArrays(specs)
+    try:
+        user = SharedArrays(specs, owner.name)
+        owner["a"][:] = (1, 2, 3)
+        user["b"][1] = 7
+
+        assert user["a"].tolist() == [1, 2, 3]
+        assert owner["b"][1].tolist() == [7] * 5
+        assert owner["b"].ctypes.data % SharedArrays.ALIGNMENT == 0
+        user.close()
+    finally:
+        owner.close()
@@ -0,0 +1,48 @@
+from pong_game.randomness import RandomStreams
+
+
+def draw(streams, name):
+    return [streams.get(name).random() for _ in range(5)], \
+        streams.numpy(name).integers(0, 1000, 5).tolist()
+
+
+def test_same_seed_same_numbers():
+    assert draw(RandomStreams(7), "particles") \
+        == draw(RandomStreams(7), "particles")
+
+
+def test_streams_are_independent():
+    """Drawing from one stream never changes another."""
+
+    untouched = RandomStreams(7)
+    busy = RandomStreams(7)
+    for _ in range(100):
+        busy.get("particles").random()
+        busy.numpy("particles").random()
+
+    assert draw(busy, "targets") == draw(untouched, "targets")
+
+
+def test_names_and_seeds_give_different_streams():
+    streams = RandomStreams(7)
+    assert draw(streams, "targets") != draw(streams, "particles")
+    assert draw(RandomStreams(7), "targets") \
+        != draw(RandomStreams(8), "targets")
+
+
+def test_reseed_resets_the_streams_handed_out():
+    streams = RandomStreams(7)
+    stream = streams.get("targets")
+    generator = streams.numpy("targets")
+    first = draw(streams, "targets")
+
+    streams.reseed(7)
+    assert streams.get("targets") is stream
+    assert streams.numpy("targets") is generator
+    assert draw(streams, "targets") == first
+
+
+def test_random_seed_is_kept():
+    streams = RandomStreams()
+    assert draw(streams, "targets") \
+        == draw(RandomStreams(streams.seed), "targets")
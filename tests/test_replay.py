@@ -0,0 +1,65 @@
+import pygame.constants as constants
+import pygame.event as event
+import pytest
+
+from pong_game.headless import HeadlessGame
+from pong_game.replay import InputRecorder, replay
+
+
+def follow_ball(game):
+    """Holds the key that takes the paddle towards the ball."""
+
+    ball_x = game.scene.ball.rect.centerx
+    paddle_x = game.scene.paddle.rect.centerx
+    if ball_x < paddle_x - 5:
+        return (constants.K_a,)
+    if ball_x > paddle_x + 5:
+        return (constants.K_d,)
+    return ()
+
+
+def test_file_round_trip(tmp_path):
+    recorder = InputRecorder(tick_time=1000 / 30)
+    recorder.start(1234)
+    recorder.record(event.Event(constants.KEYDOWN, key=constants.K_a))
+    recorder.tick(0)
+    recorder.record(event.Event(constants.MOUSEBUTTONDOWN, button=1,
+                                pos=(300, -20)))
+    # Not something the game cares about.
+    recorder.record(event.Event(constants.KEYDOWN, key=constants.K_q))
+    recorder.tick(100)
+
+    path = tmp_path / "match.rec"
+    recorder.save(str(path))
+    loaded = InputRecorder.load(str(path))
+
+    assert loaded.seed == 1234
+    assert loaded.tick_time == recorder.tick_time
+    assert loaded.ticks == 2
+    assert loaded.score == 100
+    assert loaded.events == [(0, 1, 0, 0), (1, 7, 300, -20)]
+    assert loaded.events_at()[1][0].pos == (300, -20)
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "not_a_recording"
+    path.write_bytes(bytes(64))
+    with pytest.raises(ValueError):
+        InputRecorder.load(str(path))
+
+
+def test_replay_gives_the_recorded_score(tmp_path):
+    game = HeadlessGame()
+    recorder = InputRecorder(game.frame_time)
+    game.scene.recorder = recorder
+    game.reset(42)
+    for _ in range(3000):
+        game.step(follow_ball(game))
+        if game.game_over:
+            break
+
+    path = tmp_path / "match.rec"
+    recorder.save(str(path))
+
+    assert recorder.score == game.score > 0
+    assert replay(str(path)) == game.score
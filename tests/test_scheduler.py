@@ -0,0 +1,160 @@
+from pong_game.clock import SimulationClock
+from pong_game.headless import HeadlessGame
+from pong_game.scheduler import Scheduler
+
+
+def make_scheduler():
+    clock = SimulationClock()
+    return clock, Scheduler(clock)
+
+
+def test_calls_once_when_due():
+    clock, scheduler = make_scheduler()
+    calls = []
+    timer = scheduler.schedule(100, lambda: calls.append(clock.get_ticks()))
+
+    clock.advance(99)
+    scheduler.run()
+    assert calls == []
+
+    clock.advance(1)
+    scheduler.run()
+    clock.advance(500)
+    scheduler.run()
+    assert calls == [100]
+    assert not timer.active
+    assert len(scheduler) == 0
+
+
+def test_calls_in_deadline_order():
+    clock, scheduler = make_scheduler()
+    calls = []
+    for name, delay in (("c", 30), ("a", 10), ("b", 20), ("d", 30)):
+        scheduler.schedule(delay, lambda name=name: calls.append(name))
+
+    clock.advance(30)
+    scheduler.run()
+    assert calls == ["a", "b", "c", "d"]
+
+
+def test_repeating_timer_does_not_drift():
+    """Late runs catch up on every call that was due."""
+
+    clock, scheduler = make_scheduler()
+    calls = []
+    scheduler.schedule(0, lambda: calls.append(clock.get_ticks()), 100)
+
+    clock.advance(250)
+    scheduler.run()
+    assert len(calls) == 3
+
+    clock.advance(50)
+    scheduler.run()
+    assert len(calls) == 4
+
+
+def test_cancel_from_the_callback():
+    clock, scheduler = make_scheduler()
+    calls = []
+
+    def callback():
+        calls.append(None)
+        if len(calls) == 2:
+            timer.cancel()
+
+    timer = scheduler.schedule(0, callback, 10)
+    for _ in range(5):
+        clock.advance(10)
+        scheduler.run()
+
+    assert len(calls) == 2
+    assert not timer.active
+    assert len(scheduler) == 0
+
+
+def test_owner_timers_wait_until_resumed():
+    clock, scheduler = make_scheduler()
+    owner = object()
+    calls = []
+    scheduler.schedule(100, lambda: calls.append(None), owner=owner)
+
+    clock.advance(1000)
+    scheduler.run()
+    assert calls == []
+
+    scheduler.resume(owner)
+    clock.advance(100)
+    scheduler.run()
+    assert calls == [None]
+
+
+def test_pause_keeps_the_remaining_time():
+    clock, scheduler = make_scheduler()
+    owner = object()
+    scheduler.resume(owner)
+    calls = []
+    scheduler.schedule(100, lambda: calls.append(None), owner=owner)
+
+    clock.advance(40)
+    scheduler.pause(owner)
+    clock.advance(1000)
+    scheduler.run()
+    assert calls == []
+
+    scheduler.resume(owner)
+    clock.advance(59)
+    scheduler.run()
+    assert calls == []
+    clock.advance(1)
+    scheduler.run()
+    assert calls == [None]
+
+
+def test_cancel_owner():
+    clock, scheduler = make_scheduler()
+    owner = object()
+    scheduler.resume(owner)
+    calls = []
+    timers = [scheduler.schedule(10, lambda: calls.append(None), 10, owner)
+              for _ in range(3)]
+    scheduler.schedule(10, lambda: calls.append("free"))
+
+    scheduler.cancel(owner)
+    clock.advance(100)
+    scheduler.run()
+
+    assert calls == ["free"]
+    assert not any(timer.active for timer in timers)
+    assert owner not in scheduler.running
+
+
+def test_countdown_stays_stopped_after_game_over():
+    """Nothing counts down once the game is over, and retry() starts
+    a countdown that runs to the end.
+    """
+
+    game = HeadlessGame()
+    game.reset(3)
+    scene = game.scene
+    timers = game.scene_manager.scheduler.timers
+    while not game.game_over:
+        game.step()
+
+    step = scene.countdown_step
+    for _ in range(600):
+        game.step()
+        assert game.game_over
+        assert not timers.get(scene)
+    assert scene.countdown_step == step
+
+    scene.retry(3)
+    assert scene.on_countdown
+    assert timers.get(scene)
+    # The countdown takes 3 seconds, 180 steps.
+    for _ in range(200):
+        game.step()
+        if not scene.on_countdown:
+            break
+    assert not scene.on_countdown
+    assert scene.countdown_step > 3
+    assert not game.game_over